@@ -0,0 +1,222 @@
+"""
+Analysis Engine for Resume Decoder
+
+Runs every detector the decoder pages need over a single shared token stream:
+- Buzzword spans (single- and multi-word) and buzzword score
+- Tone keyword spans per category and their counts
+- ATS rules (sections, keywords, action verbs, formatting terms, contact info)
+
+The text is tokenized once and each detector is an automaton or lookup fed from
+those tokens, so a "Decode It" click costs one scan instead of one per check.
+Documents can also be streamed page by page through analyze_chunks(), optionally
+stopping as soon as every ATS requirement has passed. The returned DocumentAnalysis
+renders the decoded, highlighted and tone-highlighted views on demand from the
+stored match spans.
+"""
+
+import sys
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sized, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.phrase_matcher import PhraseMatch, get_matcher, tokenize
+from utils.tone_analyzer import find_tone_hits, highlight_tone_words
+from utils.ats_check import AtsRuleset, RuleResult, load_ruleset, summarize
+from utils.tracing import span, stage_clock
+from app.components.text_utils import highlight_buzzwords, rewrite_all_styles, rewrite_text
+
+
+@dataclass
+class DocumentAnalysis:
+    text: str
+    buzzword_dict: Dict[str, str]
+    word_count: int
+    buzzword_matches: List[PhraseMatch]
+    buzzword_score: float
+    tone_hits: Dict[str, List[Tuple[int, int]]]
+    tone_counts: Dict[str, int]
+    ats: Dict[str, object]
+    contact: Dict[str, str] = field(default_factory=dict)
+    sections: List[str] = field(default_factory=list)
+    complete: bool = True  # False when streaming stopped early and more chunks may have remained
+
+    @property
+    def ats_score(self) -> float:
+        """Percentage of ATS criteria passed (0-100)."""
+        return self.ats.get("pass_score", 0)
+
+    def decoded(self, style: str) -> str:
+        """Rewrites the text in the given style from the stored buzzword spans."""
+        return rewrite_text(self.text, self.buzzword_dict, style, self.buzzword_matches)
+
+    def decoded_all(self, styles: Optional[List[str]] = None) -> Dict[str, str]:
+        """Rewrites the text in every style (or the given ones) from the stored buzzword spans."""
+        with span("decode", styles=len(styles) if styles else "all"):
+            return rewrite_all_styles(self.text, self.buzzword_dict, self.buzzword_matches, styles)
+
+    def highlighted(self) -> str:
+        """Original text with buzzwords wrapped in <mark> tags."""
+        with span("highlight.buzzwords"):
+            return highlight_buzzwords(self.text, self.buzzword_dict, self.buzzword_matches)
+
+    def tone_highlighted(self) -> str:
+        """Original text with tone keywords wrapped in <span class="tone-{category}">."""
+        with span("highlight.tone"):
+            return highlight_tone_words(self.text, self.tone_hits)
+
+
+def analyze_chunks(
+    chunks: Iterable[str],
+    buzzword_dict: Dict[str, str],
+    ruleset: Optional[AtsRuleset] = None,
+    stop_when_satisfied: bool = False,
+) -> DocumentAnalysis:
+    """
+    Analyzes a document streamed as chunks (e.g. file_loader.iter_document_chunks),
+    tokenizing each chunk once and accumulating every detector's results. The text
+    is the chunks joined with newlines; phrases split across chunks are not matched.
+
+    Parameters:
+        chunks (Iterable[str]): Pages or paragraphs in document order
+        buzzword_dict (dict): Mapping of buzzwords to plain/honest interpretations
+        ruleset (AtsRuleset, optional): Compiled ATS ruleset; defaults to utils/ats_rules.json
+        stop_when_satisfied (bool): Stop reading chunks once every ATS requirement has
+                                    passed; the remaining chunks are never extracted
+
+    Returns:
+        DocumentAnalysis: Results for the chunks that were read. After an early stop,
+                          `complete` is True only if chunks is a sized collection and
+                          every chunk was read; a stream is never read ahead to check.
+    """
+    with span("analyze") as stage:
+        ruleset = ruleset or load_ruleset()
+        matcher = get_matcher(buzzword_dict)
+        ats_stream = ruleset.stream()
+        clock = stage_clock()
+
+        pieces = []
+        buzzword_matches: List[PhraseMatch] = []
+        tone_hits: Dict[str, List[Tuple[int, int]]] = {}
+        offset = 0
+        word_count = 0
+        complete = True
+
+        total = len(chunks) if isinstance(chunks, Sized) else None
+        chunks = iter(chunks)
+        for chunk in chunks:
+            clock.start()
+            tokens = tokenize(chunk)
+            clock.lap("analyze.tokenize")
+
+            for match in matcher.match_tokens(tokens):
+                if offset:
+                    match = match._replace(
+                        start=match.start + offset,
+                        end=match.end + offset,
+                        token_start=match.token_start + word_count,
+                        token_end=match.token_end + word_count,
+                    )
+                buzzword_matches.append(match)
+            clock.lap("analyze.buzzwords")
+            for tone, spans in find_tone_hits(chunk, tokens).items():
+                tone_hits.setdefault(tone, []).extend((start + offset, end + offset) for start, end in spans)
+            clock.lap("analyze.tone")
+            ats_stream.feed(chunk, tokens)
+            clock.lap("analyze.ats")
+
+            pieces.append(chunk)
+            offset += len(chunk) + 1
+            word_count += len(tokens)
+
+            if stop_when_satisfied and ats_stream.satisfied:
+                # Pulling another chunk to check would extract a page we are skipping
+                complete = total is not None and len(pieces) == total
+                break
+
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+        clock.record()
+        stage.set(words=word_count, chunks=len(pieces), complete=complete)
+        return build_analysis(
+            "\n".join(pieces),
+            buzzword_dict,
+            word_count,
+            buzzword_matches,
+            tone_hits,
+            ruleset,
+            ats_stream.results(),
+            complete,
+        )
+
+
+def build_analysis(
+    text: str,
+    buzzword_dict: Dict[str, str],
+    word_count: int,
+    buzzword_matches: List[PhraseMatch],
+    tone_hits: Dict[str, List[Tuple[int, int]]],
+    ruleset: AtsRuleset,
+    detailed: Dict[str, RuleResult],
+    complete: bool = True,
+) -> DocumentAnalysis:
+    """
+    Derives the scores, counts, contact details and sections from accumulated detector
+    output. Shared by analyze_chunks() and the incremental analyzer.
+
+    Parameters:
+        text (str): Full analyzed text
+        buzzword_dict (dict): Mapping of buzzwords to plain/honest interpretations
+        word_count (int): Tokens in the text
+        buzzword_matches (list): Buzzword matches with document offsets
+        tone_hits (dict): Tone category -> (start, end) spans with document offsets
+        ruleset (AtsRuleset): Ruleset the ATS results came from
+        detailed (dict): Rule id -> RuleResult
+        complete (bool): Whether the whole document was read
+
+    Returns:
+        DocumentAnalysis: Assembled results
+    """
+    buzzword_tokens = sum(m.token_end - m.token_start for m in buzzword_matches)
+    buzzword_score = round(buzzword_tokens / word_count * 100, 2) if word_count > 0 else 0
+    tone_counts = {tone: len(spans) for tone, spans in tone_hits.items()}
+
+    contact: Dict[str, str] = {}
+    sections = []
+    for rule in ruleset.rules:
+        if rule.category == "contact":
+            contact.update(detailed[rule.id].evidence)
+        elif rule.category == "section" and detailed[rule.id].passed:
+            sections.append(rule.label)
+
+    return DocumentAnalysis(
+        text=text,
+        buzzword_dict=buzzword_dict,
+        word_count=word_count,
+        buzzword_matches=buzzword_matches,
+        buzzword_score=buzzword_score,
+        tone_hits=tone_hits,
+        tone_counts=tone_counts,
+        ats=summarize(detailed),
+        contact=contact,
+        sections=sections,
+        complete=complete,
+    )
+
+
+def analyze_document(text: str, buzzword_dict: Dict[str, str], ruleset: Optional[AtsRuleset] = None) -> DocumentAnalysis:
+    """
+    Tokenizes the text once and runs the buzzword, tone, ATS, contact and section
+    detectors over the shared token stream.
+
+    Parameters:
+        text (str): Resume or job description text
+        buzzword_dict (dict): Mapping of buzzwords to plain/honest interpretations
+        ruleset (AtsRuleset, optional): Compiled ATS ruleset; defaults to utils/ats_rules.json
+
+    Returns:
+        DocumentAnalysis: All detector results plus renderers for the page views
+    """
+    return analyze_chunks([text], buzzword_dict, ruleset)
@@ -0,0 +1,238 @@
+"""
+Caching Layer for Resume Decoder
+
+Streamlit caches around the analysis pipeline, shared by every session on the server:
+- Resources (compiled once per process, never copied): the buzzword dictionary
+  (utils.buzzword_dictionary) and the ATS ruleset (utils.ats_check.load_ruleset), both
+  reloaded when their file changes
+- Data (copied per session, bounded by ANALYSIS_CACHE_TTL and ANALYSIS_CACHE_MAX_ENTRIES):
+  analysis results, keyed by (text hash, dictionary version, ruleset fingerprint), the
+  decoded text in every style, keyed by (text hash, dictionary version), and the tone chart
+
+Keys are built explicitly from hashes so large texts and dictionaries are not re-hashed
+by Streamlit on every rerun. Hit and miss counters back a debug sidebar, shown when
+RESUME_DECODER_DEBUG is set or the URL has ?debug=1. The sidebar is read-only unless
+RESUME_DECODER_DEBUG is set: clearing the caches affects every session on the server.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import streamlit as st
+
+from app.components.analysis_engine import DocumentAnalysis
+from app.components.incremental_analysis import IncrementalAnalyzer
+from utils.ats_check import AtsRuleset, load_ruleset
+from utils.buzzword_dictionary import BuzzwordDictionary, load_dictionary
+from utils.lazy_import import lazy_import
+from utils.tracing import env_flag, span
+
+alt = lazy_import("altair")  # loaded when the first tone chart is drawn
+
+BUZZWORD_FILE = "utils/buzzwords.json"
+ANALYSIS_CACHE_TTL = int(os.environ.get("RESUME_DECODER_CACHE_TTL", "3600"))  # seconds
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_DECODER_CACHE_MAX_ENTRIES", "1000"))
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _count(cache: str, miss: bool = False):
+    with _stats_lock:
+        counters = _stats.setdefault(cache, {"calls": 0, "misses": 0})
+        counters["misses" if miss else "calls"] += 1
+
+
+def text_hash(text: str) -> str:
+    """
+    Returns the cache key for a text.
+
+    Parameters:
+        text (str): Input text
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def dictionary_version(buzzword_dict: Dict[str, str]) -> str:
+    """
+    Returns a version string that changes whenever any buzzword or meaning changes,
+    including custom buzzwords added in a session.
+
+    Parameters:
+        buzzword_dict (dict): Mapping of buzzwords to plain/honest interpretations
+
+    Returns:
+        str: Hex digest of the dictionary contents
+    """
+    if isinstance(buzzword_dict, BuzzwordDictionary):
+        return buzzword_dict.version
+    payload = json.dumps(buzzword_dict, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def load_buzzword_map(path: str = BUZZWORD_FILE) -> Optional[BuzzwordDictionary]:
+    """
+    Returns the compiled buzzword dictionary shared by all sessions, reloaded when the
+    file changes. It is read-only; add session buzzwords with with_overlay().
+
+    Parameters:
+        path (str): Path to the buzzword JSON file or compiled artifact
+
+    Returns:
+        BuzzwordDictionary or None: Buzzword mapping, or None if the file is missing
+    """
+    if not os.path.exists(path):
+        return None
+    return load_dictionary(path)
+
+
+def get_ruleset() -> AtsRuleset:
+    """
+    Returns the compiled default ATS ruleset, shared by all sessions. load_ruleset()
+    caches it by file modification time, so edited rules are picked up without a restart.
+
+    Returns:
+        AtsRuleset: Compiled ruleset
+    """
+    return load_ruleset()
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_analysis(key: str, version: str, _text: str, _analyzer: IncrementalAnalyzer) -> DocumentAnalysis:
+    _count("analysis", miss=True)
+    # Cached values are pickled per hit; the dictionary is re-attached by the caller
+    return dataclasses.replace(_analyzer.analyze(_text), buzzword_dict={})
+
+
+def analyze_cached(text: str, buzzword_dict: Dict[str, str], analyzer: Optional[IncrementalAnalyzer] = None) -> DocumentAnalysis:
+    """
+    Returns the analysis of a text, computed once per (text, dictionary version, ruleset)
+    across all sessions. Misses are analyzed with the given analyzer so a session's paragraph
+    cache still speeds up edits of text no one has analyzed yet.
+
+    Parameters:
+        text (str): Resume or job description text
+        buzzword_dict (dict): Mapping of buzzwords to plain/honest interpretations
+        analyzer (IncrementalAnalyzer, optional): Analyzer for cache misses
+
+    Returns:
+        DocumentAnalysis: Analysis results
+    """
+    _count("analysis")
+    analyzer = analyzer or IncrementalAnalyzer(buzzword_dict, get_ruleset())
+    with span("analysis.cached"):
+        version = f"{dictionary_version(buzzword_dict)}:{analyzer.ruleset.fingerprint}"
+        analysis = _cached_analysis(text_hash(text), version, text, analyzer)
+    return dataclasses.replace(analysis, buzzword_dict=buzzword_dict)
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_decoded_all(key: str, version: str, _analysis: DocumentAnalysis) -> Dict[str, str]:
+    _count("decoded", miss=True)
+    return _analysis.decoded_all()
+
+
+def decode_all_cached(analysis: DocumentAnalysis) -> Dict[str, str]:
+    """
+    Returns the analyzed text rewritten in every style, computed together once per
+    (text, dictionary version) so switching styles never re-decodes.
+
+    Parameters:
+        analysis (DocumentAnalysis): Result of analyze_cached()
+
+    Returns:
+        dict: Style -> decoded text
+    """
+    _count("decoded")
+    with span("decode.cached"):
+        return _cached_decoded_all(text_hash(analysis.text), dictionary_version(analysis.buzzword_dict), analysis)
+
+
+def decode_cached(analysis: DocumentAnalysis, style: str) -> str:
+    """
+    Returns the analyzed text rewritten in a style, from decode_all_cached().
+
+    Parameters:
+        analysis (DocumentAnalysis): Result of analyze_cached()
+        style (str): Decoding style
+
+    Returns:
+        str: Decoded text
+    """
+    decoded = decode_all_cached(analysis)
+    return decoded[style] if style in decoded else analysis.decoded(style)
+
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_tone_chart(tone_counts: Dict[str, int]) -> "alt.Chart":
+    _count("tone_chart", miss=True)
+    chart_data = [{"Tone": k.title(), "Count": v} for k, v in tone_counts.items()]
+    return alt.Chart(alt.Data(values=chart_data)).mark_bar().encode(
+        x="Tone:N",
+        y="Count:Q",
+        color="Tone:N"
+    ).properties(height=200)
+
+
+def tone_chart(tone_counts: Dict[str, int]) -> "alt.Chart":
+    """
+    Returns the tone bar chart for a set of tone counts.
+
+    Parameters:
+        tone_counts (dict): Tone category -> count
+
+    Returns:
+        alt.Chart: Bar chart
+    """
+    _count("tone_chart")
+    with span("chart.tone"):
+        return _cached_tone_chart(tone_counts)
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Returns per-cache counters for this server process.
+
+    Returns:
+        dict: Cache name -> "calls", "hits", "misses" and "hit_rate" (0-1)
+    """
+    with _stats_lock:
+        snapshot = {name: dict(counters) for name, counters in _stats.items()}
+    for counters in snapshot.values():
+        counters["hits"] = max(counters["calls"] - counters["misses"], 0)
+        counters["hit_rate"] = counters["hits"] / counters["calls"] if counters["calls"] else 0.0
+    return snapshot
+
+
+def debug_enabled() -> bool:
+    """Whether the debug sidebar should be shown."""
+    return env_flag("RESUME_DECODER_DEBUG") or st.query_params.get("debug") == "1"
+
+
+def render_cache_debug():
+    """
+    Renders cache hit rates in the sidebar when debugging is enabled, plus a clear
+    button when RESUME_DECODER_DEBUG is set (never for ?debug=1 alone).
+    """
+    if not debug_enabled():
+        return
+    with st.sidebar:
+        st.subheader("Cache")
+        for name, counters in sorted(cache_stats().items()):
+            st.markdown(
+                f"- **{name}**: {counters['hit_rate']:.0%} hit rate "
+                f"({counters['hits']} hits / {counters['misses']} misses)"
+            )
+        st.caption(f"TTL {ANALYSIS_CACHE_TTL}s, up to {ANALYSIS_CACHE_MAX_ENTRIES} entries per cache")
+        if env_flag("RESUME_DECODER_DEBUG") and st.button("Clear caches"):
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            with _stats_lock:
+                _stats.clear()
@@ -0,0 +1,186 @@
+"""
+Incremental Analysis for Resume Decoder
+
+Re-analyzes only the paragraphs that changed since the last run. Text is split into
+paragraphs at blank lines, and each paragraph's detector output (buzzword spans,
+tone spans, ATS evidence) is cached under a hash of its text. A rerun after editing
+one bullet scans that paragraph only; the cached paragraphs are shifted to their new
+offsets and merged into the same DocumentAnalysis analyze_document() returns.
+
+Buzzword phrases or ATS patterns that span a blank line are not matched, the same
+trade-off analyze_chunks() makes at chunk boundaries.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.components.analysis_engine import DocumentAnalysis, build_analysis
+from utils.ats_check import AtsRuleset, load_ruleset
+from utils.phrase_matcher import PhraseMatch, PhraseMatcher, get_matcher, tokenize
+from utils.tone_analyzer import find_tone_hits
+from utils.tracing import span, stage_clock
+
+PARAGRAPH_CACHE_SIZE = 4096
+PARAGRAPH_BREAK = re.compile(r"(\n[ \t]*\n)")
+
+
+class ParagraphAnalysis(NamedTuple):
+    word_count: int
+    buzzword_matches: Tuple[PhraseMatch, ...]  # offsets relative to the paragraph
+    tone_hits: Dict[str, Tuple[Tuple[int, int], ...]]
+    ats_evidence: Tuple[Dict[str, str], ...]
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Splits text into paragraphs and the blank-line separators between them; joining
+    the result gives the text back exactly.
+
+    Parameters:
+        text (str): Resume or job description text
+
+    Returns:
+        list: Alternating paragraph, separator, paragraph, ...
+    """
+    return PARAGRAPH_BREAK.split(text)
+
+
+class IncrementalAnalyzer:
+    """
+    Paragraph-level cache in front of the analysis engine. Keep one per session (or
+    share one across sessions); it is thread-safe and bounded to `max_paragraphs`.
+    """
+
+    def __init__(
+        self,
+        buzzword_dict: Dict[str, str],
+        ruleset: Optional[AtsRuleset] = None,
+        max_paragraphs: int = PARAGRAPH_CACHE_SIZE,
+    ):
+        self.buzzword_dict = buzzword_dict
+        self.ruleset = ruleset or load_ruleset()
+        self.max_paragraphs = max_paragraphs
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[bytes, ParagraphAnalysis]" = OrderedDict()
+        self._matcher: Optional[PhraseMatcher] = None
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _analyze_paragraph(self, paragraph: str, matcher: PhraseMatcher, clock) -> ParagraphAnalysis:
+        clock.start()
+        tokens = tokenize(paragraph)
+        clock.lap("analyze.tokenize")
+        buzzword_matches = tuple(matcher.match_tokens(tokens))
+        clock.lap("analyze.buzzwords")
+        tone_hits = {tone: tuple(spans) for tone, spans in find_tone_hits(paragraph, tokens).items()}
+        clock.lap("analyze.tone")
+        ats_evidence = self.ruleset.chunk_evidence(paragraph, tokens)
+        clock.lap("analyze.ats")
+        return ParagraphAnalysis(len(tokens), buzzword_matches, tone_hits, ats_evidence)
+
+    def _lookup(self, paragraph: str, matcher: PhraseMatcher, clock) -> ParagraphAnalysis:
+        key = hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            # Custom buzzwords change the matcher; results from the old one are stale
+            if matcher is not self._matcher:
+                self._cache.clear()
+                self._matcher = matcher
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return cached
+            self._stats["misses"] += 1
+
+        result = self._analyze_paragraph(paragraph, matcher, clock)
+        with self._lock:
+            if matcher is self._matcher:
+                self._cache[key] = result
+                while len(self._cache) > self.max_paragraphs:
+                    self._cache.popitem(last=False)
+        return result
+
+    def analyze(self, text: str) -> DocumentAnalysis:
+        """
+        Analyzes text, reusing cached results for unchanged paragraphs.
+
+        Parameters:
+            text (str): Resume or job description text
+
+        Returns:
+            DocumentAnalysis: Same shape as analyze_document(text, buzzword_dict)
+        """
+        with span("analyze", incremental=True) as stage:
+            matcher = get_matcher(self.buzzword_dict)
+            ats_stream = self.ruleset.stream()
+            clock = stage_clock()
+            buzzword_matches: List[PhraseMatch] = []
+            tone_hits: Dict[str, List[Tuple[int, int]]] = {}
+            offset = 0
+            word_count = 0
+            paragraphs = 0
+            misses = self._stats["misses"]
+
+            for index, piece in enumerate(split_paragraphs(text)):
+                # Odd entries are the blank-line separators
+                if index % 2 == 0 and piece.strip():
+                    paragraphs += 1
+                    result = self._lookup(piece, matcher, clock)
+                    for match in result.buzzword_matches:
+                        buzzword_matches.append(match._replace(
+                            start=match.start + offset,
+                            end=match.end + offset,
+                            token_start=match.token_start + word_count,
+                            token_end=match.token_end + word_count,
+                        ))
+                    for tone, spans in result.tone_hits.items():
+                        tone_hits.setdefault(tone, []).extend((start + offset, end + offset) for start, end in spans)
+                    ats_stream.merge(result.ats_evidence)
+                    word_count += result.word_count
+                offset += len(piece)
+
+            clock.record()
+            stage.set(words=word_count, paragraphs=paragraphs, rescanned=self._stats["misses"] - misses)
+            return build_analysis(
+                text, self.buzzword_dict, word_count, buzzword_matches, tone_hits, self.ruleset, ats_stream.results()
+            )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns paragraph cache counters and hit rate.
+
+        Returns:
+            dict: "hits", "misses", "hit_rate" (0-1) and "paragraphs" cached
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["paragraphs"] = len(self._cache)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def session_analyzer(state, buzzword_dict: Dict[str, str], key: str = "_incremental_analyzer") -> IncrementalAnalyzer:
+    """
+    Returns the analyzer kept in a session state mapping (e.g. st.session_state),
+    creating it on first use, so Streamlit reruns reuse the paragraph cache.
+
+    Parameters:
+        state (MutableMapping): Per-session state
+        buzzword_dict (dict): Current buzzword mapping, including custom buzzwords
+        key (str): State key; use different keys for unrelated texts on one page
+
+    Returns:
+        IncrementalAnalyzer: Analyzer bound to buzzword_dict and the current ATS ruleset
+    """
+    ruleset = load_ruleset()
+    analyzer = state.get(key)
+    if analyzer is None or analyzer.ruleset is not ruleset:
+        # A new ruleset invalidates the cached per-paragraph ATS evidence
+        analyzer = IncrementalAnalyzer(buzzword_dict, ruleset)
+        state[key] = analyzer
+    analyzer.buzzword_dict = buzzword_dict
+    return analyzer
@@ -0,0 +1,93 @@
+"""
+Request Instrumentation for the Streamlit Pages
+
+Wraps each page run in a utils.tracing request scope so the stages it runs (file
+extraction, analysis, decoding, highlighting, the tone chart, job matching) are
+traced as one request. A single run can opt in from the URL:
+- ?trace=1 records spans for this run even when RESUME_DECODER_TRACE is unset
+- ?profile=cprofile (or pyinstrument) profiles one run: later reruns of the
+  session are not profiled until the parameter is removed and added again. Honored
+  only when RESUME_DECODER_DEBUG is set, so anonymous visitors can't profile the server
+
+The debug sidebar (see caching.debug_enabled) shows the per-stage latency histograms
+and the latest profile report.
+"""
+
+import streamlit as st
+
+from app.components.caching import debug_enabled
+from utils.tracing import RequestScope, env_flag, profile_engine, recent_profiles, reset_histograms, stage_histograms
+
+SCOPE_KEY = "_request_scope"
+PROFILED_KEY = "_profiled_param"  # ?profile= value this session already used
+
+
+def _requested_profile() -> str:
+    requested = st.query_params.get("profile")
+    if not requested:
+        st.session_state.pop(PROFILED_KEY, None)
+        return ""
+    if not env_flag("RESUME_DECODER_DEBUG") or st.session_state.get(PROFILED_KEY) == requested:
+        return ""
+    st.session_state[PROFILED_KEY] = requested
+    return requested
+
+
+def start_request(name: str) -> RequestScope:
+    """
+    Starts the request scope for this page run.
+
+    Parameters:
+        name (str): Request name, e.g. "request.decoder"
+
+    Returns:
+        RequestScope: The started scope; finish it with finish_request()
+    """
+    # A run cut short (st.stop(), an exception) never reached finish_request()
+    previous = st.session_state.pop(SCOPE_KEY, None)
+    if previous is not None:
+        previous.finish()
+    scope = RequestScope(
+        name,
+        trace=st.query_params.get("trace") == "1",
+        profile=profile_engine(_requested_profile()),
+    )
+    st.session_state[SCOPE_KEY] = scope
+    return scope.start()
+
+
+def finish_request():
+    """
+    Finishes this run's request scope, exporting its span and any profile report.
+    """
+    scope = st.session_state.pop(SCOPE_KEY, None)
+    if scope is not None:
+        scope.finish()
+
+
+def render_trace_debug():
+    """
+    Renders per-stage latency histograms and the latest profile in the sidebar when
+    debugging is enabled.
+    """
+    if not debug_enabled():
+        return
+    histograms = stage_histograms()
+    profiles = recent_profiles()
+    if not histograms and not profiles:
+        return
+    with st.sidebar:
+        st.subheader("Stage Timings")
+        for name, summary in histograms.items():
+            st.markdown(
+                f"- **{name}**: p50 ≤{summary['p50_ms']} ms · p95 ≤{summary['p95_ms']} ms · "
+                f"max {summary['max_ms']} ms ({summary['count']} spans)"
+            )
+        if histograms and st.button("Reset timings"):
+            reset_histograms()
+        if profiles:
+            latest = profiles[0]
+            with st.expander(f"Profile: {latest['name']} ({latest['engine']})"):
+                if latest["path"]:
+                    st.caption(latest["path"])
+                st.code(latest["report"], language="text")
@@ -0,0 +1,71 @@
+"""
+Share Link Helpers for Resume Decoder
+
+Streamlit glue around utils.share_tokens: reads the ?state= token from the URL once
+per session, and builds share links only when the user asks for one, without
+recompressing on every rerun (large inputs are written to the server's share store).
+"""
+
+from typing import Optional
+
+import streamlit as st
+
+from utils.share_tokens import InvalidShareToken, ShareState, decode_share_token, encode_share_token
+
+
+def load_shared_state() -> Optional[ShareState]:
+    """
+    Returns the state shared through ?state=, decoding and verifying each token only
+    once per session. Shows a warning for invalid tokens.
+
+    Returns:
+        ShareState or None: Shared input and style, if the URL carries a valid token
+    """
+    token = st.query_params.get("state")
+    if not token:
+        return None
+
+    cached = st.session_state.get("_shared_state")
+    if cached is None or cached[0] != token:
+        try:
+            cached = (token, decode_share_token(token), None)
+        except InvalidShareToken as e:
+            cached = (token, None, str(e))
+        st.session_state["_shared_state"] = cached
+
+    _, state, error = cached
+    if error:
+        st.warning(f"Could not decode shared session. {error}")
+    return state
+
+
+def share_link(input_text: str, style: str) -> str:
+    """
+    Builds a relative share URL for the current input and style.
+
+    Parameters:
+        input_text (str): Input text to share
+        style (str): Decoding style
+
+    Returns:
+        str: "?state=<token>"
+    """
+    cached = st.session_state.get("_share_link")
+    if cached is None or cached[0] != (input_text, style):
+        cached = ((input_text, style), f"?state={encode_share_token(input_text, style)}")
+        st.session_state["_share_link"] = cached
+    return cached[1]
+
+
+def render_share_link(input_text: str, style: str):
+    """
+    Shows a "Create Share Link" button, and the link once it was created for the
+    current input and style.
+
+    Parameters:
+        input_text (str): Input text to share
+        style (str): Decoding style
+    """
+    cached = st.session_state.get("_share_link")
+    if (cached is not None and cached[0] == (input_text, style)) or st.button("Create Share Link"):
+        st.text_input("Shareable Link", value=share_link(input_text, style))
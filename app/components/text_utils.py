@@ -14,11 +14,15 @@ Used by both the main decoder page and examples page.
 import re
 import sys
 import os
-from typing import Tuple, Dict
+from collections import OrderedDict
+from typing import Tuple, Dict, List, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from utils.tone_analyzer import highlight_tone_words
+from utils.phrase_matcher import PhraseMatch, get_matcher, tokenize
+from utils.style_metadata import STYLE_DESCRIPTIONS
+from utils.style_variants import apply_style, style_template
 
 def extract_experience_sections(text):
     """Roughly split text into job sections based on headers, dates, and bullets"""
@@ -64,48 +68,131 @@ def decode_text(input_text: str, buzzword_dict: Dict[str, str], style: str = "Pl
             - highlighted_text: HTML-formatted version of original text with buzzwords highlighted
             - tone_highlighted_text: HTML-formatted version with tone categories highlighted
     """
-    # Normalize and tokenize
-    original_words = re.findall(r'\b\w[\w\-]*\b', input_text.lower())
+    # Tokenize once and find every buzzword span, single- and multi-word
+    tokens = tokenize(input_text)
+    matches = get_matcher(buzzword_dict).match_tokens(tokens)
 
-    detected_buzzwords = [word for word in original_words if word in buzzword_dict]
-    total_words = len(original_words)
-    score = round(len(detected_buzzwords) / total_words * 100, 2) if total_words > 0 else 0
+    buzzword_tokens = sum(m.token_end - m.token_start for m in matches)
+    total_words = len(tokens)
+    score = round(buzzword_tokens / total_words * 100, 2) if total_words > 0 else 0
 
     # Highlight original text
-    highlighted_text = highlight_buzzwords(input_text, buzzword_dict)
+    highlighted_text = highlight_buzzwords(input_text, buzzword_dict, matches)
 
     # Highlight tone categories
     tone_highlighted_text = highlight_tone_words(input_text)
 
     # Rewrite text in selected style
-    decoded_text = rewrite_text(input_text, buzzword_dict, style)
+    decoded_text = rewrite_text(input_text, buzzword_dict, style, matches)
 
     return decoded_text, score, highlighted_text, tone_highlighted_text
 
 
-def highlight_buzzwords(text: str, buzzword_dict: Dict[str, str]) -> str:
+def find_buzzwords(text: str, buzzword_dict: Dict[str, str]) -> List[PhraseMatch]:
+    """
+    Finds every buzzword occurrence in the text, including multi-word phrases.
+
+    Parameters:
+        text (str): Original input text
+        buzzword_dict (dict): Buzzword lookup dictionary
+
+    Returns:
+        List[PhraseMatch]: Non-overlapping matches with character spans, in order
+    """
+    return get_matcher(buzzword_dict).find(text)
+
+
+def _replace_spans(text: str, matches: List[PhraseMatch], render) -> str:
+    """Rebuilds text with each matched span replaced by render(match, original_span)."""
+    pieces = []
+    pos = 0
+    for match in matches:
+        pieces.append(text[pos:match.start])
+        pieces.append(render(match, text[match.start:match.end]))
+        pos = match.end
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+
+def highlight_buzzwords(text: str, buzzword_dict: Dict[str, str], matches: Optional[List[PhraseMatch]] = None) -> str:
     """
     Highlights buzzwords in the original text using HTML <mark> tags.
 
     Parameters:
         text (str): Original input text
         buzzword_dict (dict): Buzzword lookup dictionary
+        matches (list, optional): Precomputed output of find_buzzwords()
 
     Returns:
         str: HTML string with buzzwords highlighted
     """
-    def highlight(match):
-        word = match.group(0)
-        lower_word = word.lower()
-        if lower_word in buzzword_dict:
-            return f"<mark title='{buzzword_dict[lower_word]}'>{word}</mark>"
-        return word
+    if matches is None:
+        matches = find_buzzwords(text, buzzword_dict)
+
+    def highlight(match, word):
+        return f"<mark title='{buzzword_dict[match.key]}'>{word}</mark>"
+
+    return _replace_spans(text, matches, highlight)
+
+
+# Inline wording rewrite_text has always used; other styles come from apply_style
+INLINE_STYLES = {
+    "Plain English": lambda base, word: base,
+    "Real Talk": lambda base, word: f"[💬 Translation: {base}]",
+    "Gen Z": lambda base, word: f"{word} (lol basically: {base})",
+    "Corporate Satire": lambda base, word: f"{word}™️ ({base})",
+}
+STYLE_TABLE_CACHE_SIZE = 64
+
+
+def _inline_style(base_text: str, style: str, original: str) -> str:
+    inline = INLINE_STYLES.get(style)
+    return inline(base_text, original) if inline else apply_style(base_text, style, original)
+
+
+class StyleTable(dict):
+    """Buzzword -> rewrite template for one dictionary and style, filled on first use."""
+
+    def __init__(self, buzzword_dict: Dict[str, str], style: str):
+        super().__init__()
+        self.buzzword_dict = buzzword_dict
+        self.style = style
+
+    def __missing__(self, key: str) -> Tuple[str, ...]:
+        template = style_template(self.buzzword_dict[key], self.style, _inline_style)
+        self[key] = template
+        return template
+
+
+_style_tables: "OrderedDict[Tuple[str, str], StyleTable]" = OrderedDict()
+
+
+def style_table(buzzword_dict: Dict[str, str], style: str) -> StyleTable:
+    """
+    Returns the rewrite templates for a dictionary and style. Versioned dictionaries
+    (utils.buzzword_dictionary) share one table per (version, style) across calls and
+    sessions; plain dicts get a fresh table.
 
-    highlighted = re.sub(r'\b\w[\w\-]*\b', highlight, text)
-    return highlighted
+    Parameters:
+        buzzword_dict (dict): Dictionary of buzzword → plain translation
+        style (str): Any style in STYLE_DESCRIPTIONS
 
+    Returns:
+        StyleTable: Templates, see utils.style_variants.style_template
+    """
+    version = getattr(buzzword_dict, "version", None)
+    if version is None:
+        return StyleTable(buzzword_dict, style)
+    key = (version, style)
+    table = _style_tables.get(key)
+    if table is None:
+        table = _style_tables.setdefault(key, StyleTable(buzzword_dict, style))
+        while len(_style_tables) > STYLE_TABLE_CACHE_SIZE:
+            _style_tables.popitem(last=False)
+    return table
 
-def rewrite_text(text: str, buzzword_dict: Dict[str, str], style: str) -> str:
+
+def rewrite_text(text: str, buzzword_dict: Dict[str, str], style: str, matches: Optional[List[PhraseMatch]] = None) -> str:
     """
     Rewrites the input text by replacing buzzwords with alternate phrasings
     depending on the selected decoding style.
@@ -113,25 +200,59 @@ def rewrite_text(text: str, buzzword_dict: Dict[str, str], style: str) -> str:
     Parameters:
         text (str): Original input text
         buzzword_dict (dict): Dictionary of buzzword → plain translation
-        style (str): Style to rewrite in ("Plain English", "Real Talk", etc.)
+        style (str): Style to rewrite in, any of STYLE_DESCRIPTIONS
+        matches (list, optional): Precomputed output of find_buzzwords()
 
     Returns:
         str: Rewritten, decoded text
     """
-    def translate(word: str) -> str:
-        lower = word.lower()
-        if lower in buzzword_dict:
-            base = buzzword_dict[lower]
-            if style == "Plain English":
-                return base
-            elif style == "Real Talk":
-                return f"[💬 Translation: {base}]"
-            elif style == "Gen Z":
-                return f"{word} (lol basically: {base})"
-            elif style == "Corporate Satire":
-                return f"{word}™️ ({base})"
-        return word
-
-    words = re.findall(r'\b\w[\w\-]*\b|\W+', text)
-    rewritten = "".join([translate(w) if re.match(r'\w[\w\-]*', w) else w for w in words])
-    return rewritten
+    return rewrite_all_styles(text, buzzword_dict, matches, [style])[style]
+
+
+def rewrite_all_styles(
+    text: str,
+    buzzword_dict: Dict[str, str],
+    matches: Optional[List[PhraseMatch]] = None,
+    styles: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Rewrites the input text in several styles from one buzzword detection pass. The
+    text between matches is sliced once and shared, so each extra style only renders
+    the matched spans and joins the pieces.
+
+    Parameters:
+        text (str): Original input text
+        buzzword_dict (dict): Dictionary of buzzword → plain translation
+        matches (list, optional): Precomputed output of find_buzzwords()
+        styles (list, optional): Styles to render; defaults to every style in STYLE_DESCRIPTIONS
+
+    Returns:
+        dict: Style → rewritten, decoded text
+    """
+    if matches is None:
+        matches = find_buzzwords(text, buzzword_dict)
+    if styles is None:
+        styles = list(STYLE_DESCRIPTIONS)
+
+    keys = []
+    originals = []
+    gaps = []
+    pos = 0
+    for key, start, end, _, _ in matches:
+        keys.append(key)
+        originals.append(text[start:end])
+        gaps.append(text[pos:start])
+        pos = end
+    gaps.append(text[pos:])
+
+    pieces = [""] * (2 * len(keys) + 1)
+    pieces[0::2] = gaps
+    decoded = {}
+    for style in styles:
+        table = style_table(buzzword_dict, style)
+        pieces[1::2] = [
+            template[0] if len(template) == 1 else original.join(template)
+            for template, original in zip(map(table.__getitem__, keys), originals)
+        ]
+        decoded[style] = "".join(pieces)
+    return decoded
@@ -35,27 +35,28 @@ Feature:
 
 import streamlit as st
 from app.components import text_utils
+from app.components.incremental_analysis import session_analyzer
+from app.components.caching import analyze_cached, decode_cached, load_buzzword_map, render_cache_debug, tone_chart
+from app.components.instrumentation import finish_request, render_trace_debug, start_request
 from utils.funny_titles import generate_title
+from utils.tracing import span
 from utils.style_metadata import STYLE_DESCRIPTIONS
 from utils.score_meter import interpret_score, render_progress_bar, render_bs_meter, calculate_resume_quality, render_quality_badge
-from utils.ats_check import check_ats_friendly
-from utils.tone_analyzer import analyze_tone
 from utils.session_storage import create_export_bundle
-import altair as alt
+from app.components.share import load_shared_state, render_share_link
+from utils.file_loader import load_file, UPLOAD_EXTENSIONS
 import json
 import os
-import base64
 import re
 
+start_request("request.decoder")
+
 # ------------------------
 # Load buzzword mapping
 # ------------------------
-BUZZWORD_FILE = "utils/buzzwords.json"
+buzzword_map = load_buzzword_map()
 
-if os.path.exists(BUZZWORD_FILE):
-    with open(BUZZWORD_FILE, "r") as f:
-        buzzword_map = json.load(f)
-else:
+if buzzword_map is None:
     st.error("Missing buzzword mapping file. Please check utils/buzzwords.json.")
     st.stop()
 
@@ -72,16 +73,17 @@ st.markdown("Paste in your resume or job post below, or upload a file. We'll dec
 # File Upload or Text Input
 # ------------------------
 
-uploaded_file = st.file_uploader("Upload resume/job description (PDF, DOCX, TXT)", type=["pdf", "docx", "txt"])
+uploaded_file = st.file_uploader("Upload resume/job description (PDF, DOCX, ODT, RTF, HTML, Markdown, TXT)", type=UPLOAD_EXTENSIONS)
 user_input = ""
 
 if uploaded_file:
-    import fitz  # PyMuPDF
-    try:
-        with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-            user_input = "\n".join([page.get_text() for page in doc])
-    except Exception:
-        st.error("Failed to extract text from uploaded file.")
+    extraction = load_file(uploaded_file)
+    if extraction.ok:
+        user_input = extraction.text
+        for warning in extraction.warnings:
+            st.warning(warning)
+    else:
+        st.error(f"Failed to extract text from uploaded file. {extraction.error}")
 
 st.subheader("Or Paste Text")
 user_input_manual = st.text_area("Text area", height=300, placeholder="Paste job description or resume here...")
@@ -90,15 +92,28 @@ if user_input_manual:
 
 style = st.radio("Choose your decoding style", options=list(STYLE_DESCRIPTIONS.keys()), format_func=lambda x: f"{STYLE_DESCRIPTIONS[x]}")
 
+# Opened from a share link: restore the shared input and style
+shared_state = load_shared_state()
+if shared_state:
+    user_input = shared_state.input or user_input
+    style = shared_state.style or style
+
 # ------------------------
 # Decode and Display Results
 # ------------------------
 
-if st.button("Decode It"):
+# Results stay up while the input is unchanged, so switching styles re-renders
+# instantly from the cached decodes instead of requiring another click
+decode_clicked = st.button("Decode It")
+if decode_clicked or (user_input.strip() and st.session_state.get("_decoded_input") == user_input):
     if not user_input.strip():
         st.warning("Please enter or upload text to decode.")
     else:
-        decoded_text, score, highlights, tone_highlighted = text_utils.decode_text(user_input, buzzword_map, style)
+        st.session_state["_decoded_input"] = user_input
+        # Shared across sessions; misses only re-scan the paragraphs that changed
+        analysis = analyze_cached(user_input, buzzword_map, session_analyzer(st.session_state, buzzword_map))
+        decoded_text = decode_cached(analysis, style)
+        score = analysis.buzzword_score
 
         st.subheader("Buzzword Score")
         st.markdown(f"Score: `{score}%`")
@@ -106,20 +121,15 @@ if st.button("Decode It"):
         st.markdown(interpret_score(score))
         render_bs_meter(score)
 
-        tone_data = analyze_tone(user_input)
+        tone_data = analysis.tone_counts
         if tone_data:
-            chart_data = [{"Tone": k.title(), "Count": v} for k, v in tone_data.items()]
-            tone_chart = alt.Chart(alt.Data(values=chart_data)).mark_bar().encode(
-                x="Tone:N",
-                y="Count:Q",
-                color="Tone:N"
-            ).properties(height=200)
-            st.altair_chart(tone_chart, use_container_width=True)
+            with span("chart.render"):
+                st.altair_chart(tone_chart(tone_data), use_container_width=True)
         else:
             st.info("No dominant tones found in text.")
 
-        ats_result = check_ats_friendly(user_input)
-        quality = calculate_resume_quality(score, 100 * sum(ats_result.values()) / len(ats_result), tone_data)
+        ats_result = analysis.ats
+        quality = calculate_resume_quality(score, analysis.ats_score, tone_data)
         render_quality_badge(quality)
 
         st.subheader("Decoded Experience")
@@ -166,9 +176,7 @@ if st.button("Decode It"):
             mime="application/json"
         )
 
-        encoded = base64.urlsafe_b64encode(json.dumps(export_bundle).encode("utf-8")).decode("utf-8")
-        share_url = f"?state={encoded}"
-        st.text_input("Shareable Link", value=share_url)
+        render_share_link(user_input, style)
 
         st.text_area(
             label="Copy-Friendly Box",
@@ -179,3 +187,7 @@ if st.button("Decode It"):
 
 st.markdown("---")
 st.caption("This is for a laugh. Don't take life so serious.")
+
+finish_request()
+render_cache_debug()
+render_trace_debug()
@@ -26,27 +26,26 @@ Features:
 """
 
 import streamlit as st
-from app.components import text_utils
+from app.components.incremental_analysis import session_analyzer
+from app.components.caching import analyze_cached, decode_cached, load_buzzword_map, render_cache_debug, tone_chart
+from app.components.instrumentation import finish_request, render_trace_debug, start_request
 from utils.funny_titles import generate_title
+from utils.tracing import span
 from utils.style_metadata import STYLE_DESCRIPTIONS
 from utils.score_meter import interpret_score, render_progress_bar, render_bs_meter, calculate_resume_quality, render_quality_badge
-from utils.ats_check import check_ats_friendly
-from utils.tone_analyzer import analyze_tone
 from utils.session_storage import create_export_bundle
-import altair as alt
+from app.components.share import load_shared_state, render_share_link
 import json
 import os
-import base64
+
+start_request("request.decoder")
 
 # ------------------------
 # Load buzzword mapping
 # ------------------------
-BUZZWORD_FILE = "utils/buzzwords.json"
+buzzword_map = load_buzzword_map()
 
-if os.path.exists(BUZZWORD_FILE):
-    with open(BUZZWORD_FILE, "r") as f:
-        buzzword_map = json.load(f)
-else:
+if buzzword_map is None:
     st.error("Missing buzzword mapping file. Please check utils/buzzwords.json.")
     st.stop()
 
@@ -82,34 +81,34 @@ new_word = st.text_input("Buzzword")
 new_def = st.text_input("Its real meaning")
 
 if new_word and new_def:
-    buzzword_map[new_word.lower()] = new_def
+    # Session-only overlay; the shared dictionary is never modified
+    buzzword_map = buzzword_map.with_overlay({new_word: new_def})
 
 # ------------------------
 # Share Link Decoding
 # ------------------------
-params = st.query_params
-if "state" in params:
-    try:
-        decoded_bytes = base64.urlsafe_b64decode(params["state"][0])
-        decoded_json = json.loads(decoded_bytes.decode("utf-8"))
-        user_input = decoded_json.get("input", user_input)
-        style = decoded_json.get("style", style)
-    except Exception:
-        st.warning("Could not decode shared session.")
+shared_state = load_shared_state()
+if shared_state:
+    user_input = shared_state.input or user_input
+    style = shared_state.style or style
 
 # ------------------------
 # Decode Button Logic
 # ------------------------
 
-if st.button("Decode It"):
+# Results stay up while the input is unchanged, so switching styles re-renders
+# instantly from the cached decodes instead of requiring another click
+decode_clicked = st.button("Decode It")
+if decode_clicked or (user_input.strip() and st.session_state.get("_decoded_input") == user_input):
     if not user_input.strip():
         st.warning("Please enter text to decode.")
     else:
-        decoded_text, score, highlights, tone_highlighted = text_utils.decode_text(
-            input_text=user_input,
-            buzzword_dict=buzzword_map,
-            style=style
-        )
+        st.session_state["_decoded_input"] = user_input
+        # Shared across sessions; misses only re-scan the paragraphs that changed
+        analysis = analyze_cached(user_input, buzzword_map, session_analyzer(st.session_state, buzzword_map))
+        decoded_text = decode_cached(analysis, style)
+        score = analysis.buzzword_score
+        highlights = analysis.highlighted()
 
         layout = st.radio("Choose Layout", ["Stacked", "Side-by-Side"], horizontal=True)
 
@@ -119,21 +118,16 @@ if st.button("Decode It"):
         render_bs_meter(score)
 
         # Tone Breakdown Chart
-        tone_data = analyze_tone(user_input)
+        tone_data = analysis.tone_counts
         if tone_data:
-            chart_data = [{"Tone": k.title(), "Count": v} for k, v in tone_data.items()]
-            tone_chart = alt.Chart(alt.Data(values=chart_data)).mark_bar().encode(
-                x="Tone:N",
-                y="Count:Q",
-                color="Tone:N"
-            ).properties(height=200)
-            st.altair_chart(tone_chart, use_container_width=True)
+            with span("chart.render"):
+                st.altair_chart(tone_chart(tone_data), use_container_width=True)
         else:
             st.info("No dominant tones found in text.")
 
         # Resume Quality Score
-        ats_result = check_ats_friendly(user_input)
-        quality = calculate_resume_quality(bs_score=score, ats_score=100 * sum(ats_result.values()) / len(ats_result), tone_data=tone_data)
+        ats_result = analysis.ats
+        quality = calculate_resume_quality(bs_score=score, ats_score=analysis.ats_score, tone_data=tone_data)
         render_quality_badge(quality)
 
         # View Results
@@ -188,9 +182,7 @@ if st.button("Decode It"):
             mime="application/json"
         )
 
-        encoded = base64.urlsafe_b64encode(json.dumps(export_bundle).encode("utf-8")).decode("utf-8")
-        share_url = f"?state={encoded}"
-        st.text_input("Shareable Link", value=share_url)
+        render_share_link(user_input, style)
 
         st.text_area(
             label="Copy-Friendly Box",
@@ -202,3 +194,7 @@ if st.button("Decode It"):
 # Optional tip
 st.markdown("---")
 st.caption("Tip: Use 'Gen Z' or 'Corporate Satire' mode for a laugh. Try pasting your own resume!")
+
+finish_request()
+render_cache_debug()
+render_trace_debug()
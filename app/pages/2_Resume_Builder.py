@@ -20,12 +20,21 @@ import streamlit as st
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from utils.resume_tools import extract_keywords, match_keywords, suggest_resume_sections
-from utils.file_loader import load_text_from_file
+from utils.resume_tools import suggest_resume_sections
+from utils.job_corpus import document_id, get_job_corpus
+from utils.file_loader import load_file, UPLOAD_EXTENSIONS
 from utils.resume_templates import render_final_resume
 from utils.export import export_to_docx
+from app.components.incremental_analysis import session_analyzer
+from app.components.caching import analyze_cached, load_buzzword_map, render_cache_debug
+from app.components.instrumentation import finish_request, render_trace_debug, start_request
+from utils.tracing import span
 import json
 
+start_request("request.builder")
+
+buzzword_map = load_buzzword_map() or {}
+
 st.title("Resume Builder")
 st.caption("Rebuild your resume based on a job description and your current resume.")
 
@@ -35,36 +44,61 @@ st.caption("Rebuild your resume based on a job description and your current resu
 col1, col2 = st.columns(2)
 
 with col1:
-    job_file = st.file_uploader("Upload Job Description", type=["pdf", "docx", "txt"], key="job")
+    job_file = st.file_uploader("Upload Job Description", type=UPLOAD_EXTENSIONS, key="job")
     job_text = st.text_area("Or paste job description", height=300)
     if job_file:
-        job_text = load_text_from_file(job_file)
+        extraction = load_file(job_file)
+        if extraction.ok:
+            job_text = extraction.text
+            for warning in extraction.warnings:
+                st.warning(warning)
+        else:
+            st.error(extraction.error)
 
 with col2:
-    resume_file = st.file_uploader("Upload Current Resume", type=["pdf", "docx", "txt"], key="resume")
+    resume_file = st.file_uploader("Upload Current Resume", type=UPLOAD_EXTENSIONS, key="resume")
     resume_text = st.text_area("Or paste current resume", height=300)
     if resume_file:
-        resume_text = load_text_from_file(resume_file)
+        extraction = load_file(resume_file)
+        if extraction.ok:
+            resume_text = extraction.text
+            for warning in extraction.warnings:
+                st.warning(warning)
+        else:
+            st.error(extraction.error)
 
 if job_text and resume_text:
     st.markdown("---")
     st.subheader("Job Match Analysis")
 
-    job_keywords = extract_keywords(job_text)
-    resume_keywords = extract_keywords(resume_text)
-    match_result = match_keywords(job_keywords, resume_keywords)
+    job_corpus = get_job_corpus()
+    with span("match.score"):
+        match_result = job_corpus.match(job_text, resume_text)
 
     st.write(f"**Match Score:** {match_result['match_percent']}%")
     st.progress(int(match_result['match_percent']))
 
     if match_result['missing_keywords']:
-        st.warning("Missing Keywords:")
+        st.warning("Missing Keywords (most important first):")
         st.markdown(", ".join(match_result['missing_keywords']))
 
+    # Job descriptions feed the corpus statistics that weight the match, but only when
+    # the user says so: reruns and half-edited revisions must not count as new jobs
+    recorded_jobs = st.session_state.setdefault("_recorded_jobs", set())
+    job_id = document_id(job_text)
+    if job_id in recorded_jobs or job_text in job_corpus:
+        st.caption("This job description is part of the keyword statistics.")
+    elif st.button("Add this job to the keyword statistics"):
+        with span("match.corpus_add"):
+            job_corpus.add(job_text)
+        recorded_jobs.add(job_id)
+        st.caption("This job description is part of the keyword statistics.")
+
     st.markdown("---")
     st.subheader("Resume Suggestions")
 
-    sections = suggest_resume_sections(job_text, resume_text)
+    with span("match.suggestions"):
+        sections = suggest_resume_sections(job_text, resume_text)
     edited_sections = {}
 
     for section in sections:
@@ -72,6 +106,14 @@ if job_text and resume_text:
             edited_text = st.text_area("Edit this section", value=section['content'], height=200)
             edited_sections[section['title']] = edited_text
 
+            # Live feedback while editing; unchanged paragraphs come from the cache
+            if edited_text.strip():
+                section_analysis = analyze_cached(
+                    edited_text, buzzword_map, session_analyzer(st.session_state, buzzword_map, key="_builder_analyzer")
+                )
+                tones = ", ".join(tone for tone, count in section_analysis.tone_counts.items() if count) or "neutral"
+                st.caption(f"Buzzword score: {section_analysis.buzzword_score}% · Tone: {tones}")
+
     if st.button("Export as DOCX"):
         docx_data = export_to_docx(edited_sections)
         st.download_button(
@@ -128,3 +170,6 @@ st.download_button(
 
 st.text_area("Copy-Friendly Markdown", markdown_export, height=300)
 
+finish_request()
+render_cache_debug()
+render_trace_debug()
@@ -0,0 +1,5 @@
+"""
+Resume Decoder command-line tools
+
+Headless entry points for the analysis pipeline, run as `python -m resume_decoder <command>`.
+"""
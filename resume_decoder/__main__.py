@@ -0,0 +1,36 @@
+"""
+Command-line entry point for Resume Decoder.
+
+Usage:
+    python -m resume_decoder batch INPUT [options]
+    python -m resume_decoder match RESUMES JOBS [options]
+    python -m resume_decoder index {add,search,delete,optimize} ...
+    python -m resume_decoder dictionary {compile,info} ...
+    python -m resume_decoder importtime [MODULE[=MS] ...]
+    python -m resume_decoder serve [--port PORT] [--workers N]
+    python -m resume_decoder bench [--compare [BASELINE]] [--save-baseline [PATH]]
+"""
+
+import argparse
+import sys
+
+from resume_decoder import batch, bench, dictionary, importtime, index, match, serve
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m resume_decoder", description="Headless Resume Decoder tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    batch.add_parser(subparsers)
+    match.add_parser(subparsers)
+    index.add_parser(subparsers)
+    dictionary.add_parser(subparsers)
+    importtime.add_parser(subparsers)
+    serve.add_parser(subparsers)
+    bench.add_parser(subparsers)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Analysis API Handlers
+
+The endpoint logic behind `python -m resume_decoder serve`, independent of HTTP so it
+can run inside worker processes (or be called directly). Every endpoint takes a JSON
+object and returns a JSON-ready dict:
+
+    /decode   {"text", "style"?, "styles"?}  buzzword score, matches, decoded text
+    /tone     {"text"}                       tone keyword counts and dominant tone
+    /ats      {"text"}                       ATS checks and pass score
+    /match    {"resume", "job", "record_job"?}  BM25-weighted keyword match (read-only by default)
+    /quality  {"text"}                       buzzword, ATS, tone and quality scores
+
+handle() parses the request body and serializes the response too, so the server's
+event loop only moves bytes.
+"""
+
+import json
+import os
+from typing import Callable, Dict, Tuple
+
+from app.components.analysis_engine import analyze_document
+from resume_decoder.batch import BUZZWORD_FILE, summarize_analysis
+from utils.ats_check import check_ats_friendly
+from utils.buzzword_dictionary import BuzzwordDictionary, load_dictionary
+from utils.job_corpus import get_job_corpus
+from utils.phrase_matcher import tokenize
+from utils.style_metadata import DEFAULT_STYLE, STYLE_DESCRIPTIONS
+from utils.tone_analyzer import analyze_tone, find_tone_hits, get_dominant_tone
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+# Per-process state, filled in by init_worker
+_worker = {"buzzword_file": BUZZWORD_FILE}
+
+
+def init_worker(buzzword_file: str = BUZZWORD_FILE):
+    """
+    Loads the buzzword dictionary and ATS ruleset before the first request.
+
+    Parameters:
+        buzzword_file (str): Buzzword JSON file or compiled dictionary artifact
+    """
+    _worker["buzzword_file"] = buzzword_file
+    _dictionary()
+    check_ats_friendly("")
+
+
+def _dictionary() -> BuzzwordDictionary:
+    # load_dictionary() re-stats the file, so edits are picked up without a restart
+    return load_dictionary(_worker["buzzword_file"])
+
+
+def _text(payload: Dict, field: str = "text") -> str:
+    value = payload.get(field)
+    if not isinstance(value, str):
+        raise ApiError(400, f"'{field}' must be a string.")
+    return value
+
+
+def _style(name) -> str:
+    # Lists and dicts are unhashable; the membership test would raise TypeError
+    if not isinstance(name, str) or name not in STYLE_DESCRIPTIONS:
+        raise ApiError(400, f"Unknown style {name!r}; expected one of {', '.join(STYLE_DESCRIPTIONS)}.")
+    return name
+
+
+def decode(payload: Dict) -> Dict:
+    """
+    Finds buzzwords and rewrites the text in one style, several, or all of them.
+
+    Parameters:
+        payload (dict): "text"; "style" (default Plain English) or "styles" (a list, or "all")
+
+    Returns:
+        dict: "buzzword_score", "word_count", "buzzwords" (phrase, meaning, start, end) and
+              "decoded" (a string for "style", a style -> text dict for "styles")
+    """
+    text = _text(payload)
+    dictionary = _dictionary()
+    analysis = analyze_document(text, dictionary)
+    result = {
+        "buzzword_score": analysis.buzzword_score,
+        "word_count": analysis.word_count,
+        "buzzwords": [
+            {"phrase": match.key, "meaning": dictionary[match.key], "start": match.start, "end": match.end}
+            for match in analysis.buzzword_matches
+        ],
+    }
+
+    styles = payload.get("styles")
+    if styles is not None:
+        if styles == "all":
+            styles = list(STYLE_DESCRIPTIONS)
+        elif not isinstance(styles, list):
+            raise ApiError(400, "'styles' must be a list of styles or \"all\".")
+        result["decoded"] = analysis.decoded_all([_style(style) for style in styles])
+    else:
+        style = _style(payload.get("style", DEFAULT_STYLE))
+        result["style"] = style
+        result["decoded"] = analysis.decoded(style)
+    return result
+
+
+def tone(payload: Dict) -> Dict:
+    """
+    Counts tone keywords per category.
+
+    Parameters:
+        payload (dict): "text"
+
+    Returns:
+        dict: "tone" (category -> count) and "dominant" (category, or "neutral")
+    """
+    text = _text(payload)
+    counts = analyze_tone(text, find_tone_hits(text, tokenize(text)))
+    return {"tone": counts, "dominant": get_dominant_tone(counts)}
+
+
+def ats(payload: Dict) -> Dict:
+    """
+    Runs the ATS checks.
+
+    Parameters:
+        payload (dict): "text"
+
+    Returns:
+        dict: Check name -> passed, plus "pass_score"
+    """
+    return check_ats_friendly(_text(payload))
+
+
+def match(payload: Dict) -> Dict:
+    """
+    Scores a resume against a job description, as the Resume Builder does.
+
+    Parameters:
+        payload (dict): "resume", "job", and "record_job" (default false); when true the
+                        job description is first added to the shared corpus statistics
+
+    Returns:
+        dict: "match_percent", "matched_keywords", "missing_keywords" and "weights"
+    """
+    resume, job = _text(payload, "resume"), _text(payload, "job")
+    corpus = get_job_corpus()
+    if payload.get("record_job", False) is True:
+        corpus.add(job)
+    return corpus.match(job, resume)
+
+
+def quality(payload: Dict) -> Dict:
+    """
+    Scores a document the way the batch scorer does.
+
+    Parameters:
+        payload (dict): "text"
+
+    Returns:
+        dict: Word count, buzzword score, tone counts, ATS flags and quality score
+    """
+    result = summarize_analysis(analyze_document(_text(payload), _dictionary()))
+    del result["style"]
+    return result
+
+
+ENDPOINTS: Dict[str, Callable[[Dict], Dict]] = {
+    "/decode": decode,
+    "/tone": tone,
+    "/ats": ats,
+    "/match": match,
+    "/quality": quality,
+}
+
+
+def handle(path: str, body: bytes) -> Tuple[int, bytes]:
+    """
+    Runs one API request end to end. Never raises; errors become JSON error responses.
+
+    Parameters:
+        path (str): Endpoint path, e.g. "/decode"
+        body (bytes): Request body (a JSON object)
+
+    Returns:
+        tuple: (HTTP status, JSON response body)
+    """
+    try:
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            raise ApiError(404, f"Unknown endpoint {path}.")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as exc:
+            raise ApiError(400, f"Request body is not valid JSON: {exc}") from exc
+        if not isinstance(payload, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        status, result = 200, endpoint(payload)
+    except ApiError as e:
+        status, result = e.status, {"error": e.message}
+    except Exception as e:
+        status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+    return status, json.dumps(result, ensure_ascii=False).encode("utf-8")
+
+
+def worker_pid() -> int:
+    """Returns the worker's process id; used to warm up every pool process."""
+    return os.getpid()
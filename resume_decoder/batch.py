@@ -0,0 +1,312 @@
+"""
+Batch Resume Scoring
+
+Scores a directory of resume files (PDF, DOCX, ODT, RTF, HTML, Markdown, TXT) or a
+JSONL stream of {"id", "text"} records without the Streamlit UI. Files are streamed page by page, optionally capped with
+--max-pages/--max-chars or cut short with --early-exit once every ATS requirement
+passes. Documents are grouped into chunks and scored in a process pool; at most a
+few chunks per worker are in flight at once and results are written as JSONL in
+input order as soon as each chunk finishes, so memory stays bounded no matter how
+many documents are in the input.
+
+Usage:
+    python -m resume_decoder batch resumes/ -o scores.jsonl --workers 8 --chunk-size 32
+    cat applicants.jsonl | python -m resume_decoder batch - > scores.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from app.components.analysis_engine import DocumentAnalysis, analyze_chunks, analyze_document
+from utils import parallel_pdf
+from utils.buzzword_dictionary import load_dictionary
+from utils.file_loader import EXTENSION_TYPES, detect_file_type, iter_document_chunks
+from utils.score_meter import calculate_resume_quality
+from utils.style_metadata import DEFAULT_STYLE, STYLE_DESCRIPTIONS
+
+BUZZWORD_FILE = os.path.join(ROOT, "utils", "buzzwords.json")
+DEFAULT_CHUNK_SIZE = 16
+PENDING_CHUNKS_PER_WORKER = 2
+
+# Per-process settings, filled in by _init_worker so each task only ships its documents
+_worker = {}
+
+
+def iter_directory(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Yields supported files under a directory, recursively and in a stable order.
+
+    Parameters:
+        path (str): Directory to scan
+
+    Returns:
+        Iterator[dict]: {"id": relative path, "path": absolute path} per file
+    """
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in EXTENSION_TYPES:
+                full_path = os.path.join(dirpath, filename)
+                yield {"id": os.path.relpath(full_path, path), "path": full_path}
+
+
+def iter_jsonl(stream: IO[str]) -> Iterator[Dict[str, str]]:
+    """
+    Yields {"id", "text"} records from a JSONL stream, one line at a time.
+
+    Parameters:
+        stream (IO[str]): Open text stream
+
+    Returns:
+        Iterator[dict]: Records; "id" defaults to the line number when missing. Lines that
+                        are not a JSON object yield {"id": line number, "error": ...}, which
+                        is written out as that line's result instead of stopping the run
+    """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield {"id": line_no, "error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield {"id": line_no, "error": f"Expected a JSON object, got {type(record).__name__}"}
+            continue
+        yield {"id": record.get("id", line_no), "text": record.get("text", "")}
+
+
+def summarize_analysis(analysis: DocumentAnalysis, style: str = DEFAULT_STYLE, include_decoded: bool = False) -> Dict:
+    """
+    Turns a DocumentAnalysis into a JSON-ready summary.
+
+    Parameters:
+        analysis (DocumentAnalysis): Output of analyze_document() or analyze_chunks()
+        style (str): Decoding style for the optional decoded text
+        include_decoded (bool): Whether to include the rewritten text
+
+    Returns:
+        dict: Scores, tone counts and ATS flags
+    """
+    result = {
+        "style": style,
+        "word_count": analysis.word_count,
+        "complete": analysis.complete,
+        "buzzword_score": analysis.buzzword_score,
+        "tone": analysis.tone_counts,
+        "ats": analysis.ats,
+        "quality_score": calculate_resume_quality(analysis.buzzword_score, analysis.ats_score, analysis.tone_counts),
+    }
+    if include_decoded:
+        result["decoded"] = analysis.decoded(style)
+    return result
+
+
+def score_text(text: str, buzzword_map: Dict[str, str], style: str = DEFAULT_STYLE, include_decoded: bool = False) -> Dict:
+    """
+    Runs the decoder pipeline on one document and returns a JSON-ready summary.
+
+    Parameters:
+        text (str): Resume or job description text
+        buzzword_map (dict): Buzzword lookup dictionary
+        style (str): Decoding style for the optional decoded text
+        include_decoded (bool): Whether to include the rewritten text
+
+    Returns:
+        dict: Scores, tone counts and ATS flags
+    """
+    return summarize_analysis(analyze_document(text, buzzword_map), style, include_decoded)
+
+
+def score_file(
+    path: str,
+    buzzword_map: Dict[str, str],
+    style: str = DEFAULT_STYLE,
+    include_decoded: bool = False,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    early_exit: bool = False,
+) -> Dict:
+    """
+    Streams a file page by page through the analysis engine and returns a JSON-ready summary.
+
+    Parameters:
+        path (str): Document in any format file_loader supports
+        buzzword_map (dict): Buzzword lookup dictionary
+        style (str): Decoding style for the optional decoded text
+        include_decoded (bool): Whether to include the rewritten text
+        max_pages (int, optional): Stop after this many PDF pages
+        max_chars (int, optional): Stop after this many characters
+        early_exit (bool): Stop reading once every ATS requirement has passed
+
+    Returns:
+        dict: Scores, tone counts and ATS flags; "complete" is False if reading stopped early,
+              and "warnings" says if max_pages or max_chars cut the document short
+    """
+    warnings: List[str] = []
+    chunks = iter_document_chunks(path, detect_file_type(path), max_pages, max_chars, warnings)
+    analysis = analyze_chunks(chunks, buzzword_map, stop_when_satisfied=early_exit)
+    result = summarize_analysis(analysis, style, include_decoded)
+    if warnings:
+        result["warnings"] = warnings
+    return result
+
+
+def _init_worker(buzzword_file: str, options: Dict, in_pool: bool = True):
+    if in_pool:
+        # Documents are already spread across processes; don't fan each PDF out again
+        parallel_pdf.configure(workers=1)
+    # Loads the precompiled automaton when a dictionary artifact exists
+    _worker["buzzword_map"] = load_dictionary(buzzword_file)
+    _worker["options"] = options
+
+
+def _score_chunk(items: List[Dict[str, str]]) -> List[Dict]:
+    results = []
+    for item in items:
+        try:
+            options = _worker["options"]
+            if "error" in item:
+                result = {"error": item["error"]}
+            elif "text" in item:
+                text = item["text"]
+                if options["max_chars"] is not None:
+                    text = text[:options["max_chars"]]
+                result = score_text(text, _worker["buzzword_map"], options["style"], options["include_decoded"])
+            else:
+                result = score_file(item["path"], _worker["buzzword_map"], **options)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results.append({"id": item["id"], **result})
+    return results
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _write_chunk(results: List[Dict], out: IO[str]) -> int:
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    out.flush()
+    return len(results)
+
+
+def run_batch(
+    items: Iterable[Dict[str, str]],
+    out: IO[str],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    style: str = DEFAULT_STYLE,
+    include_decoded: bool = False,
+    buzzword_file: str = BUZZWORD_FILE,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    early_exit: bool = False,
+) -> int:
+    """
+    Scores items in a process pool and streams one JSON line per item to `out`.
+
+    Parameters:
+        items (Iterable[dict]): Records with "id" and either "text" or "path"
+        out (IO[str]): Destination for JSONL results
+        workers (int, optional): Worker processes; defaults to the CPU count, 1 runs in-process
+        chunk_size (int): Documents per task sent to a worker
+        style (str): Decoding style for the optional decoded text
+        include_decoded (bool): Whether to include the rewritten text in each result
+        buzzword_file (str): Path to the buzzword JSON mapping
+        max_pages (int, optional): Stop reading each file after this many PDF pages
+        max_chars (int, optional): Stop reading each document after this many characters
+        early_exit (bool): Stop reading a file once every ATS requirement has passed
+
+    Returns:
+        int: Number of results written
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked(items, max(chunk_size, 1))
+    options = {
+        "style": style,
+        "include_decoded": include_decoded,
+        "max_pages": max_pages,
+        "max_chars": max_chars,
+        "early_exit": early_exit,
+    }
+    initargs = (buzzword_file, options)
+    written = 0
+
+    if workers == 1:
+        _init_worker(*initargs, in_pool=False)
+        for chunk in chunks:
+            written += _write_chunk(_score_chunk(chunk), out)
+        return written
+
+    max_pending = workers * PENDING_CHUNKS_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                written += _write_chunk(pending.popleft().result(), out)
+            pending.append(pool.submit(_score_chunk, chunk))
+        while pending:
+            written += _write_chunk(pending.popleft().result(), out)
+    return written
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("batch", help="Score a directory of resumes or a JSONL stream.")
+    parser.add_argument("input", help="Directory of resume files, a .jsonl file, or '-' for JSONL on stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output path (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Documents per worker task")
+    parser.add_argument("--style", default=DEFAULT_STYLE, choices=list(STYLE_DESCRIPTIONS), help="Decoding style")
+    parser.add_argument("--include-decoded", action="store_true", help="Include the decoded text in each result")
+    parser.add_argument("--buzzwords", default=BUZZWORD_FILE, help="Buzzword mapping JSON")
+    parser.add_argument("--max-pages", type=int, default=None, help="Read at most this many pages per PDF")
+    parser.add_argument("--max-chars", type=int, default=None, help="Read at most this many characters per document")
+    parser.add_argument("--early-exit", action="store_true", help="Stop reading a file once all ATS requirements pass")
+    parser.set_defaults(func=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    in_stream = None
+    if args.input == "-":
+        items = iter_jsonl(sys.stdin)
+    elif os.path.isdir(args.input):
+        items = iter_directory(args.input)
+    else:
+        in_stream = open(args.input, "r", encoding="utf-8")
+        items = iter_jsonl(in_stream)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = run_batch(
+            items,
+            out,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            style=args.style,
+            include_decoded=args.include_decoded,
+            buzzword_file=args.buzzwords,
+            max_pages=args.max_pages,
+            max_chars=args.max_chars,
+            early_exit=args.early_exit,
+        )
+    finally:
+        if in_stream is not None:
+            in_stream.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Scored {count} documents.", file=sys.stderr)
+    return 0
@@ -0,0 +1,317 @@
+"""
+Benchmarks for the Analysis Hot Paths
+
+Times decode_text, highlight_tone_words, analyze_tone, check_ats_friendly,
+extract_keywords and load_text_from_file on synthetic documents (resume_decoder.synthetic)
+from a single bullet up to 100k words. Each case reports latency percentiles,
+throughput in calls and words per second, and peak Python memory (tracemalloc, in a
+separate untimed run so tracing doesn't skew the timings).
+
+Results can be saved as a baseline and compared against later runs; a case regresses
+when its median latency or peak memory grows past --threshold (and by more than a
+small absolute margin, so sub-millisecond noise doesn't fail a run). Baselines are
+machine-specific: record one on the machine that runs the comparison.
+
+Caches are defeated per call (keyword memo cleared, a unique suffix per extracted
+file) so the numbers are for cold work, not cache hits; the text cache is kept in
+memory so runs neither time nor fill the on-disk cache.
+
+Usage:
+    python -m resume_decoder bench --save-baseline benchmarks/baseline.json
+    python -m resume_decoder bench --compare benchmarks/baseline.json --threshold 0.25
+    python -m resume_decoder bench --functions decode_text --sizes bullet 1k
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from app.components.text_utils import decode_text
+from resume_decoder.batch import BUZZWORD_FILE
+from resume_decoder.synthetic import generate_document
+from utils.ats_check import check_ats_friendly
+from utils.file_loader import load_text_from_file
+from utils.keyword_engine import get_keyword_extractor
+from utils.resume_tools import extract_keywords
+from utils.tone_analyzer import analyze_tone, highlight_tone_words
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+BENCH_SIZES = {"bullet": 15, "100": 100, "1k": 1_000, "10k": 10_000, "100k": 100_000}
+MIN_TIME = 0.5  # seconds of timed calls per case
+MIN_RUNS = 5
+MAX_RUNS = 2000
+REGRESSION_THRESHOLD = 0.25  # fractional growth that fails a comparison
+MIN_LATENCY_DELTA_MS = 0.05
+MIN_MEMORY_DELTA_BYTES = 64 * 1024
+
+
+@dataclass
+class BenchResult:
+    function: str
+    size: str
+    words: int
+    runs: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    calls_per_sec: float
+    words_per_sec: float
+    peak_memory_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.function}@{self.size}"
+
+
+class _Upload(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile."""
+
+    def __init__(self, data: bytes, name: str, type: str):
+        super().__init__(data)
+        self.name = name
+        self.type = type
+
+
+def _html(text: str) -> str:
+    body = "".join(f"<p>{line}</p>\n" for line in text.splitlines() if line)
+    return f"<html><body>\n{body}</body></html>\n"
+
+
+def _upload_case(extension: str, mime: str, render: Callable[[str], str]) -> Callable[[str], Callable[[int], tuple]]:
+    def prepare(text: str) -> Callable[[int], tuple]:
+        data = render(text).encode("utf-8")
+        # A unique suffix per call keeps the extracted-text cache from answering
+        return lambda run: (_Upload(data + f"\n{time.perf_counter_ns()}-{run}\n".encode(), f"bench{extension}", mime),)
+    return prepare
+
+
+def _text_case(text: str) -> Callable[[int], tuple]:
+    return lambda run: (text,)
+
+
+def _buzzword_map() -> Dict[str, str]:
+    with open(BUZZWORD_FILE, "r") as f:
+        return json.load(f)
+
+
+def _uncached_keywords(text: str):
+    get_keyword_extractor().clear_cache()
+    return extract_keywords(text)
+
+
+def bench_functions() -> Dict[str, tuple]:
+    """
+    Returns the benchmarked functions.
+
+    Returns:
+        dict: Name -> (function, prepare) where prepare(text) returns a per-run argument factory
+    """
+    buzzword_map = _buzzword_map()
+    return {
+        "decode_text": (lambda text: decode_text(text, buzzword_map), _text_case),
+        "highlight_tone_words": (highlight_tone_words, _text_case),
+        "analyze_tone": (analyze_tone, _text_case),
+        "check_ats_friendly": (check_ats_friendly, _text_case),
+        "extract_keywords": (_uncached_keywords, _text_case),
+        "load_text_from_file[txt]": (load_text_from_file, _upload_case(".txt", "text/plain", lambda text: text)),
+        "load_text_from_file[html]": (load_text_from_file, _upload_case(".html", "text/html", _html)),
+    }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(name: str, function: Callable, args_for: Callable[[int], tuple], size: str, words: int,
+             min_time: float = MIN_TIME) -> BenchResult:
+    """
+    Times one function on one document size.
+
+    Parameters:
+        name (str): Function name for the report
+        function (callable): Function under test
+        args_for (callable): Returns the arguments for run i (built outside the timed region)
+        size (str): Size label
+        words (int): Words in the document
+        min_time (float): Keep calling until this many seconds were timed (at least MIN_RUNS calls)
+
+    Returns:
+        BenchResult: Latency, throughput and memory figures
+    """
+    function(*args_for(-1))  # warm-up: imports, compiled patterns, lazy tables
+
+    timings = []
+    total = 0.0
+    run = 0
+    while run < MAX_RUNS and (run < MIN_RUNS or total < min_time):
+        args = args_for(run)
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+        run += 1
+
+    args = args_for(run)
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    mean = total / len(timings)
+    return BenchResult(
+        function=name,
+        size=size,
+        words=words,
+        runs=len(timings),
+        p50_ms=round(_percentile(timings, 0.50) * 1000, 4),
+        p95_ms=round(_percentile(timings, 0.95) * 1000, 4),
+        p99_ms=round(_percentile(timings, 0.99) * 1000, 4),
+        mean_ms=round(mean * 1000, 4),
+        calls_per_sec=round(1 / mean, 2) if mean else 0.0,
+        words_per_sec=round(words / mean) if mean else 0,
+        peak_memory_bytes=peak,
+    )
+
+
+def run_benchmarks(functions: Optional[List[str]] = None, sizes: Optional[List[str]] = None,
+                   min_time: float = MIN_TIME, seed: int = 0, progress=None) -> List[BenchResult]:
+    """
+    Runs every selected (function, size) case.
+
+    Parameters:
+        functions (list, optional): Function names; defaults to all of bench_functions()
+        sizes (list, optional): Size labels from BENCH_SIZES; defaults to all
+        min_time (float): Timed seconds per case
+        seed (int): Synthetic document seed
+        progress (callable, optional): Called with each BenchResult as it finishes
+
+    Returns:
+        list: BenchResult per case
+    """
+    available = bench_functions()
+    results = []
+    for size in sizes or list(BENCH_SIZES):
+        words = BENCH_SIZES[size]
+        text = generate_document(words, "resume", seed)
+        for name in functions or list(available):
+            function, prepare = available[name]
+            result = run_case(name, function, prepare(text), size, words, min_time)
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
+
+
+def compare(results: List[BenchResult], baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Lists the cases that regressed against a baseline.
+
+    Parameters:
+        results (list): Current BenchResults
+        baseline (dict): Output of save_results() loaded from JSON
+        threshold (float): Allowed fractional growth of median latency and peak memory
+
+    Returns:
+        list: Human-readable regression descriptions (empty when nothing regressed)
+    """
+    previous = {f"{case['function']}@{case['size']}": case for case in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result.key)
+        if old is None:
+            continue
+        if (result.p50_ms > old["p50_ms"] * (1 + threshold)
+                and result.p50_ms - old["p50_ms"] > MIN_LATENCY_DELTA_MS):
+            regressions.append(f"{result.key}: p50 {old['p50_ms']:.3f} -> {result.p50_ms:.3f} ms")
+        if (result.peak_memory_bytes > old["peak_memory_bytes"] * (1 + threshold)
+                and result.peak_memory_bytes - old["peak_memory_bytes"] > MIN_MEMORY_DELTA_BYTES):
+            regressions.append(
+                f"{result.key}: peak memory {old['peak_memory_bytes'] / 1024:.0f} -> "
+                f"{result.peak_memory_bytes / 1024:.0f} KiB"
+            )
+    return regressions
+
+
+def save_results(results: List[BenchResult], path: str):
+    """
+    Writes results with the interpreter and machine they were measured on.
+
+    Parameters:
+        results (list): BenchResults
+        path (str): Output JSON file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def _format(result: BenchResult) -> str:
+    return (f"{result.function:<27} {result.size:>6} {result.runs:>6} {result.p50_ms:>10.3f} {result.p95_ms:>10.3f} "
+            f"{result.p99_ms:>10.3f} {result.calls_per_sec:>10.1f} {result.words_per_sec:>12,} "
+            f"{result.peak_memory_bytes / 1024:>10.0f}")
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("bench", help="Benchmark the analysis hot paths.")
+    parser.add_argument("--functions", nargs="+", help="Functions to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", choices=list(BENCH_SIZES), help="Document sizes (default: all)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help=f"Timed seconds per case (default: {MIN_TIME})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write results as JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="Store results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Fail on regressions against a baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Allowed fractional growth (default: {REGRESSION_THRESHOLD})")
+    parser.set_defaults(func=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    # Memory-only text cache: file loads shouldn't time (or fill) the on-disk cache
+    os.environ["RESUME_DECODER_CACHE_DIR"] = ""
+    available = bench_functions()
+    unknown = [name for name in args.functions or [] if name not in available]
+    if unknown:
+        print(f"Unknown functions: {', '.join(unknown)}. Choose from: {', '.join(available)}", file=sys.stderr)
+        return 2
+
+    print(f"{'function':<27} {'size':>6} {'runs':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} "
+          f"{'calls/s':>10} {'words/s':>12} {'peak KiB':>10}")
+    results = run_benchmarks(args.functions, args.sizes, args.min_time, args.seed,
+                             progress=lambda result: print(_format(result), flush=True))
+
+    if args.output:
+        save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+        print(f"Saved baseline to {args.save_baseline}.", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) past {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"No regressions past {args.threshold:.0%} against {args.compare}.", file=sys.stderr)
+    return 0
@@ -0,0 +1,50 @@
+"""
+Buzzword Dictionary Commands
+
+Compiles a buzzword JSON file into a dictionary artifact (normalized keys, prebuilt
+phrase automaton, content version) that the app and batch scorer load without
+recompiling; see utils.buzzword_dictionary.
+
+Usage:
+    python -m resume_decoder dictionary compile utils/buzzwords.json -o dist/buzzwords.pkl
+    python -m resume_decoder dictionary info dist/buzzwords.pkl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from utils.buzzword_dictionary import ARTIFACT_EXTENSION, BuzzwordDictionary, load_dictionary, save_dictionary
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BUZZWORD_FILE = os.path.join(ROOT, "utils", "buzzwords.json")
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("dictionary", help="Compile and inspect buzzword dictionaries.")
+    commands = parser.add_subparsers(dest="dictionary_command", required=True)
+
+    compile_ = commands.add_parser("compile", help="Compile a buzzword JSON file into an artifact")
+    compile_.add_argument("source", nargs="?", default=BUZZWORD_FILE)
+    compile_.add_argument("-o", "--output", help=f"Artifact path (default: SOURCE with {ARTIFACT_EXTENSION})")
+
+    info = commands.add_parser("info", help="Print entries, version and load time of a JSON file or artifact")
+    info.add_argument("path", nargs="?", default=BUZZWORD_FILE)
+    parser.set_defaults(func=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.dictionary_command == "compile":
+        output = args.output or os.path.splitext(args.source)[0] + ARTIFACT_EXTENSION
+        dictionary = load_dictionary(args.source)
+        save_dictionary(dictionary, output)
+        print(f"Wrote {output}: {len(dictionary)} entries, version {dictionary.version}.", file=sys.stderr)
+        return 0
+
+    start = time.perf_counter()
+    dictionary: BuzzwordDictionary = load_dictionary(args.path)
+    elapsed = time.perf_counter() - start
+    print(f"{args.path}: {len(dictionary)} entries, {len(dictionary.matcher)} phrases, version {dictionary.version}, "
+          f"loaded in {elapsed * 1000:.1f} ms")
+    return 0
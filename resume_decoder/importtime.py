@@ -0,0 +1,117 @@
+"""
+Import-Time Budget Check
+
+Imports each module in a fresh interpreter and fails if it takes longer than its
+budget, so a heavy top-level import (sklearn, PyMuPDF, Streamlit, ...) sneaking into a
+cold-start path is caught in CI instead of on the first request after a scale-up.
+Each module is timed several times and the fastest run counts; on failure the
+slowest imports from `python -X importtime` are listed.
+
+Usage:
+    python -m resume_decoder importtime
+    python -m resume_decoder importtime utils.file_loader=80 --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Milliseconds, measured after interpreter startup
+IMPORT_BUDGETS_MS = {
+    "utils": 20,
+    "utils.file_loader": 120,
+    "app.components.analysis_engine": 120,
+    "resume_decoder.batch": 250,
+}
+DEFAULT_RUNS = 3
+REPORT_TOP = 8
+
+_TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def measure_import(module: str, runs: int = DEFAULT_RUNS) -> float:
+    """
+    Times `import module` in fresh interpreters.
+
+    Parameters:
+        module (str): Module to import
+        runs (int): Interpreters to start; the fastest run is returned
+
+    Returns:
+        float: Import time in milliseconds
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    best = None
+    for _ in range(runs):
+        result = _run(["-c", _TIMER.format(module=module)])
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+        elapsed = float(result.stdout.strip().splitlines()[-1]) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def heaviest_imports(module: str, top: int = REPORT_TOP) -> List[Tuple[float, str]]:
+    """
+    Lists the modules that dominate an import, from `python -X importtime`.
+
+    Parameters:
+        module (str): Module to import
+        top (int): Entries to return
+
+    Returns:
+        list: (cumulative milliseconds, imported module) pairs, slowest first
+    """
+    result = _run(["-X", "importtime", "-c", f"import {module}"])
+    entries = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            entries.append((int(parts[1]) / 1000, parts[2].strip()))
+    entries.sort(reverse=True)
+    return entries[:top]
+
+
+def _parse_budgets(specs: List[str]) -> Dict[str, float]:
+    budgets = {}
+    for spec in specs:
+        module, _, budget = spec.partition("=")
+        budgets[module] = float(budget) if budget else IMPORT_BUDGETS_MS.get(module, max(IMPORT_BUDGETS_MS.values()))
+    return budgets
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("importtime", help="Fail if module imports exceed their time budgets.")
+    parser.add_argument("modules", nargs="*", help="MODULE or MODULE=MS (default: the built-in budgets)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Timed runs per module (default: {DEFAULT_RUNS})")
+    parser.set_defaults(func=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    budgets = _parse_budgets(args.modules) if args.modules else dict(IMPORT_BUDGETS_MS)
+    failed = False
+    for module, budget in budgets.items():
+        try:
+            elapsed = measure_import(module, args.runs)
+        except RuntimeError as e:
+            print(f"FAIL {module}: {e}")
+            failed = True
+            continue
+        ok = elapsed <= budget
+        print(f"{'ok  ' if ok else 'FAIL'} {module}: {elapsed:.1f} ms (budget {budget:g} ms)")
+        if not ok:
+            failed = True
+            for cumulative, name in heaviest_imports(module):
+                print(f"       {cumulative:8.1f} ms  {name}")
+    return 1 if failed else 0
@@ -0,0 +1,120 @@
+"""
+Search Index Commands
+
+Adds exported bundles (the JSON files the app downloads, or JSONL with one bundle per
+line) to the on-disk search index and queries it; see utils.bundle_index.
+
+Usage:
+    python -m resume_decoder index add exports/ more.jsonl
+    python -m resume_decoder index search 'python AND leadership' --min-quality 70 --no-flag possible_formatting_issues
+    python -m resume_decoder index delete KEY
+    python -m resume_decoder index optimize [--vacuum]
+"""
+
+import argparse
+import json
+import os
+import sys
+from itertools import islice
+from typing import Dict, Iterator, Tuple
+
+from utils.bundle_index import OPTIMIZE_HINT_GENERATIONS, BundleIndex, bundle_key
+from utils.job_corpus import data_dir
+
+ADD_BATCH_SIZE = 5000
+
+
+def iter_bundles(path: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yields (key, bundle) pairs from a bundle JSON file, a JSONL file or a directory of either.
+
+    Parameters:
+        path (str): File or directory
+
+    Returns:
+        Iterator[tuple]: Keys are the file path for .json files, and the record's "id"
+                         (or a hash of its input) for JSONL lines
+    """
+    if os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith((".json", ".jsonl")):
+                    yield from iter_bundles(os.path.join(dirpath, filename))
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    bundle = json.loads(line)
+                    yield str(bundle.get("id") or bundle_key(bundle)), bundle
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield path, json.load(f)
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("index", help="Search exported bundles.")
+    default_path = os.path.join(data_dir() or ".", "bundle_index.sqlite")
+    parser.add_argument("--index", default=default_path, help=f"Index file (default: {default_path})")
+    commands = parser.add_subparsers(dest="index_command", required=True)
+
+    add = commands.add_parser("add", help="Index bundle JSON/JSONL files or directories")
+    add.add_argument("paths", nargs="+")
+
+    delete = commands.add_parser("delete", help="Remove documents by key")
+    delete.add_argument("keys", nargs="+")
+
+    optimize = commands.add_parser("optimize", help="Merge postings and drop deleted documents")
+    optimize.add_argument("--vacuum", action="store_true", help="Also shrink the index file")
+
+    search = commands.add_parser("search", help="Query the index; prints JSONL hits")
+    search.add_argument("query", nargs="?", default="", help='Words, "phrases", OR, NOT/-word')
+    search.add_argument("--min-buzzword", type=float)
+    search.add_argument("--max-buzzword", type=float)
+    search.add_argument("--min-quality", type=float)
+    search.add_argument("--max-quality", type=float)
+    search.add_argument("--tone", help="Required dominant tone category")
+    search.add_argument("--flag", action="append", default=[], help="ATS flag that must be true (repeatable)")
+    search.add_argument("--no-flag", action="append", default=[], help="ATS flag that must be false (repeatable)")
+    search.add_argument("-n", "--limit", type=int, default=20)
+    parser.set_defaults(func=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    index = BundleIndex(args.index)
+
+    if args.index_command == "add":
+        added = 0
+        for path in args.paths:
+            bundles = iter_bundles(path)
+            for batch in iter(lambda: list(islice(bundles, ADD_BATCH_SIZE)), []):
+                added += index.add_many(batch)
+        print(f"Indexed {added} bundles ({len(index)} total).", file=sys.stderr)
+        if index.generations >= OPTIMIZE_HINT_GENERATIONS:
+            print(f"The index has {index.generations} write generations; run `index optimize` to speed up searches.",
+                  file=sys.stderr)
+
+    elif args.index_command == "delete":
+        removed = sum(index.delete(key) for key in args.keys)
+        print(f"Deleted {removed} bundles.", file=sys.stderr)
+
+    elif args.index_command == "optimize":
+        index.optimize(vacuum=args.vacuum)
+
+    else:
+        ats = {flag: True for flag in args.flag}
+        ats.update({flag: False for flag in args.no_flag})
+        results = index.search(
+            args.query,
+            min_buzzword=args.min_buzzword,
+            max_buzzword=args.max_buzzword,
+            min_quality=args.min_quality,
+            max_quality=args.max_quality,
+            tone=args.tone,
+            ats=ats,
+            limit=args.limit,
+        )
+        for hit in results.hits:
+            print(json.dumps(hit._asdict(), ensure_ascii=False))
+        print(f"{results.total} matches in {results.elapsed * 1000:.1f} ms.", file=sys.stderr)
+    return 0
@@ -0,0 +1,90 @@
+"""
+Batch Resume x Job Matching
+
+Matches every resume in one JSONL file against every job description in another and
+writes the top-k jobs per resume (and optionally the top-k resumes per job) as JSONL.
+Resumes are streamed, so only their ids are held in memory; see utils.job_matching.
+
+Usage:
+    python -m resume_decoder match candidates.jsonl reqs.jsonl -k 10 -o matches.jsonl
+    python -m resume_decoder match candidates.jsonl reqs.jsonl --jobs-output by_job.jsonl --use-corpus
+"""
+
+import argparse
+import json
+import sys
+from typing import IO, Dict, Iterator, List
+
+from resume_decoder.batch import iter_jsonl
+from utils.job_corpus import get_job_corpus
+from utils.job_matching import DEFAULT_BLOCK_SIZE, DEFAULT_TOP_K, match_many
+
+
+def _write_matches(out: IO[str], ids: List, top_ids, top_scores, other_ids: List, key: str):
+    for index, row_id in enumerate(ids):
+        matches = [
+            {"id": other_ids[other], "score": round(float(score), 2)}
+            for other, score in zip(top_ids[index], top_scores[index])
+        ]
+        out.write(json.dumps({"id": row_id, key: matches}, ensure_ascii=False) + "\n")
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("match", help="Match many resumes against many job descriptions.")
+    parser.add_argument("resumes", help="JSONL of {\"id\", \"text\"} resumes, or '-' for stdin")
+    parser.add_argument("jobs", help="JSONL of {\"id\", \"text\"} job descriptions")
+    parser.add_argument("-o", "--output", default="-", help="Top jobs per resume as JSONL (default: stdout)")
+    parser.add_argument("--jobs-output", default=None, help="Also write the top resumes per job to this JSONL file")
+    parser.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K, help="Matches to keep per resume and per job")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Resumes scored per matrix product")
+    parser.add_argument("--use-corpus", action="store_true", help="Weight terms with the persistent job corpus statistics")
+    parser.set_defaults(func=main)
+
+
+def _valid_records(records: Iterator[Dict], source: str) -> Iterator[Dict]:
+    # Malformed lines have no text to match; report and skip them
+    for record in records:
+        if "error" in record:
+            print(f"Skipping {source} line {record['id']}: {record['error']}", file=sys.stderr)
+        else:
+            yield record
+
+
+def main(args: argparse.Namespace) -> int:
+    with open(args.jobs, "r", encoding="utf-8") as f:
+        jobs = list(_valid_records(iter_jsonl(f), args.jobs))
+    job_ids = [job["id"] for job in jobs]
+
+    resume_ids = []
+    in_stream = sys.stdin if args.resumes == "-" else open(args.resumes, "r", encoding="utf-8")
+
+    def resume_texts() -> Iterator[str]:
+        for record in _valid_records(iter_jsonl(in_stream), args.resumes):
+            resume_ids.append(record["id"])
+            yield record["text"]
+
+    try:
+        results = match_many(
+            resume_texts(),
+            [job["text"] for job in jobs],
+            top_k=args.top_k,
+            corpus=get_job_corpus() if args.use_corpus else None,
+            block_size=args.block_size,
+        )
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        _write_matches(out, resume_ids, results.top_jobs, results.top_job_scores, job_ids, "jobs")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.jobs_output:
+        with open(args.jobs_output, "w", encoding="utf-8") as f:
+            _write_matches(f, job_ids, results.top_resumes, results.top_resume_scores, resume_ids, "resumes")
+
+    print(f"Matched {len(resume_ids)} resumes against {len(job_ids)} jobs.", file=sys.stderr)
+    return 0
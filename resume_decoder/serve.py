@@ -0,0 +1,272 @@
+"""
+Analysis HTTP Server
+
+Serves the resume_decoder.api endpoints over HTTP/1.1 without the Streamlit UI. An
+asyncio front end parses requests and keeps connections alive; the analysis itself
+(JSON parsing, detection, serialization) runs in a process pool so every core is used.
+
+Requests are POSTed JSON objects; GET /health reports load. Limits protect the
+workers: bodies over --max-body get 413, and once --max-pending requests are in
+flight new ones are answered 503 with Retry-After instead of queueing without bound.
+If a worker process dies, the requests it broke get 503 and the pool is rebuilt.
+
+Usage:
+    python -m resume_decoder serve --port 8765 --workers 16
+    curl -s localhost:8765/decode -d '{"text": "Self-starter in a fast-paced team", "styles": "all"}'
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+
+from resume_decoder import api
+from resume_decoder.batch import BUZZWORD_FILE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+PENDING_PER_WORKER = 64  # in-flight requests per worker before answering 503
+KEEP_ALIVE_TIMEOUT = 15  # seconds an idle connection is kept open
+READ_TIMEOUT = 30  # seconds allowed for the rest of a request once it has started
+
+
+class Request:
+    __slots__ = ("method", "path", "version", "headers", "body")
+
+    def __init__(self, method: str, path: str, version: str, headers: Dict[str, str]):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.body = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _response(status: int, body: bytes, keep_alive: bool, extra_headers: Optional[Dict[str, str]] = None) -> bytes:
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+class AnalysisServer:
+    """
+    Asyncio HTTP front end over a pool of analysis worker processes.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: Optional[int] = None,
+        max_body: int = MAX_BODY_BYTES,
+        max_pending: Optional[int] = None,
+        buzzword_file: str = BUZZWORD_FILE,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_body = max_body
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.buzzword_file = buzzword_file
+
+        self.pending = 0
+        self.served = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=api.init_worker,
+            initargs=(self.buzzword_file,),
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        # Every request in flight on the broken pool fails at once; only the first rebuilds it
+        if self._pool is not broken:
+            return
+        self._pool = self._new_pool()
+        self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        print("A worker process died; restarted the worker pool.", file=sys.stderr)
+
+    async def start(self):
+        """Starts the worker processes, loads their dictionaries and opens the socket."""
+        loop = asyncio.get_running_loop()
+        self._pool = self._new_pool()
+        # Warm every worker up front so the first requests don't pay process startup
+        await asyncio.gather(*(loop.run_in_executor(self._pool, api.worker_pid) for _ in range(self.workers)))
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port, limit=MAX_HEADER_BYTES, backlog=1024
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[Request, int]]:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "Request headers are too large.")
+
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            raise HttpError(400, "Malformed request line.")
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        request = Request(method.upper(), target.split("?", 1)[0], version, headers)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "Chunked request bodies are not supported; send Content-Length.")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length.")
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length.")
+        if length > self.max_body:
+            raise HttpError(413, f"Request body is larger than {self.max_body} bytes.")
+        return request, length
+
+    async def _dispatch(self, request: Request) -> Tuple[int, bytes, Dict[str, str]]:
+        if request.path == "/health":
+            body = {"status": "ok", "workers": self.workers, "pending": self.pending,
+                    "max_pending": self.max_pending, "served": self.served, "rejected": self.rejected,
+                    "restarts": self.restarts}
+            return 200, json.dumps(body).encode("utf-8"), {}
+        if request.path not in api.ENDPOINTS:
+            return 404, _error_body(f"Unknown endpoint {request.path}."), {}
+        if request.method != "POST":
+            return 405, _error_body("Use POST with a JSON body."), {"Allow": "POST"}
+
+        # Backpressure: refuse rather than let the pool's queue grow without bound
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return 503, _error_body("Server is busy; retry shortly."), {"Retry-After": "1"}
+        self.pending += 1
+        pool = self._pool
+        try:
+            loop = asyncio.get_running_loop()
+            status, body = await loop.run_in_executor(pool, api.handle, request.path, request.body)
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            return 503, _error_body("A worker process failed; retry the request."), {"Retry-After": "1"}
+        finally:
+            self.pending -= 1
+        self.served += 1
+        return status, body, {}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    parsed = await self._read_request(reader)
+                    if parsed is None:
+                        break
+                    request, length = parsed
+                    if length:
+                        if request.headers.get("expect", "").lower() == "100-continue":
+                            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                        request.body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT)
+                except HttpError as e:
+                    writer.write(_response(e.status, _error_body(e.message), keep_alive=False))
+                    await writer.drain()
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+
+                status, body, headers = await self._dispatch(request)
+                keep_alive = request.keep_alive
+                writer.write(_response(status, body, keep_alive, headers))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("serve", help="Serve the analysis API over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Analysis processes (default: CPU count)")
+    parser.add_argument("--max-body", type=int, default=MAX_BODY_BYTES, help="Largest request body in bytes")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help=f"In-flight requests before answering 503 (default: {PENDING_PER_WORKER} per worker)")
+    parser.add_argument("--buzzwords", default=BUZZWORD_FILE, help="Buzzword mapping JSON or compiled artifact")
+    parser.set_defaults(func=main)
+
+
+async def _run(server: AnalysisServer):
+    await server.start()
+    print(f"Serving on http://{server.host}:{server.port} with {server.workers} workers.", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(args: argparse.Namespace) -> int:
+    server = AnalysisServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_body=args.max_body,
+        max_pending=args.max_pending,
+        buzzword_file=args.buzzwords,
+    )
+    try:
+        asyncio.run(_run(server))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,87 @@
+"""
+Synthetic Resumes and Job Descriptions
+
+Deterministic text generator for benchmarks and load tests. Documents are laid out
+like the real inputs (contact line, section headers, bullet points) and seeded with
+buzzwords from utils/buzzwords.json and tone keywords from TONE_CATEGORIES at fixed
+rates, so every detector has realistic work to do at any size.
+"""
+
+import json
+import random
+from typing import List
+
+from resume_decoder.batch import BUZZWORD_FILE
+from utils.tone_analyzer import TONE_CATEGORIES
+
+FILLER_WORDS = (
+    "the a and of to in for with on across our their team teams project projects product "
+    "customer customers data platform service services system systems process processes "
+    "quality delivery release releases pipeline pipelines report reports analysis budget "
+    "revenue costs users clients partners vendors requirements features tooling support "
+    "migration infrastructure reliability performance latency testing review reviews "
+    "weekly quarterly annual regional global internal external new existing multiple "
+    "python sql java aws docker kubernetes excel tableau salesforce jira git linux "
+    "improved reduced increased managed coordinated supported maintained delivered "
+    "analyzed automated mentored trained planned launched resolved documented"
+).split()
+RESUME_SECTIONS = ("Summary", "Experience", "Projects", "Education", "Skills", "Certifications")
+JOB_SECTIONS = ("About Us", "The Role", "Responsibilities", "Requirements", "Nice to Have", "Benefits")
+BULLET_WORDS = 15
+
+
+def _load_buzzwords() -> List[str]:
+    with open(BUZZWORD_FILE, "r") as f:
+        return sorted(json.load(f))
+
+
+def generate_document(
+    words: int,
+    kind: str = "resume",
+    seed: int = 0,
+    buzzword_rate: float = 0.08,
+    tone_rate: float = 0.06,
+) -> str:
+    """
+    Generates a resume or job description of roughly the given word count.
+
+    Parameters:
+        words (int): Target number of words (one bullet is about 15)
+        kind (str): "resume" or "job"
+        seed (int): Random seed; the same arguments always give the same text
+        buzzword_rate (float): Share of words drawn from the buzzword dictionary
+        tone_rate (float): Share of words drawn from the tone keyword lists
+
+    Returns:
+        str: Document text
+    """
+    rng = random.Random(f"{kind}:{words}:{seed}")
+    buzzwords = _load_buzzwords()
+    tone_words = [word for keywords in TONE_CATEGORIES.values() for word in keywords]
+    sections = RESUME_SECTIONS if kind == "resume" else JOB_SECTIONS
+
+    def phrase() -> str:
+        roll = rng.random()
+        if roll < buzzword_rate:
+            return rng.choice(buzzwords)
+        if roll < buzzword_rate + tone_rate:
+            return rng.choice(tone_words)
+        return rng.choice(FILLER_WORDS)
+
+    lines = []
+    if kind == "resume":
+        lines += [f"Jordan Example {seed}", f"jordan{seed}@example.com | (555) 010-{seed % 10000:04d}", ""]
+    written = 0
+    section_size = max(BULLET_WORDS, words // len(sections))
+    for section in sections:
+        if written >= words:
+            break
+        lines += [section, ""]
+        target = min(words, written + section_size)
+        while written < target:
+            count = min(BULLET_WORDS, words - written)
+            bullet = " ".join(phrase() for _ in range(count))
+            lines.append(f"- {bullet[0].upper()}{bullet[1:]}.")
+            written += count
+        lines.append("")
+    return "\n".join(lines).strip() + "\n"
@@ -1,12 +1,10 @@
 import re
-from sklearn.feature_extraction.text import CountVectorizer
+
+from utils.keyword_engine import get_keyword_extractor
 
 def extract_keywords(text, top_n=20):
     """Extract most frequent keywords (basic NLP)."""
-    vectorizer = CountVectorizer(stop_words='english', max_features=top_n)
-    X = vectorizer.fit_transform([text])
-    keywords = vectorizer.get_feature_names_out()
-    return list(keywords)
+    return get_keyword_extractor().extract(text, top_n)
 
 def match_keywords(resume_text, job_text):
     """Find matching keywords between resume and job description."""
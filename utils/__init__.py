@@ -1 +1,25 @@
-from utils.resume_tools import extract_keywords, match_keywords, suggest_resume_sections
+"""
+Shared utilities for Resume Decoder.
+
+Submodules are imported on demand, and the keyword helpers re-exported here load
+utils.resume_tools only when first accessed, so `import utils` stays cheap.
+"""
+
+import importlib
+
+_LAZY_EXPORTS = {
+    "extract_keywords": "utils.resume_tools",
+    "match_keywords": "utils.resume_tools",
+    "suggest_resume_sections": "utils.resume_tools",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'utils' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
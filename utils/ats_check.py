@@ -3,51 +3,351 @@ ATS Compatibility Checker
 
 Performs a basic analysis of resume text to check for common applicant tracking system (ATS) pitfalls,
 red flags, and best practices. Returns a dictionary of checks for scoring and display.
+
+Checks are data-driven: a ruleset (JSON, or YAML when PyYAML is installed) is compiled once into a
+single phrase automaton for all term rules plus one compiled regex per pattern, and every rule is
+then evaluated together from one tokenized pass. Patterns are searched independently, so inline
+flags, backreferences and overlapping patterns behave as they would on their own; an invalid
+pattern fails the load with an error naming its rule. The default ruleset lives in
+utils/ats_rules.json; customer rulesets can be loaded with load_ruleset() without code changes.
+AtsRuleset.stream() evaluates a document page by page and reports when every requirement has
+passed, so callers can stop extracting early.
+
+Rule types:
+- "terms": passes when at least `min_hits` distinct terms (or a `min_ratio` of them) appear as words.
+  Terms the tokenizer would alter ("C++", "C#", "Node.js") are matched as literal text instead,
+  bounded by non-word characters, so "C++" never matches a plain "C"
+- "patterns": named regexes over the raw text; passes when "all" (default) or "any" of them match
+
+A rule with "warning": true flags a problem (a pass means "issue found", e.g. table layouts)
+rather than a requirement; warnings don't count toward pass_score or hold up an early exit.
 """
 
+import hashlib
+import json
+import os
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from utils.phrase_matcher import PhraseMatcher, Token, tokenize
+
+DEFAULT_RULESET_FILE = os.path.join(os.path.dirname(__file__), "ats_rules.json")
+
+def _tokenizes_cleanly(term: str) -> bool:
+    """Whether the token automaton can match the term exactly (no punctuation dropped or split)."""
+    return " ".join(token.text for token in tokenize(term)) == " ".join(term.split())
+
+
+def _literal_term_pattern(term: str) -> Pattern:
+    words = r"\s+".join(re.escape(word) for word in term.split())
+    return re.compile(rf"(?<!\w){words}(?!\w)", re.IGNORECASE)
+
 
-REQUIRED_SECTIONS = ["experience", "education", "skills"]
-KEYWORDS = ["project management", "python", "data analysis", "communication", "teamwork", "leadership"]
-ACTION_VERBS = ["developed", "led", "created", "implemented", "managed", "streamlined"]
-BAD_FORMATTING_PATTERNS = ["table", "text box", "header", "footer"]  # simplified for demo
+@dataclass(frozen=True)
+class AtsRule:
+    id: str
+    type: str
+    category: str = ""
+    label: str = ""
+    terms: Tuple[str, ...] = ()
+    patterns: Tuple[Tuple[str, str], ...] = ()  # (name, regex) pairs
+    min_hits: int = 1
+    min_ratio: Optional[float] = None
+    require: str = "all"
+    warning: bool = False  # a pass means an issue was found, not a requirement met
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "AtsRule":
+        if data.get("type") not in ("terms", "patterns"):
+            raise ValueError(f"ATS rule {data.get('id')!r} has unknown type {data.get('type')!r}")
+        return cls(
+            id=data["id"],
+            type=data["type"],
+            category=data.get("category", ""),
+            label=data.get("label", data["id"]),
+            terms=tuple(term.lower() for term in data.get("terms", [])),
+            patterns=tuple(data.get("patterns", {}).items()),
+            min_hits=data.get("min_hits", 1),
+            min_ratio=data.get("min_ratio"),
+            require=data.get("require", "all"),
+            warning=bool(data.get("warning", False)),
+        )
 
-def check_ats_friendly(text: str) -> dict:
+    def passes(self, evidence: Dict[str, str]) -> bool:
+        """Decides the rule from the terms or pattern names it matched."""
+        if self.type == "terms":
+            if self.min_ratio is not None:
+                return len(evidence) / max(len(self.terms), 1) >= self.min_ratio
+            return len(evidence) >= self.min_hits
+        if self.require == "any":
+            return bool(evidence)
+        return len(evidence) == len(self.patterns)
+
+
+class RuleResult(NamedTuple):
+    passed: bool
+    evidence: Dict[str, str]  # matched term -> term, or pattern name -> first matched text
+    warning: bool = False  # from a warning rule: passed means an issue was found
+
+
+class AtsRuleset:
     """
-    Analyzes text for ATS compatibility using keyword presence, structure, and formatting indicators.
+    A compiled set of ATS rules. Build it once (load_ruleset() caches by path) and
+    reuse it for every document.
+    """
+
+    def __init__(self, rules: List[AtsRule], name: str = "custom", version: int = 1):
+        self.rules = list(rules)
+        self.name = name
+        self.version = version
+        # Changes with any rule edit, even when the file's "version" isn't bumped; for cache keys
+        self.fingerprint = hashlib.blake2b(repr(self.rules).encode("utf-8"), digest_size=8).hexdigest()
+
+        # term -> indices of the term rules that use it, all terms in one automaton
+        self._term_rules: Dict[str, List[int]] = {}
+        # terms the tokenizer would alter -> (literal regex, rule indices)
+        self._literal_terms: Dict[str, Tuple[Pattern, List[int]]] = {}
+        # (rule index, pattern name, compiled regex), searched one by one
+        self._patterns: List[Tuple[int, str, Pattern]] = []
+
+        for index, rule in enumerate(self.rules):
+            if rule.type == "terms":
+                for term in rule.terms:
+                    if _tokenizes_cleanly(term):
+                        self._term_rules.setdefault(term, []).append(index)
+                    else:
+                        self._literal_terms.setdefault(term, (_literal_term_pattern(term), []))[1].append(index)
+            else:
+                for pattern_name, pattern in rule.patterns:
+                    try:
+                        compiled = re.compile(pattern)
+                    except re.error as e:
+                        raise ValueError(f"ATS rule {rule.id!r} has an invalid pattern {pattern_name!r}: {e}") from e
+                    self._patterns.append((index, pattern_name, compiled))
+
+        self._term_matcher = PhraseMatcher(self._term_rules)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AtsRuleset":
+        rules = [AtsRule.from_dict(rule) for rule in data.get("rules", [])]
+        return cls(rules, name=data.get("name", "custom"), version=data.get("version", 1))
+
+    def stream(self) -> "AtsStream":
+        """Starts an incremental evaluation that can be fed a document chunk by chunk."""
+        return AtsStream(self)
+
+    def evaluate_detailed(self, text: str, tokens: Optional[List[Token]] = None) -> Dict[str, RuleResult]:
+        """
+        Evaluates every rule from one token scan plus one search per pattern and literal term.
+
+        Parameters:
+            text (str): Resume or job description text
+            tokens (list, optional): Precomputed tokenize(text) output to reuse
+
+        Returns:
+            dict: Rule id -> RuleResult with the pass flag and what matched
+        """
+        stream = self.stream()
+        stream.feed(text, tokens)
+        return stream.results()
+
+    def evaluate(self, text: str, tokens: Optional[List[Token]] = None) -> dict:
+        """
+        Evaluates the ruleset and flattens it into the check_ats_friendly() result shape.
+
+        Parameters:
+            text (str): Resume or job description text
+            tokens (list, optional): Precomputed tokenize(text) output to reuse
+
+        Returns:
+            dict: Rule id -> bool, plus "pass_score" (0-100)
+        """
+        return summarize(self.evaluate_detailed(text, tokens))
+
+    def chunk_evidence(self, text: str, tokens: Optional[List[Token]] = None) -> Tuple[Dict[str, str], ...]:
+        """
+        Collects what each rule matched in one chunk, without deciding any rule. Evidence
+        from several chunks can be combined with AtsStream.merge(), e.g. to cache it per
+        paragraph and re-scan only edited paragraphs.
+
+        Parameters:
+            text (str): Chunk text
+            tokens (list, optional): Precomputed tokenize(text) output to reuse
+
+        Returns:
+            tuple: One evidence dict per rule, in rule order
+        """
+        stream = self.stream()
+        stream.feed(text, tokens)
+        return tuple(stream._evidence)
+
+    def profile(self, text: str) -> Dict[str, float]:
+        """
+        Times each rule in isolation (its own compiled ruleset over a fresh scan), which
+        shows which rules in a customer ruleset are expensive.
+
+        Parameters:
+            text (str): Resume or job description text
+
+        Returns:
+            dict: Rule id -> seconds spent evaluating that rule alone
+        """
+        timings = {}
+        for rule in self.rules:
+            single = _single_rule_ruleset(rule)
+            start = time.perf_counter()
+            single.evaluate_detailed(text)
+            timings[rule.id] = time.perf_counter() - start
+        return timings
+
+
+class AtsStream:
+    """
+    Incremental evaluation of a ruleset over a document fed in chunks (pages or
+    paragraphs). Evidence accumulates across chunks; terms or patterns split across
+    a chunk boundary are not matched.
+    """
+
+    def __init__(self, ruleset: AtsRuleset):
+        self.ruleset = ruleset
+        self._evidence: List[Dict[str, str]] = [{} for _ in ruleset.rules]
+        self._patterns_left = len(ruleset._patterns)
+
+    def feed(self, text: str, tokens: Optional[List[Token]] = None):
+        """
+        Adds one chunk of the document.
+
+        Parameters:
+            text (str): Chunk text
+            tokens (list, optional): Precomputed tokenize(text) output to reuse
+        """
+        ruleset = self.ruleset
+        evidence = self._evidence
+        if tokens is None:
+            tokens = tokenize(text)
+
+        for match in ruleset._term_matcher.match_tokens(tokens):
+            for index in ruleset._term_rules[match.key]:
+                evidence[index][match.key] = match.key
+        for term, (pattern, indices) in ruleset._literal_terms.items():
+            if all(term in evidence[index] for index in indices):
+                continue
+            if pattern.search(text):
+                for index in indices:
+                    evidence[index][term] = term
+
+        if self._patterns_left:
+            for index, pattern_name, pattern in ruleset._patterns:
+                if pattern_name in evidence[index]:
+                    continue
+                match = pattern.search(text)
+                if match is not None:
+                    evidence[index][pattern_name] = match.group(0).strip()
+                    self._patterns_left -= 1
+
+    def merge(self, evidence: Tuple[Dict[str, str], ...]):
+        """
+        Adds evidence collected separately by AtsRuleset.chunk_evidence(); earlier
+        evidence wins when both matched the same term or pattern.
+
+        Parameters:
+            evidence (tuple): One evidence dict per rule, in rule order
+        """
+        for rule_evidence, chunk_evidence in zip(self._evidence, evidence):
+            for name, value in chunk_evidence.items():
+                rule_evidence.setdefault(name, value)
+
+    @property
+    def satisfied(self) -> bool:
+        """
+        True once every requirement rule has passed. Warning rules flag problems rather
+        than requirements, so they don't hold up an early exit.
+        """
+        return all(
+            rule.passes(evidence)
+            for rule, evidence in zip(self.ruleset.rules, self._evidence)
+            if not rule.warning
+        )
+
+    def results(self) -> Dict[str, RuleResult]:
+        """
+        Returns the outcome for everything fed so far.
+
+        Returns:
+            dict: Rule id -> RuleResult with the pass flag and what matched
+        """
+        return {
+            rule.id: RuleResult(rule.passes(evidence), dict(evidence), rule.warning)
+            for rule, evidence in zip(self.ruleset.rules, self._evidence)
+        }
+
+
+@lru_cache(maxsize=256)
+def _single_rule_ruleset(rule: AtsRule) -> AtsRuleset:
+    return AtsRuleset([rule], name=rule.id)
+
+
+def summarize(detailed: Dict[str, RuleResult]) -> dict:
+    """
+    Flattens evaluate_detailed() output into rule id -> bool plus a pass score.
+    pass_score is the percentage of requirement rules passed; warning rules (e.g.
+    formatting issues) are left out of both the numerator and the denominator, since
+    their "passed" means a problem was found.
 
     Parameters:
-        text (str): The resume or job description input
+        detailed (dict): Output of AtsRuleset.evaluate_detailed()
 
     Returns:
         dict: Dictionary with boolean results and score
     """
-    text_lower = text.lower()
-    results = {}
+    results = {rule_id: result.passed for rule_id, result in detailed.items()}
+    requirements = [result.passed for result in detailed.values() if not result.warning]
+    results["pass_score"] = round(sum(requirements) / len(requirements) * 100) if requirements else 0
+    return results
 
-    # Section checks
-    for section in REQUIRED_SECTIONS:
-        results[f"has_{section}_section"] = section in text_lower
 
-    # Keyword coverage
-    keyword_hits = [kw for kw in KEYWORDS if kw in text_lower]
-    results["keyword_coverage"] = len(keyword_hits) / len(KEYWORDS) >= 0.5
+def _read_ruleset_file(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise ImportError("PyYAML is required to load YAML ATS rulesets.") from exc
+            return yaml.safe_load(f)
+        return json.load(f)
 
-    # Action verbs presence
-    action_hits = [verb for verb in ACTION_VERBS if re.search(rf"\b{verb}\b", text_lower)]
-    results["uses_action_verbs"] = len(action_hits) >= 3
 
-    # Contact info check
-    has_email = bool(re.search(r"[\w\.-]+@[\w\.-]+", text))
-    has_phone = bool(re.search(r"\+?\d[\d\s\-()]{7,}", text))
-    results["has_contact_info"] = has_email and has_phone
+@lru_cache(maxsize=64)
+def _load_ruleset(path: str, mtime: float) -> AtsRuleset:
+    return AtsRuleset.from_dict(_read_ruleset_file(path))
 
-    # Bad formatting warning (naive, since we can't see true format in plain text)
-    results["possible_formatting_issues"] = any(term in text_lower for term in BAD_FORMATTING_PATTERNS)
 
-    # Final pass score (simple logic)
-    pass_criteria = sum(1 for v in results.values() if v is True)
-    results["pass_score"] = round((pass_criteria / (len(results) - 1)) * 100)
+def load_ruleset(path: str = DEFAULT_RULESET_FILE) -> AtsRuleset:
+    """
+    Loads and compiles a ruleset file, reusing the compiled ruleset until the file changes.
 
-    return results
+    Parameters:
+        path (str): Path to a JSON or YAML ruleset
+
+    Returns:
+        AtsRuleset: Compiled ruleset
+    """
+    path = os.path.abspath(path)
+    return _load_ruleset(path, os.path.getmtime(path))
+
+
+def check_ats_friendly(text: str, ruleset: Optional[AtsRuleset] = None) -> dict:
+    """
+    Analyzes text for ATS compatibility using keyword presence, structure, and formatting indicators.
+
+    Parameters:
+        text (str): The resume or job description input
+        ruleset (AtsRuleset, optional): Compiled ruleset; defaults to utils/ats_rules.json
+
+    Returns:
+        dict: Dictionary with boolean results and score
+    """
+    return (ruleset or load_ruleset()).evaluate(text)
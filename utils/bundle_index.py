@@ -0,0 +1,529 @@
+"""
+Search Index for Exported Resume Bundles
+
+An on-disk inverted index over create_export_bundle() outputs, so decoded resumes can be
+found by keyword or phrase and filtered by their scores, e.g.
+
+    index.search('python AND leadership', min_quality=70, ats={"possible_formatting_issues": False})
+
+Storage is a single SQLite file:
+- docs: one row per bundle with its filterable fields and the compressed bundle JSON
+- postings: positional postings for the bundle's input text, one row per term per write
+  generation. Document-id deltas, per-document counts and position deltas are stored as
+  separate zlib-compressed uint32 arrays, so keyword queries never decode positions and
+  every array decodes with NumPy in one call.
+
+Adding documents writes a new generation of postings; deleting marks the document as
+deleted. Queries read every generation of a term, so call optimize() (or run
+`python -m resume_decoder index optimize`) once generations pile up; it merges each
+term's generations and drops deleted documents, and is never run on the add path. The
+filter fields of every document are also kept in memory as NumPy columns, so filters
+apply to a whole candidate set in one vectorized step.
+
+Query syntax: words and "quoted phrases" are ANDed (AND is optional); OR separates
+alternatives, e.g. `python "machine learning" OR java`; NOT or a leading - excludes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.job_corpus import data_dir
+from utils.phrase_matcher import WORD_PATTERN, tokenize
+
+OPTIMIZE_HINT_GENERATIONS = 64  # generations after which optimize() is worth running
+MAX_ATS_FLAGS = 63  # flags are stored as bits of one SQLite integer
+_UINT32 = np.dtype("<u4")
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class SearchHit(NamedTuple):
+    key: str
+    score: float  # query term (or phrase) occurrences in the input text
+    buzzword_score: float
+    quality_score: float
+    tone: str
+    ats_flags: List[str]  # ATS checks that came out True
+
+
+class SearchResults(NamedTuple):
+    hits: List[SearchHit]
+    total: int  # matches before the limit
+    elapsed: float
+
+
+def bundle_key(bundle: Dict) -> str:
+    """Default document key: a hash of the bundle's input text."""
+    return hashlib.sha1(bundle.get("input", "").encode("utf-8")).hexdigest()[:20]
+
+
+def dominant_tone(tone: Dict[str, int]) -> str:
+    """The tone category with the most hits, or "" when there are none."""
+    tone = {name: count for name, count in (tone or {}).items() if count}
+    return max(sorted(tone), key=tone.get) if tone else ""
+
+
+def _pack(values: np.ndarray) -> bytes:
+    return zlib.compress(np.ascontiguousarray(values, dtype=_UINT32).tobytes())
+
+
+def _unpack(blob: bytes) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype=_UINT32).astype(np.int64)
+
+
+class _Postings(NamedTuple):
+    doc_ids: np.ndarray    # ascending
+    counts: np.ndarray     # positions per document
+    positions: Optional[np.ndarray] = None  # absolute token positions, grouped by document
+
+
+def _encode_postings(postings: List[Tuple[int, List[int]]]) -> Tuple[bytes, bytes, bytes]:
+    doc_ids = np.fromiter((doc_id for doc_id, _ in postings), dtype=np.int64, count=len(postings))
+    counts = np.fromiter((len(p) for _, p in postings), dtype=np.int64, count=len(postings))
+    positions = np.fromiter(chain.from_iterable(p for _, p in postings), dtype=np.int64, count=int(counts.sum()))
+    # Delta-code positions within each document: the first position of a document is stored as is
+    deltas = np.diff(positions, prepend=0)
+    starts = np.cumsum(counts) - counts
+    deltas[starts] = positions[starts]
+    return _pack(np.diff(doc_ids, prepend=0)), _pack(counts), _pack(deltas)
+
+
+def _decode_positions(blob: bytes, counts: np.ndarray) -> np.ndarray:
+    deltas = _unpack(blob)
+    running = np.cumsum(deltas)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    # Positions are delta-coded per document: subtract the running total before each document
+    return running - np.repeat(running[starts] - deltas[starts], counts)
+
+
+class _Columns:
+    """In-memory filter fields, indexed by doc id."""
+
+    def __init__(self):
+        self.keys: List[Optional[str]] = []
+        self.live = np.zeros(0, dtype=bool)
+        self.buzzword = np.zeros(0, dtype=np.float32)
+        self.quality = np.zeros(0, dtype=np.float32)
+        self.tone = np.zeros(0, dtype=np.int16)
+        self.ats = np.zeros(0, dtype=np.int64)
+        self.tone_names: List[str] = []
+        self.tone_ids: Dict[str, int] = {}
+        self.size = 0
+
+    def tone_id(self, name: str) -> int:
+        if name not in self.tone_ids:
+            self.tone_ids[name] = len(self.tone_names)
+            self.tone_names.append(name)
+        return self.tone_ids[name]
+
+    def set(self, doc_id: int, key: str, live: bool, buzzword: float, quality: float, tone: str, ats: int):
+        if doc_id >= len(self.live):
+            capacity = max(doc_id + 1, 2 * len(self.live), 1024)
+            for name in ("live", "buzzword", "quality", "tone", "ats"):
+                column = getattr(self, name)
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:len(column)] = column
+                setattr(self, name, grown)
+            self.keys.extend([None] * (capacity - len(self.keys)))
+        self.keys[doc_id] = key
+        self.live[doc_id] = live
+        self.buzzword[doc_id] = buzzword
+        self.quality[doc_id] = quality
+        self.tone[doc_id] = self.tone_id(tone)
+        self.ats[doc_id] = ats
+        self.size = max(self.size, doc_id + 1)
+
+
+class BundleIndex:
+    """
+    Inverted index over export bundles, stored in one SQLite file. Safe to share
+    between threads; each process opens its own connection.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._columns: Optional[_Columns] = None
+        self._data_version = None
+        self._flag_bits: Dict[str, int] = {}
+
+    # ------------------------
+    # Storage
+    # ------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reopen after fork so worker processes never share a connection with their parent
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            with self._conn:
+                self._conn.executescript(
+                    "CREATE TABLE IF NOT EXISTS docs ("
+                    " doc_id INTEGER PRIMARY KEY, key TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0,"
+                    " buzzword_score REAL, quality_score REAL, tone TEXT, ats_mask INTEGER, bundle BLOB);"
+                    "CREATE INDEX IF NOT EXISTS idx_docs_key ON docs (key);"
+                    "CREATE TABLE IF NOT EXISTS ats_flags (bit INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);"
+                    "CREATE TABLE IF NOT EXISTS postings ("
+                    " term TEXT NOT NULL, generation INTEGER NOT NULL,"
+                    " docs BLOB NOT NULL, counts BLOB NOT NULL, positions BLOB NOT NULL,"
+                    " PRIMARY KEY (term, generation));"
+                )
+            self._columns = None
+        return self._conn
+
+    def _load_columns(self) -> _Columns:
+        conn = self._connection()
+        # data_version changes when another connection commits, i.e. another process wrote
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._columns is None or data_version != self._data_version:
+            self._data_version = data_version
+            columns = _Columns()
+            self._flag_bits = dict(conn.execute("SELECT name, bit FROM ats_flags"))
+            rows = conn.execute(
+                "SELECT doc_id, key, deleted, buzzword_score, quality_score, tone, ats_mask FROM docs ORDER BY doc_id"
+            )
+            for doc_id, key, deleted, buzzword, quality, tone, ats in rows:
+                columns.set(doc_id, key, not deleted, buzzword or 0, quality or 0, tone or "", ats or 0)
+            self._columns = columns
+        return self._columns
+
+    def _ats_mask(self, conn: sqlite3.Connection, ats: Dict) -> int:
+        mask = 0
+        for name, value in (ats or {}).items():
+            if not isinstance(value, bool):
+                continue  # e.g. pass_score
+            if name not in self._flag_bits:
+                if len(self._flag_bits) >= MAX_ATS_FLAGS:
+                    raise ValueError(f"Too many distinct ATS flags to index (max {MAX_ATS_FLAGS})")
+                self._flag_bits[name] = len(self._flag_bits)
+                conn.execute("INSERT INTO ats_flags (bit, name) VALUES (?, ?)", (self._flag_bits[name], name))
+            if value:
+                mask |= 1 << self._flag_bits[name]
+        return mask
+
+    # ------------------------
+    # Writes
+    # ------------------------
+
+    def add_many(self, bundles: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        Indexes bundles in one write generation. Re-adding a key replaces the old document.
+
+        Parameters:
+            bundles (Iterable[tuple]): (key, bundle) pairs; bundles as built by create_export_bundle()
+
+        Returns:
+            int: Number of documents indexed
+        """
+        with self._lock:
+            conn = self._connection()
+            columns = self._load_columns()
+            postings: Dict[str, List[Tuple[int, List[int]]]] = {}
+            added = 0
+            with conn:
+                next_id = conn.execute("SELECT COALESCE(MAX(doc_id), -1) + 1 FROM docs").fetchone()[0]
+                generation = conn.execute("SELECT COALESCE(MAX(generation), -1) + 1 FROM postings").fetchone()[0]
+                for key, bundle in bundles:
+                    self._delete_locked(conn, key)
+                    doc_id = next_id
+                    next_id += 1
+
+                    positions: Dict[str, List[int]] = {}
+                    # Same tokens as phrase_matcher.tokenize(), without building Token tuples
+                    for position, token in enumerate(WORD_PATTERN.findall(bundle.get("input", "").lower())):
+                        positions.setdefault(token, []).append(position)
+                    for term, term_positions in positions.items():
+                        postings.setdefault(term, []).append((doc_id, term_positions))
+
+                    tone = dominant_tone(bundle.get("tone"))
+                    ats = self._ats_mask(conn, bundle.get("ats"))
+                    buzzword = float(bundle.get("buzzword_score") or 0)
+                    quality = float(bundle.get("quality_score") or 0)
+                    conn.execute(
+                        "INSERT INTO docs (doc_id, key, buzzword_score, quality_score, tone, ats_mask, bundle)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (doc_id, key, buzzword, quality, tone, ats,
+                         zlib.compress(json.dumps(bundle, ensure_ascii=False).encode("utf-8"))),
+                    )
+                    columns.set(doc_id, key, True, buzzword, quality, tone, ats)
+                    added += 1
+
+                conn.executemany(
+                    "INSERT INTO postings (term, generation, docs, counts, positions) VALUES (?, ?, ?, ?, ?)",
+                    ((term, generation) + _encode_postings(entries) for term, entries in postings.items()),
+                )
+            return added
+
+    def add(self, bundle: Dict, key: Optional[str] = None) -> str:
+        """
+        Indexes one bundle.
+
+        Parameters:
+            bundle (dict): Output of create_export_bundle()
+            key (str, optional): Document key; defaults to a hash of the input text
+
+        Returns:
+            str: The document key
+        """
+        key = key or bundle_key(bundle)
+        self.add_many([(key, bundle)])
+        return key
+
+    def delete(self, key: str) -> bool:
+        """
+        Removes a document from search results; its postings are dropped by optimize().
+
+        Parameters:
+            key (str): Document key
+
+        Returns:
+            bool: False if no live document had this key
+        """
+        with self._lock:
+            conn = self._connection()
+            self._load_columns()
+            with conn:
+                return self._delete_locked(conn, key)
+
+    def _delete_locked(self, conn: sqlite3.Connection, key: str) -> bool:
+        doc_ids = [row[0] for row in conn.execute("SELECT doc_id FROM docs WHERE key = ? AND deleted = 0", (key,))]
+        for doc_id in doc_ids:
+            conn.execute("UPDATE docs SET deleted = 1, bundle = NULL WHERE doc_id = ?", (doc_id,))
+            self._columns.live[doc_id] = False
+        return bool(doc_ids)
+
+    @property
+    def generations(self) -> int:
+        """Write generations since the last optimize(); query cost grows with this."""
+        with self._lock:
+            return self._connection().execute("SELECT COALESCE(MAX(generation), -1) + 1 FROM postings").fetchone()[0]
+
+    def optimize(self, vacuum: bool = False):
+        """
+        Merges every term's postings into one generation and drops deleted documents.
+        Rewrites the whole postings table, so run it from a maintenance step, not per add.
+
+        Parameters:
+            vacuum (bool): Also VACUUM the file to return the freed pages to the filesystem
+        """
+        with self._lock:
+            conn = self._connection()
+            live = self._load_columns().live
+            terms = [row[0] for row in conn.execute("SELECT DISTINCT term FROM postings")]
+            with conn:
+                for term in terms:
+                    merged = self._read_postings(term, with_positions=True, live_only=False)
+                    conn.execute("DELETE FROM postings WHERE term = ?", (term,))
+                    keep = live[merged.doc_ids]
+                    if not keep.any():
+                        continue
+                    doc_positions = np.split(merged.positions, np.cumsum(merged.counts)[:-1])
+                    entries = [
+                        (int(doc_id), positions.tolist())
+                        for doc_id, positions, kept in zip(merged.doc_ids, doc_positions, keep) if kept
+                    ]
+                    conn.execute(
+                        "INSERT INTO postings (term, generation, docs, counts, positions) VALUES (?, 0, ?, ?, ?)",
+                        (term,) + _encode_postings(entries),
+                    )
+            if vacuum:
+                conn.execute("VACUUM")
+
+    # ------------------------
+    # Reads
+    # ------------------------
+
+    def _read_postings(self, term: str, with_positions: bool = False, live_only: bool = True) -> _Postings:
+        columns = ("docs, counts, positions" if with_positions else "docs, counts")
+        rows = self._connection().execute(
+            f"SELECT {columns} FROM postings WHERE term = ? ORDER BY generation", (term,)
+        ).fetchall()
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return _Postings(empty, empty, empty if with_positions else None)
+
+        doc_ids = np.concatenate([np.cumsum(_unpack(row[0])) for row in rows])
+        counts = np.concatenate([_unpack(row[1]) for row in rows])
+        positions = (
+            np.concatenate([_decode_positions(row[2], _unpack(row[1])) for row in rows]) if with_positions else None
+        )
+        if live_only:
+            keep = self._columns.live[doc_ids]
+            if not keep.all():
+                if positions is not None:
+                    positions = positions[np.repeat(keep, counts)]
+                doc_ids, counts = doc_ids[keep], counts[keep]
+        return _Postings(doc_ids, counts, positions)
+
+    def _match_phrase(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Doc ids containing the tokens consecutively, and the phrase count per doc."""
+        if len(tokens) == 1:
+            postings = self._read_postings(tokens[0])
+            return postings.doc_ids, postings.counts
+
+        # A phrase occurrence at position p puts token i at p + i: intersect (doc, position - i)
+        starts = None
+        for offset, token in enumerate(tokens):
+            postings = self._read_postings(token, with_positions=True)
+            valid = postings.positions >= offset
+            keys = (np.repeat(postings.doc_ids, postings.counts)[valid] << 32) | (postings.positions[valid] - offset)
+            starts = keys if starts is None else np.intersect1d(starts, keys, assume_unique=True)
+            if not len(starts):
+                break
+        doc_ids, counts = np.unique(starts >> 32, return_counts=True)
+        return doc_ids, counts
+
+    def search(
+        self,
+        query: str = "",
+        min_buzzword: Optional[float] = None,
+        max_buzzword: Optional[float] = None,
+        min_quality: Optional[float] = None,
+        max_quality: Optional[float] = None,
+        tone: Optional[str] = None,
+        ats: Optional[Dict[str, bool]] = None,
+        limit: int = 50,
+    ) -> SearchResults:
+        """
+        Finds bundles matching a keyword/phrase query and score filters.
+
+        Parameters:
+            query (str): Words and "quoted phrases"; OR between alternatives, NOT/- to exclude.
+                         Empty matches every document.
+            min_buzzword, max_buzzword (float, optional): Buzzword score range
+            min_quality, max_quality (float, optional): Quality score range
+            tone (str, optional): Required dominant tone category
+            ats (dict, optional): ATS flag -> required value, e.g. {"has_contact_info": True}
+            limit (int): Maximum hits to return
+
+        Returns:
+            SearchResults: Hits ranked by query term occurrences then quality, the total
+                           match count and the time taken
+        """
+        start = time.perf_counter()
+        with self._lock:
+            columns = self._load_columns()
+            size = columns.size
+            clauses = _parse_query(query)
+            matched = np.zeros(size, dtype=bool) if clauses else np.ones(size, dtype=bool)
+            scores = np.zeros(size, dtype=np.float32)
+
+            for clause in clauses:
+                clause_docs = None
+                for negated, tokens in clause:
+                    doc_ids, counts = self._match_phrase(tokens)
+                    if negated:
+                        continue
+                    scores[doc_ids] += counts
+                    docs = np.zeros(size, dtype=bool)
+                    docs[doc_ids] = True
+                    clause_docs = docs if clause_docs is None else clause_docs & docs
+                if clause_docs is None:
+                    clause_docs = np.ones(size, dtype=bool)
+                for negated, tokens in clause:
+                    if negated:
+                        clause_docs[self._match_phrase(tokens)[0]] = False
+                matched |= clause_docs
+
+            matched &= columns.live[:size]
+            if min_buzzword is not None:
+                matched &= columns.buzzword[:size] >= min_buzzword
+            if max_buzzword is not None:
+                matched &= columns.buzzword[:size] <= max_buzzword
+            if min_quality is not None:
+                matched &= columns.quality[:size] >= min_quality
+            if max_quality is not None:
+                matched &= columns.quality[:size] <= max_quality
+            if tone is not None:
+                matched &= columns.tone[:size] == columns.tone_ids.get(tone, -1)
+            for flag, required in (ats or {}).items():
+                bit = self._flag_bits.get(flag)
+                has_flag = (columns.ats[:size] >> bit) & 1 == 1 if bit is not None else np.zeros(size, dtype=bool)
+                matched &= has_flag if required else ~has_flag
+
+            doc_ids = np.flatnonzero(matched)
+            order = np.lexsort((-columns.quality[doc_ids], -scores[doc_ids]))[:limit]
+            flag_names = sorted(self._flag_bits, key=self._flag_bits.get)
+            hits = [
+                SearchHit(
+                    key=columns.keys[doc_id],
+                    score=float(scores[doc_id]),
+                    buzzword_score=float(columns.buzzword[doc_id]),
+                    quality_score=float(columns.quality[doc_id]),
+                    tone=columns.tone_names[columns.tone[doc_id]],
+                    ats_flags=[name for bit, name in enumerate(flag_names) if columns.ats[doc_id] >> bit & 1],
+                )
+                for doc_id in doc_ids[order]
+            ]
+        return SearchResults(hits, len(doc_ids), time.perf_counter() - start)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Returns the stored bundle for a key.
+
+        Parameters:
+            key (str): Document key
+
+        Returns:
+            dict or None: The bundle, if the key is indexed
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT bundle FROM docs WHERE key = ? AND deleted = 0", (key,)
+            ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._load_columns().live.sum())
+
+
+def _parse_query(query: str) -> List[List[Tuple[bool, List[str]]]]:
+    """Splits a query into OR'ed clauses of (negated, tokens) terms and phrases."""
+    clauses = [[]]
+    negate_next = False
+    for phrase, word in _QUERY_TOKEN.findall(query):
+        if word in ("AND", "OR", "NOT"):
+            if word == "OR" and clauses[-1]:
+                clauses.append([])
+            negate_next = word == "NOT"
+            continue
+        negated = negate_next
+        negate_next = False
+        if word.startswith("-") and len(word) > 1:
+            negated, word = True, word[1:]
+        tokens = [token.text.lower() for token in tokenize(phrase or word)]
+        if tokens:
+            clauses[-1].append((negated, tokens))
+    return [clause for clause in clauses if clause]
+
+
+_default_index: Optional[BundleIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_bundle_index() -> Optional[BundleIndex]:
+    """
+    Returns the process-wide index stored under data_dir(), or None when persistence is disabled.
+
+    Returns:
+        BundleIndex or None: Shared index instance
+    """
+    global _default_index
+    with _default_index_lock:
+        directory = data_dir()
+        if _default_index is None and directory:
+            _default_index = BundleIndex(os.path.join(directory, "bundle_index.sqlite"))
+        return _default_index
@@ -0,0 +1,232 @@
+"""
+Buzzword Dictionary for Resume Decoder
+
+Compiles utils/buzzwords.json (or any buzzword -> meaning JSON file) into an immutable,
+versioned BuzzwordDictionary: keys normalized to lowercase single-spaced phrases, the
+phrase automaton prebuilt, and a content-hash version string for cache keys.
+
+Compiled dictionaries are pickled under data_dir()/dictionaries, keyed by a hash of the
+source file, so later processes load the automaton instead of rebuilding it. A compiled
+artifact can also be shipped and loaded directly (see `python -m resume_decoder
+dictionary compile`); only load artifacts you built, since they are pickles.
+
+load_dictionary() checks the source file's modification time on every call, so
+running processes pick up edits without a restart. Session-specific buzzwords go in
+an overlay (BuzzwordDictionary.with_overlay) that shares the base entries and
+automaton instead of copying or mutating them.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from utils.job_corpus import data_dir
+from utils.phrase_matcher import LayeredMatcher, PhraseMatcher
+
+DEFAULT_DICTIONARY_FILE = os.path.join(os.path.dirname(__file__), "buzzwords.json")
+DICTIONARY_FORMAT_VERSION = 1
+ARTIFACT_EXTENSION = ".pkl"
+OVERLAY_CACHE_SIZE = 64
+
+
+def normalize_phrase(phrase: str) -> str:
+    """
+    Normalizes a buzzword key: lowercase, surrounding whitespace stripped, inner
+    whitespace collapsed to single spaces.
+
+    Parameters:
+        phrase (str): Raw buzzword
+
+    Returns:
+        str: Normalized key
+    """
+    return " ".join(phrase.lower().split())
+
+
+def _version(entries: Mapping[str, str]) -> str:
+    payload = json.dumps(sorted(entries.items()), ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class BuzzwordDictionary(Mapping[str, str]):
+    """
+    Read-only mapping of normalized buzzwords to meanings, with its compiled matcher
+    and a version that changes whenever any entry changes.
+    """
+
+    def __init__(self, entries: Mapping[str, str], matcher=None, version: Optional[str] = None):
+        self._entries = entries
+        self.version = version or _version(entries)
+        self.matcher = matcher if matcher is not None else PhraseMatcher(sorted(entries))
+        self._overlays: "OrderedDict[Tuple[Tuple[str, str], ...], BuzzwordDictionary]" = OrderedDict()
+        self._overlay_lock = threading.Lock()
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, str]) -> "BuzzwordDictionary":
+        """
+        Normalizes and compiles a plain buzzword mapping.
+
+        Parameters:
+            mapping (dict): Buzzword -> meaning
+
+        Returns:
+            BuzzwordDictionary: Compiled dictionary
+        """
+        entries = {}
+        for phrase, meaning in mapping.items():
+            key = normalize_phrase(phrase)
+            if key:
+                entries[key] = str(meaning)
+        return cls(entries)
+
+    def __getitem__(self, key: str) -> str:
+        return self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return f"BuzzwordDictionary({len(self)} entries, version={self.version!r})"
+
+    def __getstate__(self) -> Dict:
+        return {"entries": dict(self._entries), "matcher": self.matcher, "version": self.version}
+
+    def __setstate__(self, state: Dict):
+        self.__init__(state["entries"], state["matcher"], state["version"])
+
+    def with_overlay(self, custom: Mapping[str, str]) -> "BuzzwordDictionary":
+        """
+        Returns this dictionary with extra or overriding entries, leaving it unchanged.
+        The overlay shares the base entries and automaton; only the custom phrases are
+        compiled, and the same custom entries return the same overlay object.
+
+        Parameters:
+            custom (dict): Buzzword -> meaning entries for one session
+
+        Returns:
+            BuzzwordDictionary: This dictionary if custom is empty, else an overlay
+        """
+        extra = {}
+        for phrase, meaning in custom.items():
+            key = normalize_phrase(phrase)
+            if key and meaning:
+                extra[key] = str(meaning)
+        if not extra:
+            return self
+
+        cache_key = tuple(sorted(extra.items()))
+        with self._overlay_lock:
+            overlay = self._overlays.get(cache_key)
+            if overlay is not None:
+                self._overlays.move_to_end(cache_key)
+                return overlay
+
+        overlay = BuzzwordDictionary(
+            ChainMap(extra, self._entries),
+            LayeredMatcher(PhraseMatcher(sorted(extra)), self.matcher),
+            f"{self.version}+{_version(extra)}",
+        )
+        with self._overlay_lock:
+            overlay = self._overlays.setdefault(cache_key, overlay)
+            while len(self._overlays) > OVERLAY_CACHE_SIZE:
+                self._overlays.popitem(last=False)
+        return overlay
+
+
+def save_dictionary(dictionary: BuzzwordDictionary, path: str):
+    """
+    Writes a compiled dictionary artifact atomically.
+
+    Parameters:
+        dictionary (BuzzwordDictionary): Dictionary to save
+        path (str): Output file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        pickle.dump((DICTIONARY_FORMAT_VERSION, dictionary), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+
+
+def _read_artifact(path: str) -> Optional[BuzzwordDictionary]:
+    try:
+        with open(path, "rb") as f:
+            format_version, dictionary = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, pickle.UnpicklingError):
+        return None
+    return dictionary if format_version == DICTIONARY_FORMAT_VERSION else None
+
+
+def compile_dictionary(source: str, artifact_dir: Optional[str] = None) -> BuzzwordDictionary:
+    """
+    Compiles a buzzword JSON file, reusing a cached artifact for identical contents.
+
+    Parameters:
+        source (str): Buzzword JSON file
+        artifact_dir (str, optional): Artifact cache; defaults to data_dir()/dictionaries,
+                                      and nothing is cached when persistence is disabled
+
+    Returns:
+        BuzzwordDictionary: Compiled dictionary
+    """
+    with open(source, "rb") as f:
+        raw = f.read()
+
+    if artifact_dir is None:
+        directory = data_dir()
+        artifact_dir = os.path.join(directory, "dictionaries") if directory else ""
+    artifact = ""
+    if artifact_dir:
+        name = os.path.splitext(os.path.basename(source))[0]
+        digest = hashlib.sha1(raw).hexdigest()[:16]
+        artifact = os.path.join(artifact_dir, f"{name}-{digest}-v{DICTIONARY_FORMAT_VERSION}{ARTIFACT_EXTENSION}")
+        dictionary = _read_artifact(artifact)
+        if dictionary is not None:
+            return dictionary
+
+    dictionary = BuzzwordDictionary.from_mapping(json.loads(raw.decode("utf-8")))
+    if artifact:
+        try:
+            save_dictionary(dictionary, artifact)
+        except OSError:
+            pass  # a read-only data directory only costs the next process a recompile
+    return dictionary
+
+
+@lru_cache(maxsize=16)
+def _load_dictionary(path: str, mtime: float, size: int) -> BuzzwordDictionary:
+    if path.endswith(ARTIFACT_EXTENSION):
+        dictionary = _read_artifact(path)
+        if dictionary is None:
+            raise ValueError(f"{path} is not a compiled buzzword dictionary (format {DICTIONARY_FORMAT_VERSION}).")
+        return dictionary
+    return compile_dictionary(path)
+
+
+def load_dictionary(path: str = DEFAULT_DICTIONARY_FILE) -> BuzzwordDictionary:
+    """
+    Loads a buzzword JSON file or compiled artifact, reusing the loaded dictionary
+    until the file changes.
+
+    Parameters:
+        path (str): Buzzword JSON file or compiled .pkl artifact
+
+    Returns:
+        BuzzwordDictionary: Compiled dictionary
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _load_dictionary(path, stat.st_mtime, stat.st_size)
+
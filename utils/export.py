@@ -1,9 +1,12 @@
-from docx import Document
 from io import BytesIO
 
+from utils.lazy_import import lazy_import
+
+docx = lazy_import("docx")  # python-docx, loaded on first export
+
 def export_to_docx(title: str, sections: dict):
     """Generate a DOCX file from a dictionary of resume sections."""
-    doc = Document()
+    doc = docx.Document()
     doc.add_heading(title, 0)
 
     for section, content in sections.items():
@@ -1,24 +1,513 @@
-import fitz  # PyMuPDF
-import docx
-
-def load_text_from_file(uploaded_file):
-    file_type = uploaded_file.type
-
-    if file_type == "application/pdf":
-        try:
-            with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-                return "\n".join([page.get_text() for page in doc])
-        except Exception:
-            return "Error reading PDF."
-
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        try:
-            doc = docx.Document(uploaded_file)
-            return "\n".join([para.text for para in doc.paragraphs])
-        except Exception:
-            return "Error reading DOCX."
-
-    elif file_type == "text/plain":
-        return uploaded_file.read().decode("utf-8")
-
-    return "Unsupported file format."
+"""
+File Loader for Resume Decoder
+
+Detects an upload's real format from its leading bytes and dispatches to a format-specific
+extractor from a registry. The browser-supplied MIME type and the file extension are only
+used as hints when the content itself is ambiguous (Markdown vs. plain text). Supported
+formats: PDF, DOCX, ODT, RTF, HTML, Markdown and plain text.
+
+Extractors stream text chunks (one per PDF page or paragraph) so callers can stop early.
+extract_document() returns an ExtractionResult with the text, page offsets, warnings and
+timing; failures are reported in its `error` field instead of as text, so an error message
+is never scored as resume content.
+"""
+
+import os
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from utils.lazy_import import lazy_import
+
+from utils.parallel_pdf import iter_pdf_pages
+from utils.text_cache import CachedText, TextCache, content_key, get_text_cache
+from utils.tracing import record_span
+
+docx = lazy_import("docx")  # python-docx, loaded on first DOCX
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+ODT_TYPE = "application/vnd.oasis.opendocument.text"
+RTF_TYPE = "application/rtf"
+HTML_TYPE = "text/html"
+MARKDOWN_TYPE = "text/markdown"
+TEXT_TYPE = "text/plain"
+
+# File extension -> MIME type, for picking files from a directory and as a detection hint
+EXTENSION_TYPES = {
+    ".pdf": PDF_TYPE,
+    ".docx": DOCX_TYPE,
+    ".odt": ODT_TYPE,
+    ".rtf": RTF_TYPE,
+    ".html": HTML_TYPE,
+    ".htm": HTML_TYPE,
+    ".md": MARKDOWN_TYPE,
+    ".markdown": MARKDOWN_TYPE,
+    ".txt": TEXT_TYPE,
+}
+
+# Extensions accepted by the Streamlit file uploaders
+UPLOAD_EXTENSIONS = sorted(ext.lstrip(".") for ext in EXTENSION_TYPES)
+
+# Limits for interactive uploads, so an oversized portfolio doesn't block a Streamlit worker
+UPLOAD_MAX_PAGES = 100
+UPLOAD_MAX_CHARS = 300_000
+
+SNIFF_BYTES = 2048
+
+Source = Union[bytes, str]  # raw file bytes, or a path on disk
+
+
+class UnsupportedFileType(ValueError):
+    pass
+
+
+@dataclass
+class ExtractionResult:
+    text: str = ""
+    file_type: str = ""
+    page_offsets: List[int] = field(default_factory=list)  # character offset where each page/paragraph starts
+    warnings: List[str] = field(default_factory=list)
+    elapsed: float = 0.0  # seconds spent detecting and extracting
+    cached: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def pages(self) -> List[str]:
+        """Text of each page (PDF) or paragraph (other formats)."""
+        bounds = self.page_offsets + [len(self.text) + 1]
+        return [self.text[start:end - 1] for start, end in zip(bounds, bounds[1:])]
+
+
+# ------------------------
+# Format detection
+# ------------------------
+
+def _read_head(source: Source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(SNIFF_BYTES)
+    return source[:SNIFF_BYTES]
+
+
+def _sniff_zip(source: Source) -> str:
+    try:
+        with zipfile.ZipFile(source if isinstance(source, str) else BytesIO(source)) as archive:
+            names = set(archive.namelist())
+            if "word/document.xml" in names:
+                return DOCX_TYPE
+            if "mimetype" in names and archive.read("mimetype").strip() == ODT_TYPE.encode():
+                return ODT_TYPE
+    except zipfile.BadZipFile:
+        pass
+    return ""
+
+
+def detect_file_type(source: Source, filename: str = "", declared_type: str = "") -> str:
+    """
+    Identifies a document's format from its content, reading only the leading bytes
+    (plus the zip directory for DOCX/ODT).
+
+    Parameters:
+        source (bytes or str): Raw file bytes, or a path on disk
+        filename (str): Original file name; only a hint for text-based formats
+        declared_type (str): Browser-supplied MIME type; only a hint for text-based formats
+
+    Returns:
+        str: One of this module's *_TYPE constants, or "" if the format is not supported
+    """
+    head = _read_head(source)
+    if head.startswith(b"%PDF-"):
+        return PDF_TYPE
+    if head.startswith(b"PK\x03\x04"):
+        return _sniff_zip(source)
+
+    stripped = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if stripped.startswith(b"{\\rtf"):
+        return RTF_TYPE
+    lowered = stripped[:1024].lower()
+    if lowered.startswith((b"<!doctype html", b"<html")) or b"<body" in lowered:
+        return HTML_TYPE
+
+    # Everything else has to at least look like text
+    if b"\x00" in head:
+        return ""
+    if not filename and isinstance(source, str):
+        filename = source
+    hinted = EXTENSION_TYPES.get(os.path.splitext(filename)[1].lower(), "")
+    for file_type in (MARKDOWN_TYPE, HTML_TYPE):
+        if file_type in (hinted, declared_type):
+            return file_type
+    return TEXT_TYPE
+
+
+# ------------------------
+# Extractor registry
+# ------------------------
+
+# An extractor takes (source, max_pages, warnings), yields text chunks in document order
+# and may append non-fatal warning messages
+Extractor = Callable[[Source, Optional[int], List[str]], Iterator[str]]
+LOADERS: Dict[str, Extractor] = {}
+
+
+def register_loader(file_type: str) -> Callable[[Extractor], Extractor]:
+    """
+    Decorator that registers an extractor for a MIME type, replacing any existing one.
+
+    Parameters:
+        file_type (str): MIME type returned by detect_file_type()
+
+    Returns:
+        Callable: Decorator returning the extractor unchanged
+    """
+    def decorator(func: Extractor) -> Extractor:
+        LOADERS[file_type] = func
+        return func
+    return decorator
+
+
+def _read_bytes(source: Source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return source
+
+
+def _decode_text(data: bytes, warnings: List[str]) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        warnings.append("File is not valid UTF-8; decoded as Windows-1252.")
+        return data.decode("cp1252", errors="replace")
+
+
+@register_loader(PDF_TYPE)
+def _load_pdf(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    # Long PDFs are split across worker processes; short ones stay in-process
+    yield from iter_pdf_pages(source, max_pages, warnings)
+
+
+@register_loader(DOCX_TYPE)
+def _load_docx(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    doc = docx.Document(source if isinstance(source, str) else BytesIO(source))
+    for para in doc.paragraphs:
+        yield para.text
+
+
+_ODT_TEXT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_ODT_BLOCKS = (_ODT_TEXT_NS + "p", _ODT_TEXT_NS + "h")
+
+
+def _odt_element_text(elem: ET.Element) -> str:
+    parts = [elem.text or ""]
+    for child in elem:
+        if child.tag == _ODT_TEXT_NS + "s":
+            parts.append(" " * int(child.get(_ODT_TEXT_NS + "c", "1")))
+        elif child.tag == _ODT_TEXT_NS + "tab":
+            parts.append("\t")
+        elif child.tag == _ODT_TEXT_NS + "line-break":
+            parts.append("\n")
+        elif child.tag not in _ODT_BLOCKS:
+            parts.append(_odt_element_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+@register_loader(ODT_TYPE)
+def _load_odt(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    with zipfile.ZipFile(source if isinstance(source, str) else BytesIO(source)) as archive:
+        with archive.open("content.xml") as content:
+            # iterparse keeps memory flat for long documents; paragraphs are yielded as they close
+            for _, elem in ET.iterparse(content, events=("end",)):
+                if elem.tag in _ODT_BLOCKS:
+                    yield _odt_element_text(elem)
+                    elem.clear()
+
+
+_RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|([^\\{}\r\n]+)|[\r\n]+")
+# Groups whose content is metadata rather than document text
+_RTF_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "themedata", "colorschememapping", "datastore", "latentstyles",
+    "header", "headerl", "headerr", "headerf", "footer", "footerl", "footerr", "footerf", "footnote",
+}
+_RTF_SPECIAL = {
+    "par": "\n", "line": "\n", "row": "\n", "sect": "\n\n", "page": "\n\n", "tab": "\t", "cell": " ",
+    "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d",
+}
+
+
+def _rtf_to_text(rtf: str) -> str:
+    """Strips RTF control words and metadata groups, keeping the document text."""
+    out = []
+    stack = []
+    ignorable = False
+    uc_skip = 1  # fallback characters that follow each \uN escape
+    skip = 0
+
+    for word, arg, hexcode, symbol, brace, text in _RTF_TOKEN.findall(rtf):
+        if brace:
+            skip = 0
+            if brace == "{":
+                stack.append((uc_skip, ignorable))
+            elif stack:
+                uc_skip, ignorable = stack.pop()
+        elif symbol:
+            skip = 0
+            if symbol == "*":
+                ignorable = True
+            elif ignorable:
+                continue
+            elif symbol in "\\{}":
+                out.append(symbol)
+            elif symbol == "~":
+                out.append("\xa0")
+            elif symbol in "\r\n":
+                out.append("\n")
+        elif word:
+            skip = 0
+            if word in _RTF_DESTINATIONS:
+                ignorable = True
+            elif word == "uc":
+                uc_skip = int(arg or 1)
+            elif ignorable:
+                continue
+            elif word in _RTF_SPECIAL:
+                out.append(_RTF_SPECIAL[word])
+            elif word == "u":
+                code = int(arg or 0)
+                out.append(chr(code + 0x10000 if code < 0 else code))
+                skip = uc_skip
+        elif hexcode:
+            if skip:
+                skip -= 1
+            elif not ignorable:
+                out.append(bytes([int(hexcode, 16)]).decode("cp1252", errors="replace"))
+        elif text:
+            if skip:
+                consumed = min(skip, len(text))
+                text = text[consumed:]
+                skip -= consumed
+            if text and not ignorable:
+                out.append(text)
+    return "".join(out)
+
+
+@register_loader(RTF_TYPE)
+def _load_rtf(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    # RTF is 7-bit; non-ASCII text arrives as \'hh or \uN escapes
+    yield from _rtf_to_text(_read_bytes(source).decode("latin-1")).splitlines()
+
+
+class _HTMLTextExtractor(HTMLParser):
+    BLOCK_TAGS = {
+        "p", "div", "br", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6",
+        "section", "article", "header", "footer", "ul", "ol", "table", "blockquote", "pre", "hr",
+    }
+    SKIP_TAGS = {"script", "style", "head", "noscript", "template"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+@register_loader(HTML_TYPE)
+def _load_html(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    parser = _HTMLTextExtractor()
+    parser.feed(_decode_text(_read_bytes(source), warnings))
+    parser.close()
+    for line in "".join(parser.parts).splitlines():
+        line = " ".join(line.split())
+        if line:
+            yield line
+
+
+_MARKDOWN_CLEANUP = [
+    (re.compile(r"^\s{0,3}(?:#{1,6}|>)\s*"), ""),   # heading and blockquote markers
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),  # links and images keep their text
+    (re.compile(r"\*\*|__|`"), ""),                  # bold and code markers
+]
+
+
+@register_loader(MARKDOWN_TYPE)
+def _load_markdown(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    for line in _decode_text(_read_bytes(source), warnings).splitlines():
+        for pattern, replacement in _MARKDOWN_CLEANUP:
+            line = pattern.sub(replacement, line)
+        yield line
+
+
+@register_loader(TEXT_TYPE)
+def _load_text(source: Source, max_pages: Optional[int], warnings: List[str]) -> Iterator[str]:
+    yield from _decode_text(_read_bytes(source), warnings).splitlines()
+
+
+# ------------------------
+# Public API
+# ------------------------
+
+def iter_document_chunks(
+    source: Source,
+    file_type: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    warnings: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """
+    Streams a document as text chunks: one per PDF page, otherwise one per paragraph or line.
+    Joining the chunks with newlines gives the full extracted text. Nothing past the
+    limits is parsed, and a consumer can stop iterating early to skip the rest.
+
+    Parameters:
+        source (bytes or str): Raw file bytes, or a path to read from disk
+        file_type (str, optional): MIME type; detected from the content when omitted
+        max_pages (int, optional): Stop after this many PDF pages
+        max_chars (int, optional): Stop once this many characters have been yielded
+        warnings (list, optional): Collects non-fatal extraction warnings, including a note
+                                   when a limit cuts the document short
+
+    Returns:
+        Iterator[str]: Text chunks in document order
+    """
+    if file_type is None:
+        file_type = detect_file_type(source)
+    loader = LOADERS.get(file_type)
+    if loader is None:
+        raise UnsupportedFileType(f"Unsupported file type: {file_type!r}")
+
+    warnings = warnings if warnings is not None else []
+    remaining = max_chars
+    for chunk in loader(source, max_pages, warnings):
+        if remaining is not None:
+            if remaining <= 0 or len(chunk) > remaining:
+                # Warn before the last yield, in case the consumer stops after it
+                warnings.append(f"Only the first {max_chars:,} characters were analyzed.")
+                if remaining > 0:
+                    yield chunk[:remaining]
+                return
+            remaining -= len(chunk) + 1
+        yield chunk
+
+
+def extract_document(
+    data: bytes,
+    filename: str = "",
+    declared_type: str = "",
+    cache: Optional[TextCache] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> ExtractionResult:
+    """
+    Detects the format and extracts text and page offsets, serving repeat uploads from
+    the content-hash cache. Never raises on bad input; check `result.ok` instead.
+
+    Parameters:
+        data (bytes): Raw upload bytes
+        filename (str): Original file name (a detection hint only)
+        declared_type (str): Browser-supplied MIME type (a detection hint only)
+        cache (TextCache, optional): Cache to use; defaults to the process-wide cache
+        max_pages (int, optional): Stop after this many PDF pages
+        max_chars (int, optional): Stop after this many characters
+
+    Returns:
+        ExtractionResult: Text, page offsets, detected type, warnings, timing and any error
+    """
+    start = time.perf_counter()
+    file_type = detect_file_type(data, filename, declared_type)
+    result = ExtractionResult(file_type=file_type)
+
+    if file_type not in LOADERS:
+        result.error = "Unsupported file format."
+    else:
+        cache = cache or get_text_cache()
+        key = content_key(data, f"{file_type};pages={max_pages};chars={max_chars}")
+        cached = cache.get(key)
+        if cached is not None:
+            result.text, result.page_offsets, result.cached = cached.text, list(cached.page_offsets), True
+            result.warnings = list(cached.warnings)
+        else:
+            _extract_into(result, data, max_pages, max_chars)
+            if result.ok:
+                cache.put(key, CachedText(result.text, result.page_offsets, result.warnings))
+
+    result.elapsed = time.perf_counter() - start
+    record_span("extract", result.elapsed * 1000, file_type=file_type, bytes=len(data), cached=result.cached)
+    return result
+
+
+def _extract_into(result: ExtractionResult, data: bytes, max_pages: Optional[int], max_chars: Optional[int]):
+    chunks = []
+    position = 0
+    try:
+        for chunk in iter_document_chunks(data, result.file_type, max_pages, max_chars, result.warnings):
+            chunks.append(chunk)
+            result.page_offsets.append(position)
+            position += len(chunk) + 1
+    except Exception as e:
+        result.page_offsets = []
+        result.error = f"Could not read this file: {e}"
+        return
+    result.text = "\n".join(chunks)
+
+
+def read_upload(uploaded_file) -> bytes:
+    """Returns the full upload bytes, even if the file object was already read on an earlier rerun."""
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    return uploaded_file.read()
+
+
+def load_file(uploaded_file) -> ExtractionResult:
+    """
+    Extracts a Streamlit upload within the interactive upload limits.
+
+    Parameters:
+        uploaded_file: Streamlit UploadedFile, or any file object with read()
+
+    Returns:
+        ExtractionResult: See extract_document()
+    """
+    return extract_document(
+        read_upload(uploaded_file),
+        filename=getattr(uploaded_file, "name", ""),
+        declared_type=getattr(uploaded_file, "type", ""),
+        max_pages=UPLOAD_MAX_PAGES,
+        max_chars=UPLOAD_MAX_CHARS,
+    )
+
+
+def load_text_from_file(uploaded_file) -> str:
+    return load_file(uploaded_file).text
+
+
+def load_text_from_path(path: str) -> str:
+    with open(path, "rb") as f:
+        return extract_document(f.read(), filename=path).text
@@ -0,0 +1,361 @@
+"""
+Job Description Corpus for Resume Decoder
+
+A persistent index of the job descriptions we ingest: a vocabulary (term -> id) and
+a compact array of document frequencies, plus the document count and average length
+that BM25 needs. Adding a job updates the statistics incrementally; nothing is ever
+refit over the whole corpus.
+
+Resume-vs-job matching weights each job term by its BM25 weight, so a missing rare
+skill ("kubernetes") costs far more than a missing common word ("team"), and the
+missing keywords come back most important first.
+
+On disk the corpus is two files in one directory:
+- corpus.idx: a binary snapshot (JSON header + document frequencies as uint32s)
+- corpus.log: an append-only JSONL journal of documents added since the snapshot,
+  starting with a header line that names the journal
+Adding a job appends one line with a single write under an exclusive lock on
+corpus.lock; readers replay the journal under a shared lock and skip (and count) lines
+they cannot decode. compact() folds the journal into a new snapshot and starts a new,
+empty journal; it runs automatically once COMPACT_AFTER_ENTRIES lines were journaled,
+so neither the journal nor a cold start's replay grows past that. Processes that find
+a new journal reload the snapshot first.
+
+The directory defaults to ~/.local/share/resume_decoder and can be moved with the
+RESUME_DECODER_DATA_DIR environment variable (an empty string keeps it in memory).
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import uuid
+from array import array
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, a single process is assumed
+    fcntl = None
+
+from utils.keyword_engine import KeywordExtractor, get_keyword_extractor
+
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "resume_decoder")
+SNAPSHOT_FILE = "corpus.idx"
+LOG_FILE = "corpus.log"
+LOCK_FILE = "corpus.lock"
+SNAPSHOT_MAGIC = b"RDJC"
+SNAPSHOT_VERSION = 2
+COMPACT_AFTER_ENTRIES = 500  # journal lines past the snapshot before add() compacts
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def data_dir() -> Optional[str]:
+    """
+    Returns the directory for persistent indexes, or None when persistence is disabled.
+
+    Returns:
+        str or None: RESUME_DECODER_DATA_DIR, defaulting to ~/.local/share/resume_decoder
+    """
+    path = os.environ.get("RESUME_DECODER_DATA_DIR", DEFAULT_DATA_DIR)
+    return path or None
+
+
+def document_id(text: str) -> str:
+    """Content hash used to ingest each job description only once."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+
+class JobCorpus:
+    """
+    Document-frequency index over job descriptions. Safe to share between Streamlit
+    session threads; other processes' additions are picked up by refresh().
+    """
+
+    def __init__(self, path: Optional[str] = None, extractor: Optional[KeywordExtractor] = None):
+        self.path = path
+        self.extractor = extractor or get_keyword_extractor()
+
+        self._lock = threading.Lock()
+        self._reset()
+        self.skipped_lines = 0  # undecodable journal lines seen on replay
+
+        if path:
+            with self._file_lock(exclusive=False):
+                self._load()
+
+    def _reset(self):
+        self._term_ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._df = array("I")
+        self._doc_ids = set()
+        self._total_length = 0
+        self._journal: Optional[str] = None  # id from corpus.log's header line, None for old journals
+        self._log_offset = 0  # bytes of corpus.log already applied
+        self._journaled = 0  # corpus.log lines past the snapshot
+
+    # ------------------------
+    # Statistics
+    # ------------------------
+
+    @property
+    def doc_count(self) -> int:
+        return len(self._doc_ids)
+
+    @property
+    def avg_length(self) -> float:
+        return self._total_length / self.doc_count if self.doc_count else 0.0
+
+    def __contains__(self, text: str) -> bool:
+        return document_id(text) in self._doc_ids
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        return self._df[term_id] if term_id is not None else 0
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency; unseen terms get the highest weight."""
+        df = self.document_frequency(term)
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    # ------------------------
+    # Ingestion
+    # ------------------------
+
+    def add(self, text: str) -> bool:
+        """
+        Adds a job description to the corpus statistics and journals it to disk.
+
+        Parameters:
+            text (str): Job description text
+
+        Returns:
+            bool: False if this exact text was already in the corpus
+        """
+        doc_id = document_id(text)
+        counts = self.extractor.count_terms(text)
+        entry = {"id": doc_id, "length": sum(counts.values()), "terms": sorted(counts)}
+
+        with self._lock:
+            if not self.path:
+                if doc_id in self._doc_ids:
+                    return False
+                self._apply(entry)
+                return True
+            with self._file_lock(exclusive=True):
+                self._refresh_locked()
+                if doc_id in self._doc_ids:
+                    return False
+                self._apply(entry)
+                # The offset isn't advanced here: lines other processes appended first must
+                # still be replayed, and this one is skipped on replay because its id is known
+                line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+                self._append(line)
+                self._journaled += 1
+            due = self._journaled >= COMPACT_AFTER_ENTRIES
+        if due:
+            self.compact()
+        return True
+
+    def refresh(self):
+        """Applies journal entries written by other processes since the last read."""
+        if not self.path:
+            return
+        with self._lock, self._file_lock(exclusive=False):
+            self._refresh_locked()
+
+    def compact(self):
+        """
+        Writes a snapshot covering everything journaled so far and starts a new, empty
+        journal, so neither the journal nor loads grow with the corpus's history.
+        """
+        if not self.path:
+            return
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh_locked()
+            journal = uuid.uuid4().hex
+            journal_header = (json.dumps({"journal": journal}) + "\n").encode("utf-8")
+            header = json.dumps({
+                "version": SNAPSHOT_VERSION,
+                "total_length": self._total_length,
+                "journal": journal,
+                "log_offset": len(journal_header),
+                "terms": self._terms,
+                "doc_ids": sorted(self._doc_ids),
+            }).encode("utf-8")
+            df = array("I", self._df)
+            if sys.byteorder != "little":
+                df.byteswap()
+            snapshot = os.path.join(self.path, SNAPSHOT_FILE)
+            temp = f"{snapshot}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header)
+                df.tofile(f)
+            os.replace(temp, snapshot)
+            # Snapshot first: a crash between the two replaces leaves the old journal,
+            # whose entries the new snapshot already counts and replay skips by id
+            log_path = os.path.join(self.path, LOG_FILE)
+            temp = f"{log_path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(journal_header)
+            os.replace(temp, log_path)
+            self._journal = journal
+            self._log_offset = len(journal_header)
+            self._journaled = 0
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, LOCK_FILE), "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _append(self, line: bytes):
+        # One write() on an O_APPEND descriptor, so the line lands in one piece
+        fd = os.open(os.path.join(self.path, LOG_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def _apply(self, entry: dict):
+        for term in entry["terms"]:
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._terms)
+                self._terms.append(term)
+                self._df.append(1)
+            else:
+                self._df[term_id] += 1
+        self._doc_ids.add(entry["id"])
+        self._total_length += entry["length"]
+
+    def _load(self):
+        self._reset()
+        snapshot = os.path.join(self.path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot):
+            with open(snapshot, "rb") as f:
+                if f.read(4) != SNAPSHOT_MAGIC:
+                    raise ValueError(f"{snapshot} is not a job corpus snapshot")
+                (header_length,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(header_length))
+                self._df.frombytes(f.read())
+            if sys.byteorder != "little":
+                self._df.byteswap()
+            self._terms = header["terms"]
+            self._term_ids = {term: term_id for term_id, term in enumerate(self._terms)}
+            self._doc_ids = set(header["doc_ids"])
+            self._total_length = header["total_length"]
+            self._journal = header.get("journal")
+            self._log_offset = header["log_offset"]
+        self._refresh_locked(reload=False)
+
+    def _refresh_locked(self, reload: bool = True):
+        log_path = os.path.join(self.path, LOG_FILE) if self.path else None
+        if not log_path or not os.path.exists(log_path):
+            return
+        with open(log_path, "rb") as f:
+            journal = None
+            first = f.readline()
+            if first.startswith(b'{"journal"'):
+                journal = json.loads(first)["journal"]
+            if journal != self._journal:
+                if reload:
+                    # Another process compacted: the snapshot now holds everything we missed
+                    self._load()
+                    return
+                # The snapshot is newer than this journal (compact() stopped between its
+                # two replaces), so replay all of it; entries already counted are skipped
+                self._journal = journal
+                self._log_offset = 0
+            f.seek(max(self._log_offset, len(first) if journal else 0))
+            self._log_offset = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write that hasn't landed yet; pick it up next time
+                self._log_offset += len(line)
+                try:
+                    entry = json.loads(line)
+                    if entry["id"] in self._doc_ids:
+                        continue
+                    self._apply(entry)
+                except (ValueError, KeyError, TypeError):
+                    self.skipped_lines += 1
+                    continue
+                self._journaled += 1
+
+    # ------------------------
+    # Matching
+    # ------------------------
+
+    def term_weights(self, text: str) -> Dict[str, float]:
+        """
+        BM25 weight of each term in a document, using this corpus for IDF and length norms.
+
+        Parameters:
+            text (str): Job description text
+
+        Returns:
+            dict: Term -> weight
+        """
+        counts = self.extractor.count_terms(text)
+        length = sum(counts.values())
+        avg_length = self.avg_length or length or 1
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+        return {
+            term: tf * (BM25_K1 + 1) / (tf + norm) * self.idf(term)
+            for term, tf in counts.items()
+        }
+
+    def match(self, job_text: str, resume_text: str) -> dict:
+        """
+        Scores how well a resume covers a job description, weighting each job term by BM25.
+
+        Parameters:
+            job_text (str): Job description text
+            resume_text (str): Resume text
+
+        Returns:
+            dict: "match_percent" (share of the job's term weight the resume covers),
+                  "matched_keywords" and "missing_keywords" (heaviest first) and "weights"
+        """
+        weights = self.term_weights(job_text)
+        resume_terms = self.extractor.count_terms(resume_text)
+        ranked = sorted(weights, key=lambda term: (-weights[term], term))
+        matched = [term for term in ranked if term in resume_terms]
+        total = sum(weights.values())
+        covered = sum(weights[term] for term in matched)
+
+        return {
+            "match_percent": round(covered / total * 100, 2) if total else 0,
+            "matched_keywords": matched,
+            "missing_keywords": [term for term in ranked if term not in resume_terms],
+            "weights": {term: round(weights[term], 4) for term in ranked},
+        }
+
+
+_default_corpus: Optional[JobCorpus] = None
+_default_corpus_lock = threading.Lock()
+
+
+def get_job_corpus() -> JobCorpus:
+    """
+    Returns the process-wide corpus, stored under data_dir().
+
+    Returns:
+        JobCorpus: Shared corpus instance
+    """
+    global _default_corpus
+    with _default_corpus_lock:
+        if _default_corpus is None:
+            directory = data_dir()
+            _default_corpus = JobCorpus(os.path.join(directory, "job_corpus") if directory else None)
+        return _default_corpus
@@ -0,0 +1,223 @@
+"""
+Many-to-Many Resume x Job Matching
+
+Scores N resumes against M job descriptions in one go. Jobs are vectorized once into
+a sparse matrix of BM25 term weights over a shared vocabulary, each row normalized to
+sum to 1. Resumes are vectorized into sparse 0/1 term-presence rows over the same
+vocabulary. One sparse matrix product then gives every resume's coverage of every
+job's weighted terms, the same score JobCorpus.match() computes for a single pair.
+
+Resumes are processed in blocks, so the full N x M score matrix never has to exist:
+each block's scores update the running top-k jobs per resume and top-k resumes per
+job. Resume texts can be a generator, which keeps memory flat for 100k+ candidates.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.job_corpus import BM25_B, BM25_K1, JobCorpus
+from utils.keyword_engine import KeywordExtractor, get_keyword_extractor
+
+DEFAULT_TOP_K = 10
+DEFAULT_BLOCK_SIZE = 2048  # resumes per block; a block's dense scores are block_size x M float32
+
+
+@dataclass
+class MatchResults:
+    top_jobs: np.ndarray            # N x k job indices per resume, best first
+    top_job_scores: np.ndarray      # N x k match percentages
+    top_resumes: np.ndarray         # M x k resume indices per job, best first (k = N when N < k)
+    top_resume_scores: np.ndarray   # M x k match percentages
+
+    def jobs_for_resume(self, index: int) -> List[Tuple[int, float]]:
+        return [(int(j), float(s)) for j, s in zip(self.top_jobs[index], self.top_job_scores[index])]
+
+    def resumes_for_job(self, index: int) -> List[Tuple[int, float]]:
+        return [(int(r), float(s)) for r, s in zip(self.top_resumes[index], self.top_resume_scores[index])]
+
+
+def _term_count_rows(texts: Iterable[str], vocabulary: Dict[str, int], extractor: KeywordExtractor):
+    """CSR arrays of term counts, adding new terms to the vocabulary."""
+    indptr = [0]
+    indices = []
+    counts = []
+    for text in texts:
+        for term, count in extractor.count_terms(text or "").items():
+            term_id = vocabulary.get(term)
+            if term_id is None:
+                term_id = vocabulary[term] = len(vocabulary)
+            indices.append(term_id)
+            counts.append(count)
+        indptr.append(len(indices))
+    return (
+        np.asarray(indptr, dtype=np.int64),
+        np.asarray(indices, dtype=np.int32),
+        np.asarray(counts, dtype=np.float32),
+    )
+
+
+def _presence_rows(texts: Iterable[str], vocabulary: Dict[str, int], extractor: KeywordExtractor):
+    """CSR arrays of in-vocabulary term presence; unknown terms are dropped."""
+    indptr = [0]
+    indices = []
+    for text in texts:
+        terms = extractor.term_set(text or "")
+        indices.extend(vocabulary[term] for term in terms if term in vocabulary)
+        indptr.append(len(indices))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int32)
+
+
+def vectorize_jobs(
+    jobs: Sequence[str],
+    corpus: Optional[JobCorpus] = None,
+    extractor: Optional[KeywordExtractor] = None,
+) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+    """
+    Builds the job matrix: BM25 term weights, each row normalized to sum to 1.
+
+    Parameters:
+        jobs (Sequence[str]): Job description texts
+        corpus (JobCorpus, optional): Corpus for IDF and length statistics; defaults
+                                      to statistics of `jobs` themselves
+        extractor (KeywordExtractor, optional): Tokenizer; defaults to the shared one
+
+    Returns:
+        tuple: (M x V csr_matrix of weights, vocabulary term -> column)
+    """
+    extractor = extractor or get_keyword_extractor()
+    vocabulary: Dict[str, int] = {}
+    indptr, indices, tf = _term_count_rows(jobs, vocabulary, extractor)
+    counts = sparse.csr_matrix((tf, indices, indptr), shape=(len(jobs), len(vocabulary)))
+
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    if corpus is not None and corpus.doc_count:
+        doc_count = corpus.doc_count
+        avg_length = corpus.avg_length
+        terms = sorted(vocabulary, key=vocabulary.get)
+        df = np.array([corpus.document_frequency(term) for term in terms], dtype=np.float64)
+    else:
+        doc_count = len(jobs)
+        avg_length = lengths.mean() if len(jobs) else 0.0
+        df = np.bincount(indices, minlength=len(vocabulary)).astype(np.float64)
+    idf = np.log1p((doc_count - df + 0.5) / (df + 0.5))
+
+    # BM25 term weight per nonzero, vectorized over the whole matrix
+    row_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (avg_length or 1))
+    rows = np.repeat(np.arange(len(jobs)), np.diff(indptr))
+    weights = tf * (BM25_K1 + 1) / (tf + row_norm[rows]) * idf[indices]
+
+    totals = np.bincount(rows, weights=weights, minlength=len(jobs))
+    totals[totals == 0] = 1
+    normalized = (weights / totals[rows]).astype(np.float32)
+    return sparse.csr_matrix((normalized, indices, indptr), shape=counts.shape), vocabulary
+
+
+def vectorize_resumes(
+    resumes: Iterable[str],
+    vocabulary: Dict[str, int],
+    extractor: Optional[KeywordExtractor] = None,
+) -> sparse.csr_matrix:
+    """
+    Builds 0/1 term-presence rows over a job vocabulary; terms no job uses are dropped.
+
+    Parameters:
+        resumes (Iterable[str]): Resume texts
+        vocabulary (dict): Term -> column, from vectorize_jobs()
+        extractor (KeywordExtractor, optional): Tokenizer; defaults to the shared one
+
+    Returns:
+        csr_matrix: N x V presence matrix (float32)
+    """
+    indptr, indices = _presence_rows(resumes, vocabulary, extractor or get_keyword_extractor())
+    ones = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((ones, indices, indptr), shape=(len(indptr) - 1, len(vocabulary)))
+
+
+def score_matrix(resumes: Sequence[str], jobs: Sequence[str], corpus: Optional[JobCorpus] = None) -> np.ndarray:
+    """
+    Computes the full N x M match-percentage matrix; for small inputs only.
+
+    Parameters:
+        resumes (Sequence[str]): Resume texts
+        jobs (Sequence[str]): Job description texts
+        corpus (JobCorpus, optional): Corpus for IDF statistics
+
+    Returns:
+        np.ndarray: scores[i, j] = match percentage of resume i for job j
+    """
+    job_matrix, vocabulary = vectorize_jobs(jobs, corpus)
+    return (vectorize_resumes(resumes, vocabulary) @ job_matrix.T).toarray() * 100
+
+
+def _top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k largest entries per row, best first."""
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    values = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def _blocks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def match_many(
+    resumes: Iterable[str],
+    jobs: Sequence[str],
+    top_k: int = DEFAULT_TOP_K,
+    corpus: Optional[JobCorpus] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> MatchResults:
+    """
+    Matches every resume against every job and keeps the top-k in both directions.
+
+    Parameters:
+        resumes (Iterable[str]): Resume texts; may be a generator
+        jobs (Sequence[str]): Job description texts
+        top_k (int): Matches to keep per resume and per job
+        corpus (JobCorpus, optional): Corpus for IDF statistics; defaults to the jobs themselves
+        block_size (int): Resumes scored per sparse product
+
+    Returns:
+        MatchResults: Top jobs per resume and top resumes per job, with match percentages
+    """
+    job_matrix, vocabulary = vectorize_jobs(jobs, corpus)
+    job_matrix_t = job_matrix.T.tocsr()
+    job_count = len(jobs)
+    k_jobs = min(top_k, job_count)
+
+    top_jobs, top_job_scores = [], []
+    best_resumes = np.full((job_count, 0), -1, dtype=np.int64)
+    best_scores = np.full((job_count, 0), -np.inf, dtype=np.float32)
+    seen = 0
+
+    for block in _blocks(resumes, max(block_size, 1)):
+        scores = (vectorize_resumes(block, vocabulary) @ job_matrix_t).toarray() * 100
+
+        if k_jobs:
+            indices, values = _top_k_rows(scores, k_jobs)
+            top_jobs.append(indices)
+            top_job_scores.append(values)
+
+        # Merge this block's best resumes per job into the running top-k
+        block_ids = np.broadcast_to(np.arange(seen, seen + len(block)), (job_count, len(block)))
+        merged_scores = np.hstack([best_scores, scores.T])
+        merged_ids = np.hstack([best_resumes, block_ids])
+        order, best_scores = _top_k_rows(merged_scores, min(top_k, merged_scores.shape[1]))
+        best_resumes = np.take_along_axis(merged_ids, order, axis=1)
+        seen += len(block)
+
+    return MatchResults(
+        top_jobs=np.vstack(top_jobs) if top_jobs else np.empty((seen, k_jobs), dtype=np.int64),
+        top_job_scores=np.vstack(top_job_scores) if top_job_scores else np.empty((seen, k_jobs), dtype=np.float32),
+        top_resumes=best_resumes,
+        top_resume_scores=best_scores,
+    )
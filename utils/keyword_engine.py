@@ -0,0 +1,144 @@
+"""
+Keyword Extraction Engine
+
+Extracts keywords from a single document with the same rules as scikit-learn's
+CountVectorizer(stop_words="english") defaults: lowercase, tokens of two or more word
+characters, English stop words removed, results in alphabetical order. For one
+document at a time a Counter over a precompiled regex does the same work without
+importing sklearn or building a sparse matrix, and results are memoized per text so
+Streamlit reruns with unchanged input cost a dictionary lookup.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Pattern, Tuple
+
+# scikit-learn's English stop word list (sklearn.feature_extraction.text.ENGLISH_STOP_WORDS)
+ENGLISH_STOP_WORDS = frozenset("""
+a about above across after afterwards again against all almost alone along already also
+although always am among amongst amoungst amount an and another any anyhow anyone anything
+anyway anywhere are around as at back be became because become becomes becoming been before
+beforehand behind being below beside besides between beyond bill both bottom but by call can
+cannot cant co con could couldnt cry de describe detail do done down due during each eg eight
+either eleven else elsewhere empty enough etc even ever every everyone everything everywhere
+except few fifteen fifty fill find fire first five for former formerly forty found four from
+front full further get give go had has hasnt have he hence her here hereafter hereby herein
+hereupon hers herself him himself his how however hundred i ie if in inc indeed interest into
+is it its itself keep last latter latterly least less ltd made many may me meanwhile might
+mill mine more moreover most mostly move much must my myself name namely neither never
+nevertheless next nine no nobody none noone nor not nothing now nowhere of off often on once
+one only onto or other others otherwise our ours ourselves out over own part per perhaps
+please put rather re same see seem seemed seeming seems serious several she should show side
+since sincere six sixty so some somehow someone something sometime sometimes somewhere still
+such system take ten than that the their them themselves then thence there thereafter thereby
+therefore therein thereupon these they thick thin third this those though three through
+throughout thru thus to together too top toward towards twelve twenty two un under until up
+upon us very via was we well were what whatever when whence whenever where whereafter whereas
+whereby wherein whereupon wherever whether which while whither who whoever whole whom whose
+why will with within without would yet you your yours yourself yourselves
+""".split())
+
+# CountVectorizer's default token_pattern
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+KEYWORD_CACHE_SIZE = 512
+
+
+class KeywordExtractor:
+    """
+    Reusable keyword extractor: the tokenizer and stop word set are built once, and
+    results are memoized per (text, top_n) in an LRU cache.
+    """
+
+    def __init__(
+        self,
+        stop_words: FrozenSet[str] = ENGLISH_STOP_WORDS,
+        token_pattern: Pattern = TOKEN_PATTERN,
+        cache_size: int = KEYWORD_CACHE_SIZE,
+    ):
+        self.stop_words = frozenset(stop_words)
+        self.token_pattern = token_pattern
+        self._extract_cached = lru_cache(maxsize=cache_size)(self._extract)
+
+    def count_terms(self, text: str) -> Counter:
+        """
+        Counts the non-stop-word tokens in a document.
+
+        Parameters:
+            text (str): Resume or job description text
+
+        Returns:
+            Counter: Lowercased term -> occurrences
+        """
+        stop_words = self.stop_words
+        return Counter(token for token in self.token_pattern.findall(text.lower()) if token not in stop_words)
+
+    def term_set(self, text: str) -> FrozenSet[str]:
+        """
+        Distinct non-stop-word tokens in a document; cheaper than count_terms() when
+        only presence matters.
+
+        Parameters:
+            text (str): Resume or job description text
+
+        Returns:
+            frozenset: Lowercased terms
+        """
+        return frozenset(self.token_pattern.findall(text.lower())) - self.stop_words
+
+    def extract(self, text: str, top_n: Optional[int] = None) -> List[str]:
+        """
+        Returns the document's keywords in alphabetical order.
+
+        Parameters:
+            text (str): Resume or job description text
+            top_n (int, optional): Keep only the most frequent terms (ties broken alphabetically)
+
+        Returns:
+            list: Keywords, alphabetically sorted
+        """
+        if not text or not isinstance(text, str):
+            return []
+        return list(self._extract_cached(text, top_n))
+
+    def cache_info(self):
+        """Hit/miss counters of the per-text result cache."""
+        return self._extract_cached.cache_info()
+
+    def clear_cache(self):
+        self._extract_cached.cache_clear()
+
+    def _extract(self, text: str, top_n: Optional[int]) -> Tuple[str, ...]:
+        counts = self.count_terms(text)
+        if top_n is None or len(counts) <= top_n:
+            return tuple(sorted(counts))
+        most_frequent = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+        return tuple(sorted(term for term, _ in most_frequent))
+
+
+_default_extractor = KeywordExtractor()
+
+
+def get_keyword_extractor() -> KeywordExtractor:
+    """
+    Returns the shared extractor used by extract_keywords().
+
+    Returns:
+        KeywordExtractor: Process-wide instance with the English stop word list
+    """
+    return _default_extractor
+
+
+def extract_keywords(text: str, top_n: Optional[int] = None) -> List[str]:
+    """
+    Extracts keywords from one document using the shared, memoized extractor.
+
+    Parameters:
+        text (str): Resume or job description text
+        top_n (int, optional): Keep only the most frequent terms
+
+    Returns:
+        list: Keywords, alphabetically sorted
+    """
+    return _default_extractor.extract(text, top_n)
@@ -0,0 +1,39 @@
+"""
+Lazy Imports for Resume Decoder
+
+Heavy optional dependencies (PyMuPDF, python-docx, Streamlit, altair) are bound at
+module level with lazy_import() instead of `import`, so importing a utils module only
+costs what it uses; the dependency is executed on first attribute access. A missing
+dependency still fails at import time, like a regular import.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns a module that is loaded the first time one of its attributes is used.
+
+    Parameters:
+        name (str): Absolute module name, e.g. "fitz"
+
+    Returns:
+        ModuleType: The module, already loaded if something imported it before
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
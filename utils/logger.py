@@ -1,5 +1,42 @@
+"""
+Event Logging for Resume Decoder
+
+log_event() only appends the event to an in-memory ring buffer; a background thread
+drains the buffer in batches, formatting and writing the console lines and the JSON
+log file (logs/events.log by default) with one write per batch on a file handle kept
+open between batches. Nothing is serialized or written on the caller's thread.
+
+- Level filter: events below RESUME_DECODER_LOG_LEVEL (debug, info, warning, error)
+  are discarded before they are queued
+- Backpressure: when the buffer is full new events are dropped, never waited on; the
+  drop count is reported in log_stats() and as a warning line in the log
+- Rotation: the log file is rotated when it would pass RESUME_DECODER_LOG_MAX_BYTES
+  or is older than RESUME_DECODER_LOG_ROTATE_SECONDS; rotated files are gzipped and
+  only the newest LOG_BACKUP_COUNT are kept
+- Several processes (batch workers, serve workers, Streamlit) can share one log file:
+  writes hold a shared lock on "<log file>.lock" and rotation an exclusive one, and
+  a file's age is taken from its first event, not from when a process opened it
+
+Queued events are flushed at interpreter exit; call flush() to write them sooner.
+"""
+
+import atexit
 import datetime
+import glob
+import gzip
 import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, a single process is assumed
+    fcntl = None
 
 # Event icons for fun + clarity (and they're cute)
 EVENT_ICONS = {
@@ -10,37 +47,384 @@ EVENT_ICONS = {
     "success": "✅",
     "user": "👤",
     "style": "🎨",
-    "buzzword": "💬"
+    "buzzword": "💬",
+    "trace": "⏱️"
 }
 
+# Severity per event type; unlisted types count as info
+LEVELS = {"debug": 10, "trace": 10, "info": 20, "warning": 30, "error": 40}
+DEFAULT_LEVEL = LEVELS["info"]
+
+LOG_FILE = os.environ.get("RESUME_DECODER_LOG_FILE", os.path.join("logs", "events.log"))
+LOG_LEVEL = os.environ.get("RESUME_DECODER_LOG_LEVEL", "debug")
+LOG_CONSOLE = os.environ.get("RESUME_DECODER_LOG_CONSOLE", "1") != "0"
+LOG_MAX_BYTES = int(os.environ.get("RESUME_DECODER_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_ROTATE_SECONDS = int(os.environ.get("RESUME_DECODER_LOG_ROTATE_SECONDS", "86400"))
+LOG_BACKUP_COUNT = 10
+BUFFER_SIZE = 10_000  # queued events before new ones are dropped
+BATCH_SIZE = 256  # wake the writer once this many events are queued
+FLUSH_INTERVAL = 0.5  # seconds between writes otherwise
+
+# (created, event type, message, context, to file)
+Record = Tuple[float, str, str, Optional[dict], bool]
+
+
+def _level_value(level: str) -> int:
+    return LEVELS.get(level.lower(), DEFAULT_LEVEL)
+
+
+class AsyncLogSink:
+    """
+    Ring buffer of events with a background writer thread, started on first use.
+    """
+
+    def __init__(
+        self,
+        path: str = LOG_FILE,
+        level: str = LOG_LEVEL,
+        console: bool = LOG_CONSOLE,
+        max_bytes: int = LOG_MAX_BYTES,
+        rotate_seconds: int = LOG_ROTATE_SECONDS,
+        backup_count: int = LOG_BACKUP_COUNT,
+        buffer_size: int = BUFFER_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        self.path = path
+        self.level = _level_value(level)
+        self.console = console
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._reset()
+
+    def _reset(self):
+        # Also runs in forked children: the parent's queue, writer thread and file are not theirs
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._queue: deque = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._file = None
+        self._file_size = 0
+        self._file_started = 0.0
+        self._lock_file = None
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "filtered": 0, "rotations": 0, "errors": 0}
+        self._unreported_drops = 0
+
+    def enqueue(self, event_type: str, message: str, context: Optional[dict], to_file: bool) -> bool:
+        """
+        Queues an event without blocking.
+
+        Parameters:
+            event_type (str): Type/category of the event
+            message (str): Description of the event
+            context (dict, optional): Structured metadata; copied, serialized later
+            to_file (bool): Whether the event also goes to the log file
+
+        Returns:
+            bool: False if the event was filtered by level or dropped because the buffer is full
+        """
+        if LEVELS.get(event_type.lower(), DEFAULT_LEVEL) < self.level:
+            with self._lock:
+                self._stats["filtered"] += 1
+            return False
+        record = (time.time(), event_type, message, dict(context) if context else None, to_file)
+        with self._lock:
+            if self._closed or len(self._queue) >= self.buffer_size:
+                self._stats["dropped"] += 1
+                self._unreported_drops += 1
+                return False
+            self._queue.append(record)
+            self._stats["enqueued"] += 1
+            queued = len(self._queue)
+            if self._thread is None:
+                self._start()
+        if queued >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="resume-decoder-log", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # One bad batch (e.g. a closed stdout) must not stop logging for good
+                with self._lock:
+                    self._stats["errors"] += 1
+                sys.stderr.write(f"Event logging failed: {e}\n")
+
+    def flush(self):
+        """Writes every queued event now."""
+        with self._write_lock:
+            with self._lock:
+                batch = list(self._queue)
+                self._queue.clear()
+                drops, self._unreported_drops = self._unreported_drops, 0
+            if batch or drops:
+                self._write(batch, drops)
+
+    def close(self):
+        """Flushes, stops the writer and closes the log file; later events are dropped."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns counters for this sink.
+
+        Returns:
+            dict: "enqueued", "written", "dropped", "filtered", "rotations", "errors" and "pending"
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._queue)
+        return stats
+
+    def _write(self, batch: List[Record], drops: int):
+        console_lines = []
+        file_lines = []
+        for created, event_type, message, context, to_file in batch:
+            timestamp = datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+            icon = EVENT_ICONS.get(event_type.lower(), "🔸")
+            if self.console:
+                # Format for console/Streamlit printing
+                pretty_message = f"{icon} [{timestamp}] {event_type.upper()}: {message}"
+                if context:
+                    pretty_message += f" | Context: {json.dumps(context, default=str)}"
+                console_lines.append(pretty_message + "\n")
+            if to_file:
+                log_entry = {
+                    "timestamp": timestamp,
+                    "event": event_type.upper(),
+                    "icon": icon,
+                    "message": message,
+                    "context": context or {}
+                }
+                file_lines.append(json.dumps(log_entry, default=str) + "\n")
+        if drops:
+            warning = f"Log buffer full; dropped {drops} events."
+            console_lines.append(f"{EVENT_ICONS['warning']} {warning}\n")
+            file_lines.append(json.dumps({
+                "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "event": "WARNING",
+                "icon": EVENT_ICONS["warning"],
+                "message": warning,
+                "context": {"dropped": drops},
+            }) + "\n")
+
+        if console_lines:
+            sys.stdout.write("".join(console_lines))
+            sys.stdout.flush()
+        if file_lines:
+            self._write_file(file_lines)
+        with self._lock:
+            self._stats["written"] += len(batch)
+
+    def _write_file(self, lines: List[str]):
+        try:
+            self._lock_log(shared=True)
+            try:
+                self._sync_file()
+                if self._file_size and time.time() - self._file_started >= self.rotate_seconds:
+                    self._rotate()
+                # One write per batch, split only where the file reaches max_bytes
+                chunk: List[bytes] = []
+                chunk_size = 0
+                for line in lines:
+                    encoded = line.encode("utf-8")
+                    if self._file_size + chunk_size + len(encoded) > self.max_bytes and self._file_size + chunk_size:
+                        self._file.write(b"".join(chunk))
+                        self._file.flush()
+                        self._rotate()
+                        chunk, chunk_size = [], 0
+                    chunk.append(encoded)
+                    chunk_size += len(encoded)
+                self._file.write(b"".join(chunk))
+                self._file.flush()
+                self._file_size += chunk_size
+            finally:
+                self._lock_log(unlock=True)
+        except OSError as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            sys.stderr.write(f"Could not write {self.path}: {e}\n")
+
+    def _lock_log(self, shared: bool = False, unlock: bool = False):
+        if fcntl is None:
+            return
+        if self._lock_file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._lock_file = open(f"{self.path}.lock", "ab")
+        if unlock:
+            operation = fcntl.LOCK_UN
+        else:
+            operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        fcntl.flock(self._lock_file.fileno(), operation)
+
+    def _sync_file(self):
+        # Reopen if another process rotated the file away, and pick up its writes in the size
+        if self._file is not None:
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(self._file.fileno())
+            if current is None or (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev):
+                self._file.close()
+                self._file = None
+        if self._file is None:
+            self._open()
+        else:
+            self._file_size = os.fstat(self._file.fileno()).st_size
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._file_size = self._file.tell()
+        self._file_started = self._started_at() if self._file_size else time.time()
+
+    def _started_at(self) -> float:
+        # Time of the file's first event, so age survives restarts and is shared by every writer
+        try:
+            with open(self.path, "rb") as f:
+                first = json.loads(f.readline(64 * 1024))
+            return time.mktime(time.strptime(first["timestamp"], "%Y-%m-%d %H:%M:%S"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return os.path.getmtime(self.path)
+
+    def _rotate(self):
+        # Called holding the shared lock; upgrade to exclusive so no process writes mid-rotation
+        opened = os.fstat(self._file.fileno())
+        self._file.close()
+        self._file = None
+        self._lock_log()
+        try:
+            self._rotate_locked((opened.st_ino, opened.st_dev))
+        finally:
+            self._lock_log(shared=True)
+        self._open()
+
+    def _rotate_locked(self, identity: Tuple[int, int]):
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (current.st_ino, current.st_dev) != identity:
+            return  # another process rotated it while this one waited for the lock
+
+        rotated = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}"
+        suffix = 1
+        while os.path.exists(rotated + ".gz"):
+            rotated = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+            suffix += 1
+        os.replace(self.path, rotated)
+        with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(rotated)
+        with self._lock:
+            self._stats["rotations"] += 1
+
+        backups = sorted(glob.glob(glob.escape(self.path) + ".*.gz"), key=os.path.getmtime)
+        for old in backups[:-self.backup_count] if self.backup_count else backups:
+            os.remove(old)
+
+
+_sink: Optional[AsyncLogSink] = None
+_sink_lock = threading.Lock()
+
+
+def _after_fork():
+    if _sink is not None:
+        _sink._reset()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_sink() -> AsyncLogSink:
+    """
+    Returns the process-wide sink, created on first use and flushed at exit.
+
+    Returns:
+        AsyncLogSink: Shared sink
+    """
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = AsyncLogSink()
+                atexit.register(_sink.close)
+    return _sink
+
+
+def configure(**options) -> AsyncLogSink:
+    """
+    Replaces the process-wide sink, flushing and closing the current one.
+
+    Parameters:
+        **options: AsyncLogSink arguments (path, level, console, max_bytes, ...)
+
+    Returns:
+        AsyncLogSink: The new sink
+    """
+    global _sink
+    with _sink_lock:
+        previous, _sink = _sink, AsyncLogSink(**options)
+        atexit.register(_sink.close)
+    if previous is not None:
+        previous.close()
+        atexit.unregister(previous.close)
+    return _sink
+
+
+def flush():
+    """Writes every queued event now."""
+    get_sink().flush()
+
+
+def log_stats() -> Dict[str, int]:
+    """
+    Returns the process-wide sink's counters.
+
+    Returns:
+        dict: See AsyncLogSink.stats()
+    """
+    return get_sink().stats()
+
+
 def log_event(event_type: str, message: str, context: dict = None, log_to_file: bool = False):
     """
-    Logs an event with a timestamp, message, optional context, and emoji icon.
-    
+    Logs an event with a timestamp, message, optional context, and emoji icon. The
+    event is queued and written by the background writer; this never blocks on I/O.
+
     Parameters:
         event_type (str): Type/category of the event (e.g., 'info', 'error', 'user')
         message (str): Description of the event
         context (dict, optional): Additional structured metadata (e.g., user input, style used)
-        log_to_file (bool): Whether to append the log to a file ('logs/events.log')
-    """
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    icon = EVENT_ICONS.get(event_type.lower(), "🔸")
-    log_entry = {
-        "timestamp": timestamp,
-        "event": event_type.upper(),
-        "icon": icon,
-        "message": message,
-        "context": context or {}
-    }
-
-    # Format for console/Streamlit printing
-    pretty_message = f"{icon} [{timestamp}] {event_type.upper()}: {message}"
-    if context:
-        pretty_message += f" | Context: {json.dumps(context)}"
-
-    print(pretty_message)
-
-    # Optionally save to log file
-    if log_to_file:
-        with open("logs/events.log", "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        log_to_file (bool): Whether to also append the event to the log file ('logs/events.log')
+    """
+    get_sink().enqueue(event_type, message, context, log_to_file)
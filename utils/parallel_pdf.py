@@ -0,0 +1,156 @@
+"""
+Parallel PDF Extraction for Resume Decoder
+
+Splits a long PDF's page range across worker processes and yields the page texts back
+in order. Each worker opens the document itself by path: files on disk are opened where
+they are, and uploaded bytes are written once to a temporary file on /dev/shm (tmpfs)
+when available, so every worker maps the same shared-memory pages instead of receiving
+a pickled copy of the PDF.
+
+Documents shorter than PARALLEL_MIN_PAGES are extracted in-process, where pool overhead
+would outweigh the gain. If a worker dies (out of memory, a crash inside PyMuPDF), the
+broken pool is discarded and the remaining pages are retried once in a fresh pool; a
+second crash raises PdfWorkerCrashed. A document that killed a worker is never parsed
+in the calling process, where the same crash would take down the server.
+"""
+
+import atexit
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Union
+
+from utils.lazy_import import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF, loaded on first use
+
+PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_DECODER_PARALLEL_MIN_PAGES", "16"))
+PARALLEL_WORKERS = int(os.environ.get("RESUME_DECODER_PARALLEL_WORKERS", "0")) or os.cpu_count() or 1
+RANGES_PER_WORKER = 2  # smaller ranges let the first pages arrive sooner
+CRASH_RETRIES = 1  # fresh pools to try after a worker dies on a document
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class PdfWorkerCrashed(RuntimeError):
+    pass
+
+
+def configure(workers: Optional[int] = None, min_pages: Optional[int] = None):
+    """
+    Overrides the worker count or page threshold for this process, e.g. workers=1 inside
+    processes that are already one of many parallel workers.
+
+    Parameters:
+        workers (int, optional): Worker processes for page extraction; below 2 disables the pool
+        min_pages (int, optional): Smallest page count that is extracted in parallel
+    """
+    global PARALLEL_WORKERS, PARALLEL_MIN_PAGES
+    if workers is not None:
+        PARALLEL_WORKERS = workers
+    if min_pages is not None:
+        PARALLEL_MIN_PAGES = min_pages
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: Streamlit serves sessions from threads, and forking a threaded process is unsafe
+            _pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    with fitz.open(path) as doc:
+        return [doc[index].get_text() for index in range(start, stop)]
+
+
+def _page_ranges(first: int, page_count: int, parts: int) -> List[range]:
+    size = -(-(page_count - first) // parts)
+    return [range(start, min(start + size, page_count)) for start in range(first, page_count, size)]
+
+
+def iter_pdf_pages(
+    source: Union[bytes, str],
+    max_pages: Optional[int] = None,
+    warnings: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """
+    Yields PDF page texts in order, extracting page ranges in parallel for long documents.
+
+    Parameters:
+        source (bytes or str): PDF bytes, or a path to a PDF on disk
+        max_pages (int, optional): Stop after this many pages
+        warnings (list, optional): Receives a note when max_pages cuts the document short
+
+    Returns:
+        Iterator[str]: Page texts in document order
+
+    Raises:
+        PdfWorkerCrashed: If workers died on this document again after a retry in a fresh pool
+    """
+    opened = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype="pdf")
+    with opened as doc:
+        page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+        if page_count < doc.page_count and warnings is not None:
+            warnings.append(f"Only the first {page_count} of {doc.page_count} pages were analyzed.")
+        if page_count < PARALLEL_MIN_PAGES or PARALLEL_WORKERS < 2:
+            for index in range(page_count):
+                yield doc[index].get_text()
+            return
+
+    temp_path = None
+    if isinstance(source, str):
+        path = source
+    else:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", dir=SHM_DIR, delete=False) as f:
+            f.write(source)
+            temp_path = path = f.name
+
+    futures = []
+    extracted = 0
+    crashes = 0
+    try:
+        while extracted < page_count:
+            pool = _get_pool()
+            try:
+                futures = [
+                    pool.submit(_extract_page_range, path, pages.start, pages.stop)
+                    for pages in _page_ranges(extracted, page_count, PARALLEL_WORKERS * RANGES_PER_WORKER)
+                ]
+                for future in futures:
+                    for text in future.result():
+                        yield text
+                        extracted += 1
+            except BrokenProcessPool as e:
+                # Never fall back to parsing here: the crash would repeat in this process
+                _discard_pool(pool)
+                crashes += 1
+                if crashes > CRASH_RETRIES:
+                    raise PdfWorkerCrashed(
+                        f"PDF extraction crashed a worker process on page {extracted + 1} or later."
+                    ) from e
+    finally:
+        # Runs on completion and when the consumer stops early
+        for future in futures:
+            future.cancel()
+        if temp_path is not None:
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+            os.unlink(temp_path)
@@ -0,0 +1,239 @@
+"""
+Phrase Matcher for Resume Decoder
+
+Compiles a list of single- and multi-word phrases into an Aho-Corasick automaton
+over word tokens, so every phrase occurrence in a document is found in one linear
+scan. Matches carry character offsets, which lets scoring, highlighting and
+rewriting all reuse the same match list instead of re-tokenizing the text.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+WORD_PATTERN = re.compile(r"\b\w[\w\-]*\b")
+
+
+class Token(NamedTuple):
+    text: str     # lowercased token
+    start: int    # character offset in the source text
+    end: int
+    joined: bool  # True when only whitespace separates it from the previous token
+
+
+class PhraseMatch(NamedTuple):
+    key: str          # phrase as it was given to the matcher
+    start: int        # character span in the source text
+    end: int
+    token_start: int  # token span [token_start, token_end)
+    token_end: int
+
+
+def tokenize(text: str) -> List[Token]:
+    """
+    Splits text into lowercased word tokens with their character offsets.
+
+    Parameters:
+        text (str): Raw input text
+
+    Returns:
+        List[Token]: Tokens in document order
+    """
+    tokens = []
+    prev_end = 0
+    for match in WORD_PATTERN.finditer(text):
+        start = match.start()
+        joined = bool(tokens) and not text[prev_end:start].strip()
+        tokens.append(Token(match.group(0).lower(), start, match.end(), joined))
+        prev_end = match.end()
+    return tokens
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is word tokens rather than characters.
+
+    A multi-word phrase only matches when its words are separated by whitespace,
+    so "team player" matches "team  player" but not "team. Player".
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._keys: List[str] = []
+        self._lengths: List[int] = []
+
+        for phrase in phrases:
+            words = tuple(token.text for token in tokenize(phrase))
+            if words:
+                self._add(phrase, words)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add(self, phrase: str, words: Tuple[str, ...]):
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = nxt
+        self._outputs[state] += (len(self._keys),)
+        self._keys.append(phrase)
+        self._lengths.append(len(words))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(word, 0)
+                self._outputs[nxt] += self._outputs[self._fail[nxt]]
+
+    def candidates(self, tokens: List[Token]) -> List[Tuple[int, int, str]]:
+        """
+        Finds every phrase occurrence, overlapping ones included.
+
+        Parameters:
+            tokens (List[Token]): Output of tokenize()
+
+        Returns:
+            List[tuple]: (first token, -length in tokens, phrase) per occurrence, unsorted
+        """
+        goto, fail, outputs, lengths, keys = self._goto, self._fail, self._outputs, self._lengths, self._keys
+        candidates = []
+        state = 0
+
+        for i, token in enumerate(tokens):
+            if not token.joined:
+                state = 0
+            word = token.text
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for pid in outputs[state]:
+                candidates.append((i + 1 - lengths[pid], -lengths[pid], keys[pid]))
+        return candidates
+
+    def match_tokens(self, tokens: List[Token]) -> List[PhraseMatch]:
+        """
+        Finds non-overlapping phrase occurrences, preferring the leftmost and then
+        the longest match.
+
+        Parameters:
+            tokens (List[Token]): Output of tokenize()
+
+        Returns:
+            List[PhraseMatch]: Matches sorted by position
+        """
+        return select_matches(tokens, sorted(self.candidates(tokens)))
+
+    def find(self, text: str) -> List[PhraseMatch]:
+        """
+        Tokenizes text and returns all phrase matches in it.
+
+        Parameters:
+            text (str): Raw input text
+
+        Returns:
+            List[PhraseMatch]: Matches sorted by position
+        """
+        return self.match_tokens(tokenize(text))
+
+
+class LayeredMatcher:
+    """
+    Matches the phrases of several matchers as if they were compiled together, without
+    recompiling them. Used to lay a few custom phrases over a large shared dictionary;
+    when layers match the same span, the earlier layer's phrase wins.
+    """
+
+    def __init__(self, *layers: PhraseMatcher):
+        self.layers = layers
+
+    def __len__(self) -> int:
+        return sum(len(layer) for layer in self.layers)
+
+    def match_tokens(self, tokens: List[Token]) -> List[PhraseMatch]:
+        """
+        Finds non-overlapping phrase occurrences across all layers, preferring the
+        leftmost and then the longest match.
+
+        Parameters:
+            tokens (List[Token]): Output of tokenize()
+
+        Returns:
+            List[PhraseMatch]: Matches sorted by position
+        """
+        candidates = []
+        for rank, layer in enumerate(self.layers):
+            candidates.extend((first, neg_length, rank, key) for first, neg_length, key in layer.candidates(tokens))
+        candidates.sort()
+        return select_matches(tokens, [(first, neg_length, key) for first, neg_length, _, key in candidates])
+
+    def find(self, text: str) -> List[PhraseMatch]:
+        """
+        Tokenizes text and returns all phrase matches in it.
+
+        Parameters:
+            text (str): Raw input text
+
+        Returns:
+            List[PhraseMatch]: Matches sorted by position
+        """
+        return self.match_tokens(tokenize(text))
+
+
+def select_matches(tokens: List[Token], candidates: List[Tuple[int, int, str]]) -> List[PhraseMatch]:
+    """
+    Picks non-overlapping matches from sorted candidates, leftmost and then longest first.
+
+    Parameters:
+        tokens (List[Token]): Tokens the candidates were found in
+        candidates (list): Sorted (first token, -length, phrase) tuples
+
+    Returns:
+        List[PhraseMatch]: Matches sorted by position
+    """
+    matches = []
+    last_end = 0
+    for first, neg_length, key in candidates:
+        if first < last_end:
+            continue
+        last_end = first - neg_length
+        matches.append(PhraseMatch(key, tokens[first].start, tokens[last_end - 1].end, first, last_end))
+    return matches
+
+
+@lru_cache(maxsize=32)
+def _compile(phrases: FrozenSet[str]) -> PhraseMatcher:
+    return PhraseMatcher(sorted(phrases))
+
+
+def get_matcher(phrases: Iterable[str]) -> PhraseMatcher:
+    """
+    Returns a compiled matcher for the given phrases, reusing a cached automaton
+    when the same phrase set was compiled before.
+
+    Parameters:
+        phrases (Iterable[str]): Phrases to match (e.g. the keys of a buzzword dict)
+
+    Returns:
+        PhraseMatcher: Compiled automaton
+    """
+    # Compiled dictionaries (utils.buzzword_dictionary) carry their own automaton
+    compiled = getattr(phrases, "matcher", None)
+    if compiled is not None:
+        return compiled
+    return _compile(frozenset(phrases))
@@ -1,6 +1,7 @@
-from sklearn.feature_extraction.text import CountVectorizer
 import re
 
+from utils.keyword_engine import get_keyword_extractor
+
 def extract_contact_header(resume_text):
     lines = resume_text.splitlines()
     header = {
@@ -38,17 +39,8 @@ def extract_contact_header(resume_text):
     return header
 
 def extract_keywords(text):
-    if not text or not isinstance(text, str):
-        return []
-
-    vectorizer = CountVectorizer(stop_words='english')
-    try:
-        X = vectorizer.fit_transform([text])
-        keywords = vectorizer.get_feature_names_out()
-        return list(keywords)
-    except Exception as e:
-        print(f"[Keyword Extraction Error]: {e}")
-        return []
+    # Shared extractor: same terms as CountVectorizer(stop_words='english'), memoized per text
+    return get_keyword_extractor().extract(text)
 
 def match_keywords(job_keywords, resume_keywords):
     if not isinstance(job_keywords, list) or not isinstance(resume_keywords, list):
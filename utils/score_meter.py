@@ -6,7 +6,10 @@ visual elements like progress bars and a BS meter.
 Also supports combined resume quality scoring (BS + ATS + Tone).
 """
 
-import streamlit as st
+from utils.lazy_import import lazy_import
+
+# Only the render_* helpers need Streamlit; headless scoring never loads it
+st = lazy_import("streamlit")
 
 def interpret_score(score: float) -> str:
     """
@@ -0,0 +1,255 @@
+"""
+Share Tokens for Resume Decoder
+
+Compact, versioned tokens for share links. A token carries only what is needed to
+reproduce a result, the input text and the decoding style; everything else is
+recomputed by the app. Layout, before URL-safe base64 without padding:
+
+    version (1 byte) | kind (1 byte) | body
+
+- kind "i" (inline): CRC32 of the payload (4 bytes) + zlib-compressed payload
+- kind "s" (stored): first 16 bytes of the payload's SHA-256; the compressed payload
+  lives in a server-side content-addressed store
+
+The payload is the style and input as UTF-8, separated by a NUL byte. Payloads that
+compress to more than SHARE_INLINE_MAX_BYTES go to the store, so links stay a few
+dozen characters instead of hundreds of KB. The store is a directory of files named
+by digest under data_dir()/shares; without a data directory every token is inline.
+Stored payloads expire SHARE_TTL seconds after they were last shared, and the oldest
+are evicted once the store passes SHARE_STORE_MAX_BYTES.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import struct
+import time
+import zlib
+from typing import NamedTuple, Optional
+
+from utils.job_corpus import data_dir
+
+SHARE_TOKEN_VERSION = 1
+SHARE_INLINE_MAX_BYTES = 1500  # compressed payload size above which the store is used
+MAX_PAYLOAD_BYTES = 4 * 1024 * 1024  # refuse to inflate anything larger
+DIGEST_BYTES = 16
+SHARE_TTL = int(os.environ.get("RESUME_DECODER_SHARE_TTL", str(30 * 24 * 3600)))  # seconds
+SHARE_STORE_MAX_BYTES = int(os.environ.get("RESUME_DECODER_SHARE_MAX_BYTES", str(256 * 1024 * 1024)))
+PRUNE_INTERVAL = 3600  # seconds between eviction passes, shared by every process
+PRUNE_MARKER = ".pruned"
+
+KIND_INLINE = b"i"
+KIND_STORED = b"s"
+
+
+class InvalidShareToken(ValueError):
+    pass
+
+
+class ShareState(NamedTuple):
+    input: str
+    style: str
+
+
+class ShareStore:
+    """Content-addressed store for payloads too large to inline in a link."""
+
+    def __init__(self, directory: str, ttl: int = SHARE_TTL, max_bytes: int = SHARE_STORE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def _path(self, digest: bytes) -> str:
+        name = digest.hex()
+        return os.path.join(self.directory, name[:2], name[2:])
+
+    def put(self, data: bytes) -> bytes:
+        """
+        Stores compressed payload bytes under their digest; storing them again only
+        refreshes their age.
+
+        Parameters:
+            data (bytes): Compressed payload
+
+        Returns:
+            bytes: Digest to put in the token
+        """
+        digest = hashlib.sha256(data).digest()[:DIGEST_BYTES]
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.utime(path)  # sharing it again restarts its TTL
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)
+        self._maybe_prune()
+        return digest
+
+    def _maybe_prune(self):
+        marker = os.path.join(self.directory, PRUNE_MARKER)
+        try:
+            if time.time() - os.path.getmtime(marker) < PRUNE_INTERVAL:
+                return
+        except OSError:
+            pass
+        with open(marker, "a"):
+            os.utime(marker)
+        self.prune()
+
+    def prune(self) -> int:
+        """
+        Deletes payloads past their TTL, then the least recently shared ones until the
+        store fits in max_bytes.
+
+        Returns:
+            int: Number of payloads deleted
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name == PRUNE_MARKER or name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.ttl
+        deleted = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        return deleted
+
+    def get(self, digest: bytes) -> Optional[bytes]:
+        """
+        Loads compressed payload bytes, verifying them against the digest.
+
+        Parameters:
+            digest (bytes): Digest from a token
+
+        Returns:
+            bytes or None: The payload, or None if missing or corrupted
+        """
+        path = self._path(digest)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None  # expired; prune() deletes it
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        return data if hashlib.sha256(data).digest()[:DIGEST_BYTES] == digest else None
+
+
+def get_share_store() -> Optional[ShareStore]:
+    """
+    Returns the store under data_dir(), or None when persistence is disabled.
+
+    Returns:
+        ShareStore or None: Store for large share payloads
+    """
+    directory = data_dir()
+    return ShareStore(os.path.join(directory, "shares")) if directory else None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(token: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidShareToken("Share token is not valid base64.") from exc
+
+
+def _inflate(data: bytes) -> ShareState:
+    inflater = zlib.decompressobj()
+    try:
+        payload = inflater.decompress(data, MAX_PAYLOAD_BYTES)
+    except zlib.error as exc:
+        raise InvalidShareToken("Share token payload is corrupted.") from exc
+    if inflater.unconsumed_tail:
+        raise InvalidShareToken("Share token payload is too large.")
+    style, _, text = payload.decode("utf-8", errors="replace").partition("\0")
+    return ShareState(input=text, style=style)
+
+
+def encode_share_token(
+    input_text: str,
+    style: str,
+    store: Optional[ShareStore] = None,
+    inline_max_bytes: int = SHARE_INLINE_MAX_BYTES,
+) -> str:
+    """
+    Builds a share token for an input and decoding style.
+
+    Parameters:
+        input_text (str): Text the recipient should see decoded
+        style (str): Decoding style
+        store (ShareStore, optional): Store for large payloads; defaults to get_share_store()
+        inline_max_bytes (int): Largest compressed payload kept inline in the token
+
+    Returns:
+        str: URL-safe token for a ?state= query parameter
+    """
+    data = zlib.compress(f"{style}\0{input_text}".encode("utf-8"), 9)
+    header = bytes([SHARE_TOKEN_VERSION])
+
+    store = store or get_share_store()
+    if len(data) > inline_max_bytes and store is not None:
+        try:
+            return _b64encode(header + KIND_STORED + store.put(data))
+        except OSError:
+            pass  # a read-only data directory falls back to a long inline token
+    return _b64encode(header + KIND_INLINE + struct.pack(">I", zlib.crc32(data)) + data)
+
+
+def decode_share_token(token: str, store: Optional[ShareStore] = None) -> ShareState:
+    """
+    Verifies and decodes a share token.
+
+    Parameters:
+        token (str): Value of the ?state= query parameter
+        store (ShareStore, optional): Store for large payloads; defaults to get_share_store()
+
+    Returns:
+        ShareState: Shared input text and style
+
+    Raises:
+        InvalidShareToken: If the token is malformed, corrupted, unknown or from an unsupported version
+    """
+    raw = _b64decode(token.strip())
+    if len(raw) < 2:
+        raise InvalidShareToken("Share token is too short.")
+    if raw[0] != SHARE_TOKEN_VERSION:
+        raise InvalidShareToken(f"Unsupported share token version {raw[0]}.")
+    kind, body = raw[1:2], raw[2:]
+
+    if kind == KIND_INLINE:
+        if len(body) < 4 or struct.unpack(">I", body[:4])[0] != zlib.crc32(body[4:]):
+            raise InvalidShareToken("Share token failed its checksum; the link may be truncated.")
+        return _inflate(body[4:])
+
+    if kind == KIND_STORED:
+        store = store or get_share_store()
+        data = store.get(body) if store is not None and len(body) == DIGEST_BYTES else None
+        if data is None:
+            raise InvalidShareToken("Shared session was not found on this server.")
+        return _inflate(data)
+
+    raise InvalidShareToken("Unknown share token kind.")
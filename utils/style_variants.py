@@ -42,3 +42,22 @@ def apply_style(base_text: str, style: str, original: str) -> str:
     else:
         # Fallback to plain
         return base_text
+
+
+ORIGINAL_PLACEHOLDER = "\0"
+
+
+def style_template(base_text: str, style: str, styler=apply_style) -> tuple:
+    """
+    Precomputes a buzzword's rewrite as the pieces around the original wording, so the
+    rewrite of any occurrence is original.join(pieces) with no per-occurrence styling.
+
+    Parameters:
+        base_text (str): The plain translation of the buzzword.
+        style (str): The selected tone or rewrite style.
+        styler (callable): Function with apply_style's signature producing the rewrite.
+
+    Returns:
+        tuple: Text pieces; a single piece when the rewrite does not repeat the original.
+    """
+    return tuple(styler(base_text, style, ORIGINAL_PLACEHOLDER).split(ORIGINAL_PLACEHOLDER))
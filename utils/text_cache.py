@@ -0,0 +1,258 @@
+"""
+Extracted Text Cache for Resume Decoder
+
+Content-addressed cache for text extracted from uploaded files. Entries are keyed by
+the SHA-256 of the upload bytes (plus the file type), so re-uploading the same resume
+or a widget-triggered Streamlit rerun costs a hash instead of a PDF/DOCX parse.
+
+Two tiers:
+- Memory: an LRU bounded by total text size, private to the process
+- Disk: a SQLite file shared by every process on the machine, bounded by total size
+  and evicted least-recently-used first
+
+The disk location defaults to ~/.cache/resume_decoder and can be moved with the
+RESUME_DECODER_CACHE_DIR environment variable; set it to an empty string to keep
+the cache in memory only.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "resume_decoder")
+DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CachedText(NamedTuple):
+    text: str
+    page_offsets: List[int]  # character offset where each page starts in text
+    warnings: List[str] = []  # extraction warnings, e.g. that a limit cut the document short
+
+
+def content_key(data: bytes, file_type: str) -> str:
+    """
+    Builds the cache key for an upload.
+
+    Parameters:
+        data (bytes): Raw upload bytes
+        file_type (str): MIME type the bytes are parsed as
+
+    Returns:
+        str: "<file type>:<sha256 hex digest>"
+    """
+    return f"{file_type}:{hashlib.sha256(data).hexdigest()}"
+
+
+def _entry_size(entry: CachedText) -> int:
+    return len(entry.text) + 8 * len(entry.page_offsets)
+
+
+class TextCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of extracted text. Safe to share between
+    Streamlit session threads; each process opens its own SQLite connection.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+    ):
+        self.db_path = db_path
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CachedText]" = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    # ------------------------
+    # Public API
+    # ------------------------
+
+    def get(self, key: str) -> Optional[CachedText]:
+        """
+        Looks up an entry, promoting disk hits into the memory tier.
+
+        Parameters:
+            key (str): Output of content_key()
+
+        Returns:
+            CachedText or None: Cached extraction, if present
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry
+
+            try:
+                entry = self._disk_get(key)
+            except (sqlite3.Error, OSError):
+                entry = None
+            if entry is not None:
+                self._stats["disk_hits"] += 1
+                self._memory_put(key, entry)
+                return entry
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, entry: CachedText):
+        """
+        Stores an entry in both tiers, evicting old entries past the size limits.
+
+        Parameters:
+            key (str): Output of content_key()
+            entry (CachedText): Extracted text, page offsets and warnings
+        """
+        with self._lock:
+            self._memory_put(key, entry)
+            try:
+                self._disk_put(key, entry)
+            except (sqlite3.Error, OSError):
+                # The disk tier is an optimization; a read-only or full disk just skips it
+                pass
+
+    def clear(self):
+        """Drops every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM extracted_text")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns hit/miss/eviction counters for this process plus the current hit rate.
+
+        Returns:
+            dict: Counters, "hit_rate" (0-1) and "memory_bytes"
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_bytes"] = self._memory_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    # ------------------------
+    # Memory tier
+    # ------------------------
+
+    def _memory_put(self, key: str, entry: CachedText):
+        size = _entry_size(entry)
+        if size > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= _entry_size(previous)
+        self._memory[key] = entry
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _entry_size(evicted)
+            self._stats["memory_evictions"] += 1
+
+    # ------------------------
+    # Disk tier
+    # ------------------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        # Reopen after fork so worker processes never share a connection with their parent
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS extracted_text ("
+                    "key TEXT PRIMARY KEY, text TEXT NOT NULL, page_offsets TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, accessed REAL NOT NULL, warnings TEXT NOT NULL DEFAULT '[]')"
+                )
+                columns = {row[1] for row in self._conn.execute("PRAGMA table_info(extracted_text)")}
+                if "warnings" not in columns:
+                    # Caches written before warnings were stored
+                    self._conn.execute("ALTER TABLE extracted_text ADD COLUMN warnings TEXT NOT NULL DEFAULT '[]'")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON extracted_text (accessed)")
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[CachedText]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT text, page_offsets, warnings FROM extracted_text WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE extracted_text SET accessed = ? WHERE key = ?", (time.time(), key))
+        return CachedText(row[0], json.loads(row[1]), json.loads(row[2]))
+
+    def _disk_put(self, key: str, entry: CachedText):
+        conn = self._connection()
+        if conn is None:
+            return
+        size = _entry_size(entry)
+        if size > self.disk_max_bytes:
+            return
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extracted_text (key, text, page_offsets, size, accessed, warnings) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.text, json.dumps(entry.page_offsets), size, time.time(), json.dumps(entry.warnings)),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extracted_text").fetchone()[0]
+            if total <= self.disk_max_bytes:
+                return
+            # Evict least-recently-used entries until the tier is back under 90% of its limit
+            target = total - int(self.disk_max_bytes * 0.9)
+            freed = 0
+            victims = []
+            for victim_key, victim_size in conn.execute("SELECT key, size FROM extracted_text ORDER BY accessed"):
+                if freed >= target:
+                    break
+                victims.append((victim_key,))
+                freed += victim_size
+            conn.executemany("DELETE FROM extracted_text WHERE key = ?", victims)
+            self._stats["disk_evictions"] += len(victims)
+
+
+_default_cache: Optional[TextCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    """
+    Returns the process-wide cache, configured from RESUME_DECODER_CACHE_DIR.
+
+    Returns:
+        TextCache: Shared cache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            cache_dir = os.environ.get("RESUME_DECODER_CACHE_DIR", DEFAULT_CACHE_DIR)
+            db_path = os.path.join(cache_dir, "extracted_text.sqlite") if cache_dir else None
+            _default_cache = TextCache(db_path)
+        return _default_cache
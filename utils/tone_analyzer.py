@@ -5,10 +5,16 @@ Performs a basic word-frequency-based tone breakdown using categories like corpo
 action-driven, creative, and emotional to simulate tone imbalance detection.
 Outputs a simple structure that can be visualized as a chart or summary.
 Also supports optional HTML-based inline word highlighting.
+
+Keywords are indexed once at import into a keyword -> category lookup and a phrase
+automaton, so counting is a single pass over the tokens and multi-word keywords
+like "team player" are found too. find_tone_hits() returns the character spans per
+category so the counter, highlighter and chart can share one scan.
 """
 
-from collections import Counter
-import re
+from typing import Dict, List, Optional, Tuple
+
+from utils.phrase_matcher import PhraseMatcher, Token, tokenize
 
 TONE_CATEGORIES = {
     "corporate": ["synergy", "alignment", "stakeholders", "roadmap", "strategic", "scalable", "initiative"],
@@ -19,26 +25,45 @@ TONE_CATEGORIES = {
 }
 
 
-def analyze_tone(text: str) -> dict:
+# keyword -> tone category, plus a phrase automaton covering every keyword
+TONE_LOOKUP = {kw: tone for tone, keywords in TONE_CATEGORIES.items() for kw in keywords}
+TONE_MATCHER = PhraseMatcher(TONE_LOOKUP)
+
+
+def find_tone_hits(text: str, tokens: Optional[List[Token]] = None) -> Dict[str, List[Tuple[int, int]]]:
     """
-    Counts keyword occurrences across tone categories to estimate tone balance.
+    Finds every tone keyword occurrence and groups the character spans by category.
 
     Parameters:
         text (str): Raw input text
+        tokens (list, optional): Precomputed tokenize(text) output to reuse
 
     Returns:
-        dict: Dictionary with tone category names and their counts
+        dict: Tone category -> list of (start, end) spans in text order
+    """
+    if tokens is None:
+        tokens = tokenize(text)
+
+    hits: Dict[str, List[Tuple[int, int]]] = {}
+    for match in TONE_MATCHER.match_tokens(tokens):
+        hits.setdefault(TONE_LOOKUP[match.key], []).append((match.start, match.end))
+    return hits
+
+
+def analyze_tone(text: str, hits: Optional[Dict[str, List[Tuple[int, int]]]] = None) -> dict:
     """
-    text_lower = text.lower()
-    word_list = re.findall(r"\b\w+\b", text_lower)
-    tone_counts = Counter()
+    Counts keyword occurrences across tone categories to estimate tone balance.
 
-    for tone, keywords in TONE_CATEGORIES.items():
-        for word in word_list:
-            if word in keywords:
-                tone_counts[tone] += 1
+    Parameters:
+        text (str): Raw input text
+        hits (dict, optional): Precomputed find_tone_hits() output to reuse
 
-    return dict(tone_counts)
+    Returns:
+        dict: Dictionary with tone category names and their counts
+    """
+    if hits is None:
+        hits = find_tone_hits(text)
+    return {tone: len(spans) for tone, spans in hits.items()}
 
 
 def get_dominant_tone(tone_results: dict) -> str:
@@ -56,22 +81,27 @@ def get_dominant_tone(tone_results: dict) -> str:
     return max(tone_results, key=tone_results.get)
 
 
-def highlight_tone_words(text: str) -> str:
+def highlight_tone_words(text: str, hits: Optional[Dict[str, List[Tuple[int, int]]]] = None) -> str:
     """
     Highlights tone-related keywords in the input text with HTML spans and classes.
 
     Parameters:
         text (str): Input text to process
+        hits (dict, optional): Precomputed find_tone_hits() output to reuse instead
+                               of scanning the text again
 
     Returns:
         str: HTML string with tone keywords wrapped in <span class="tone-{category}">
     """
-    word_list = re.findall(r"\b\w+\b", text)
-    highlighted = text
-
-    for tone, keywords in TONE_CATEGORIES.items():
-        for kw in sorted(keywords, key=len, reverse=True):
-            regex = rf"\b({re.escape(kw)})\b"
-            highlighted = re.sub(regex, rf'<span class="tone-{tone}">\1</span>', highlighted, flags=re.IGNORECASE)
-
-    return highlighted
+    if hits is None:
+        hits = find_tone_hits(text)
+
+    spans = sorted((start, end, tone) for tone, positions in hits.items() for start, end in positions)
+    pieces = []
+    pos = 0
+    for start, end, tone in spans:
+        pieces.append(text[pos:start])
+        pieces.append(f'<span class="tone-{tone}">{text[start:end]}</span>')
+        pos = end
+    pieces.append(text[pos:])
+    return "".join(pieces)
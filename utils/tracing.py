@@ -0,0 +1,398 @@
+"""
+Stage Tracing and Request Profiling for Resume Decoder
+
+Spans time the stages of a request (file extraction, buzzword matching, tone
+detection and highlighting, the ATS check, decoding, the tone chart, job matching).
+Each finished span is exported as a structured "trace" event through
+utils.logger.log_event (to the console and logs/events.log) and added to a
+per-stage latency histogram, so a slow decode can be attributed to the stage that
+caused it.
+
+Tracing is off unless RESUME_DECODER_TRACE is set or a request opts in (the pages
+accept ?trace=1). Disabled, span() returns a shared no-op object and stage_clock()
+a no-op clock, so instrumented code pays one context-variable lookup per call.
+
+A single request can also be profiled with cProfile or pyinstrument (if installed)
+via RESUME_DECODER_PROFILE or ?profile=cprofile|pyinstrument. Reports are written
+to logs/profiles/ (only the newest MAX_PROFILE_FILES are kept) and in memory for the
+debug sidebar.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from utils.logger import log_event
+
+TRACE_ENV = "RESUME_DECODER_TRACE"
+PROFILE_ENV = "RESUME_DECODER_PROFILE"
+PROFILE_DIR = os.path.join("logs", "profiles")
+PROFILE_ENGINES = ("cprofile", "pyinstrument")
+PROFILE_TOP_N = 40  # functions listed in a cProfile report
+# Upper bucket bounds in milliseconds; anything slower lands in the overflow bucket
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+OFF_VALUES = ("", "0", "false", "off")
+
+
+def env_flag(name: str) -> bool:
+    """
+    Reads an on/off environment variable; unset, "", "0", "false" and "off" are off.
+
+    Parameters:
+        name (str): Environment variable name
+
+    Returns:
+        bool: Whether the flag is on
+    """
+    return os.environ.get(name, "").strip().lower() not in OFF_VALUES
+
+
+_TRACE_DEFAULT = env_flag(TRACE_ENV)
+_trace_override: ContextVar[Optional[bool]] = ContextVar("trace_override", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def enabled() -> bool:
+    """Whether spans are recorded in the current context."""
+    override = _trace_override.get()
+    return _TRACE_DEFAULT if override is None else override
+
+
+class StageHistogram:
+    """
+    Fixed-bucket latency histogram for one stage.
+    """
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.buckets[bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip([f"<={bound}" for bound in self.bounds] + ["overflow"], self.buckets)),
+        }
+
+
+_histograms_lock = threading.Lock()
+_histograms: Dict[str, StageHistogram] = {}
+
+
+def stage_histograms() -> Dict[str, Dict[str, object]]:
+    """
+    Returns the latency histogram of every stage recorded in this process.
+
+    Returns:
+        dict: Stage name -> "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "buckets"
+    """
+    with _histograms_lock:
+        return {name: histogram.summary() for name, histogram in sorted(_histograms.items())}
+
+
+def reset_histograms():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _export(name: str, duration_ms: float, trace_id: str, parent: Optional[str], attrs: Dict[str, object]):
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = StageHistogram()
+        histogram.observe(duration_ms)
+    context = {"trace_id": trace_id, "span": name, "parent": parent, "duration_ms": round(duration_ms, 3)}
+    context.update(attrs)
+    log_event("trace", f"{name} took {duration_ms:.2f} ms", context, log_to_file=True)
+
+
+class Span:
+    """
+    A timed stage. Nested spans share their root's trace id and name their parent.
+    """
+
+    __slots__ = ("name", "attrs", "trace_id", "parent", "_start", "_parent_span")
+
+    def __init__(self, name: str, attrs: Dict[str, object]):
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = ""
+        self.parent: Optional[str] = None
+
+    def set(self, **attrs):
+        """Adds attributes to the exported event, e.g. a cache hit found inside the span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.parent = parent.name if parent else None
+        self._parent_span = parent
+        _current_span.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.set(self._parent_span)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _export(self.name, duration_ms, self.trace_id, self.parent, self.attrs)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs):
+    """
+    Returns a context manager timing one stage.
+
+    Parameters:
+        name (str): Stage name, e.g. "extract" or "analyze.buzzwords"
+        **attrs: Extra fields for the exported event
+
+    Returns:
+        Span: A recording span, or a shared no-op span when tracing is disabled
+    """
+    if not enabled():
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def record_span(name: str, duration_ms: float, **attrs):
+    """
+    Records a stage that was timed elsewhere as a child of the current span.
+
+    Parameters:
+        name (str): Stage name
+        duration_ms (float): Stage duration in milliseconds
+        **attrs: Extra fields for the exported event
+    """
+    if not enabled():
+        return
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+    _export(name, duration_ms, trace_id, parent.name if parent else None, attrs)
+
+
+class StageClock:
+    """
+    Accumulates time per stage across a loop (e.g. buzzword matching over every
+    paragraph) and records one span per stage at the end, instead of one per iteration.
+    """
+
+    __slots__ = ("totals", "_last")
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def start(self):
+        """Restarts the lap timer, so untracked work since the last lap isn't charged to the next stage."""
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """Charges the time since the previous lap (or start) to a stage."""
+        now = time.perf_counter()
+        self.totals[stage] = self.totals.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def record(self, **attrs):
+        """Records one span per stage, as children of the current span."""
+        for stage, total in self.totals.items():
+            record_span(stage, total * 1000, **attrs)
+
+
+class _NullClock:
+    __slots__ = ()
+
+    def start(self):
+        pass
+
+    def lap(self, stage: str):
+        pass
+
+    def record(self, **attrs):
+        pass
+
+
+_NULL_CLOCK = _NullClock()
+
+
+def stage_clock():
+    """
+    Returns a StageClock, or a shared no-op clock when tracing is disabled.
+    """
+    return StageClock() if enabled() else _NULL_CLOCK
+
+
+_last_profiles_lock = threading.Lock()
+_last_profiles: List[Dict[str, str]] = []
+MAX_KEPT_PROFILES = 5
+MAX_PROFILE_FILES = 50
+
+
+def recent_profiles() -> List[Dict[str, str]]:
+    """
+    Returns the most recent profile reports, newest first.
+
+    Returns:
+        list: Dicts with "name", "engine", "path" and "report"
+    """
+    with _last_profiles_lock:
+        return list(_last_profiles)
+
+
+def profile_engine(requested: Optional[str] = None) -> Optional[str]:
+    """
+    Resolves which profiler to use for a request.
+
+    Parameters:
+        requested (str, optional): Per-request choice (e.g. a query param); "1" means cprofile
+
+    Returns:
+        str or None: "cprofile", "pyinstrument", or None when profiling is off
+    """
+    value = (requested or os.environ.get(PROFILE_ENV, "")).strip().lower()
+    if value in OFF_VALUES:
+        return None
+    if value not in PROFILE_ENGINES:
+        return "cprofile"
+    if value == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            log_event("warning", "pyinstrument is not installed; profiling with cProfile instead.")
+            return "cprofile"
+    return value
+
+
+def _prune_profile_files():
+    reports = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".txt")),
+        key=os.path.getmtime,
+    )
+    for old in reports[:-MAX_PROFILE_FILES]:
+        os.remove(old)
+
+
+class RequestScope:
+    """
+    Root span of one request, optionally tracing it when tracing is off globally and
+    profiling it. Use as a context manager, or call start() and finish() when the
+    request doesn't fit in one block (a Streamlit script run).
+    """
+
+    def __init__(self, name: str, trace: bool = False, profile: Optional[str] = None, **attrs):
+        self.name = name
+        self.trace = trace
+        self.profile = profile
+        self.attrs = attrs
+        self.report: Optional[str] = None
+        self._span = None
+        self._profiler = None
+        self._previous_override: Optional[bool] = None
+        self._finished = True
+
+    def start(self) -> "RequestScope":
+        self._finished = False
+        self._previous_override = _trace_override.get()
+        if self.trace:
+            _trace_override.set(True)
+        self._span = span(self.name, **self.attrs)
+        self._span.__enter__()
+        if self.profile == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+        elif self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def finish(self, exc_type=None):
+        if self._finished:
+            return
+        self._finished = True
+        if self._profiler is not None:
+            self._stop_profiler()
+        self._span.__exit__(exc_type, None, None)
+        _trace_override.set(self._previous_override)
+
+    def _stop_profiler(self):
+        if self.profile == "pyinstrument":
+            self._profiler.stop()
+            self.report = self._profiler.output_text(unicode=True)
+        else:
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+            self.report = stream.getvalue()
+        self._profiler = None
+
+        path = os.path.join(PROFILE_DIR, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.txt")
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(self.report)
+            _prune_profile_files()
+        except OSError as e:
+            log_event("warning", f"Could not save profile: {e}")
+            path = ""
+        with _last_profiles_lock:
+            _last_profiles.insert(0, {"name": self.name, "engine": self.profile, "path": path, "report": self.report})
+            del _last_profiles[MAX_KEPT_PROFILES:]
+        log_event("trace", f"Profiled {self.name} with {self.profile}", {"path": path}, log_to_file=True)
+
+    def __enter__(self) -> "RequestScope":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc_type)
+        return False